@@ -0,0 +1,153 @@
+"""동기/비동기 DB 경로를 같은 부하에서 비교하는 벤치마크입니다.
+
+    uv run python -m benchmarks.bench_async_db --requests 400 --concurrency 100 --db-latency-ms 5
+
+SQLite 파일을 두 경로가 함께 사용하고, 네트워크 왕복을 흉내내기 위해
+쿼리마다 --db-latency-ms 만큼 DB 스레드에서 대기합니다.
+"""
+import argparse
+import asyncio
+import sqlite3
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from fastapi import FastAPI
+import httpx
+import sqlalchemy
+from sqlalchemy import orm
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from wapang.api import async_api_router
+from wapang.app.items.router import item_router
+from wapang.app.items.models import Item
+from wapang.app.stores.models import Store
+from wapang.app.users.models import User
+from wapang.database.common import Base
+from wapang.database.connection import get_db_session, get_async_db_session
+
+DB_LATENCY_SECONDS = 0.0
+
+
+class SlowCursor(sqlite3.Cursor):
+    def execute(self, *args, **kwargs):
+        time.sleep(DB_LATENCY_SECONDS)
+        return super().execute(*args, **kwargs)
+
+
+class SlowConnection(sqlite3.Connection):
+    def cursor(self, factory=SlowCursor):
+        return super().cursor(factory)
+
+    def execute(self, *args, **kwargs):
+        time.sleep(DB_LATENCY_SECONDS)
+        return super().execute(*args, **kwargs)
+
+
+def seed(path: Path, n_items: int) -> None:
+    engine = sqlalchemy.create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    with orm.Session(engine) as session:
+        user = User(email="bench@snu.ac.kr", hashed_password="x")
+        session.add(user)
+        session.flush()
+        store = Store(name="bench", address="address", email="bench@snu.ac.kr",
+                      phone_number="010-0000-0000", delivery_fee=0, owner_id=user.id)
+        session.add(store)
+        session.flush()
+        session.add_all(Item(name=f"item{i}", price=i, stock=i, store_id=store.id) for i in range(n_items))
+        session.commit()
+    engine.dispose()
+
+
+def build_sync_app(path: Path, pool_size: int) -> tuple[FastAPI, sqlalchemy.Engine]:
+    engine = sqlalchemy.create_engine(
+        f"sqlite:///{path}",
+        pool_size=pool_size,
+        connect_args={"check_same_thread": False, "factory": SlowConnection},
+    )
+    session_factory = orm.sessionmaker(engine, expire_on_commit=False)
+
+    def override_get_db_session():
+        with session_factory() as session:
+            yield session
+            session.commit()
+
+    app = FastAPI()
+    app.include_router(item_router, prefix="/api/items")
+    app.dependency_overrides[get_db_session] = override_get_db_session
+    return app, engine
+
+
+def build_async_app(path: Path, pool_size: int):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{path}",
+        pool_size=pool_size,
+        connect_args={"factory": SlowConnection},
+    )
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def override_get_async_db_session():
+        async with session_factory() as session:
+            yield session
+            await session.commit()
+
+    app = FastAPI()
+    app.include_router(async_api_router, prefix="/api")
+    app.dependency_overrides[get_async_db_session] = override_get_async_db_session
+    return app, engine
+
+
+async def run_load(app: FastAPI, n_requests: int, concurrency: int) -> tuple[float, list[float]]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one():
+            async with semaphore:
+                start = time.perf_counter()
+                res = await client.get("/api/items/", params={"in_stock": True})
+                latencies.append(time.perf_counter() - start)
+                assert res.status_code == 200
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(n_requests)))
+        elapsed = time.perf_counter() - start
+    return elapsed, latencies
+
+
+def report(mode: str, elapsed: float, latencies: list[float]) -> None:
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{mode:>5}: {len(latencies) / elapsed:8.1f} req/s  "
+          f"p50 {statistics.median(latencies) * 1000:7.1f} ms  p95 {p95 * 1000:7.1f} ms")
+
+
+async def main() -> None:
+    global DB_LATENCY_SECONDS
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--items", type=int, default=50)
+    parser.add_argument("--db-latency-ms", type=float, default=5)
+    args = parser.parse_args()
+    DB_LATENCY_SECONDS = args.db_latency_ms / 1000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.db"
+        seed(path, args.items)
+        print(f"{args.requests} x GET /api/items, concurrency {args.concurrency}, "
+              f"{args.db_latency_ms} ms per statement")
+
+        sync_app, sync_engine = build_sync_app(path, args.concurrency)
+        report("sync", *await run_load(sync_app, args.requests, args.concurrency))
+        sync_engine.dispose()
+
+        async_app, async_engine = build_async_app(path, args.concurrency)
+        report("async", *await run_load(async_app, args.requests, args.concurrency))
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,119 @@
+"""인증된 사용자 캐시가 로그인이 필요한 요청마다 줄이는 쿼리 수와 지연 시간을 측정하는 벤치마크입니다.
+
+    uv run python -m benchmarks.bench_auth_user_cache --requests 500 --db-latency-ms 1
+
+SQLite 파일에 쿼리마다 --db-latency-ms 만큼 지연을 넣고, 같은 토큰으로 GET /api/users/me 와
+GET /api/carts/ 를 반복 호출합니다. 캐시를 끈 경우(이전 방식)와 켠 경우를 비교합니다.
+"""
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import sqlalchemy
+from sqlalchemy import event, orm
+
+import benchmarks.bench_async_db as slow_db
+from benchmarks.bench_async_db import SlowConnection
+from wapang.app.auth.settings import AUTH_SETTINGS
+from wapang.app.auth.utils import issue_token
+from wapang.app.carts.models import CartItem
+from wapang.app.carts.router import cart_router
+from wapang.app.items.models import Item
+from wapang.app.stores.models import Store
+from wapang.app.users.models import User
+from wapang.app.users.router import user_router
+import wapang.app.users.repositories as user_repositories
+from wapang.cache.backends import MemoryCache, NullCache
+from wapang.database.common import Base
+from wapang.database.connection import get_db_session
+# 관계가 걸린 나머지 모델도 매퍼 초기화 전에 import 해야 합니다.
+import wapang.app.auth.models
+import wapang.app.orders.models
+import wapang.app.reviews.models
+
+
+def seed(path: Path) -> str:
+    engine = sqlalchemy.create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    with orm.Session(engine) as session:
+        user = User(email="bench@snu.ac.kr", hashed_password="x", nickname="bench")
+        session.add(user)
+        session.flush()
+        store = Store(name="bench", address="address", email="bench@snu.ac.kr",
+                      phone_number="010-0000-0000", delivery_fee=0, owner_id=user.id)
+        session.add(store)
+        session.flush()
+        items = [Item(name=f"item{i}", price=1000, stock=10, store_id=store.id) for i in range(3)]
+        session.add_all(items)
+        session.flush()
+        session.add_all(CartItem(user_id=user.id, item_id=item.id, quantity=1) for item in items)
+        session.commit()
+        user_id = user.id
+    engine.dispose()
+    return user_id
+
+
+def build_app(path: Path) -> tuple[FastAPI, sqlalchemy.Engine, list[int]]:
+    engine = sqlalchemy.create_engine(
+        f"sqlite:///{path}",
+        connect_args={"check_same_thread": False, "factory": SlowConnection},
+    )
+    session_factory = orm.sessionmaker(engine, expire_on_commit=False)
+    statements = [0]
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def count(*args):
+        statements[0] += 1
+
+    def override_get_db_session():
+        with session_factory() as session:
+            yield session
+            session.commit()
+
+    app = FastAPI()
+    app.include_router(user_router, prefix="/api/users")
+    app.include_router(cart_router, prefix="/api/carts")
+    app.dependency_overrides[get_db_session] = override_get_db_session
+    return app, engine, statements
+
+
+def measure(client: TestClient, path: str, token: str, n_requests: int, statements: list[int]) -> tuple[float, float]:
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get(path, headers=headers).status_code == 200
+    statements[0] = 0
+    latencies = []
+    for _ in range(n_requests):
+        start = time.perf_counter()
+        res = client.get(path, headers=headers)
+        latencies.append(time.perf_counter() - start)
+        assert res.status_code == 200
+    return statistics.median(latencies) * 1000, statements[0] / n_requests
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--db-latency-ms", type=float, default=1)
+    args = parser.parse_args()
+    slow_db.DB_LATENCY_SECONDS = args.db_latency_ms / 1000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.db"
+        token = issue_token(seed(path), 15, AUTH_SETTINGS.ACCESS_TOKEN_SECRET)
+        app, engine, statements = build_app(path)
+        print(f"{args.requests} requests per route, {args.db_latency_ms} ms per statement")
+        with TestClient(app) as client:
+            for path_ in ["/api/users/me", "/api/carts/"]:
+                for label, cache in [("no cache", NullCache()), ("cached", MemoryCache(1000, 60))]:
+                    user_repositories.USER_CACHE = cache
+                    p50, queries = measure(client, path_, token, args.requests, statements)
+                    print(f"  {path_:<15} {label:<9} p50 {p50:6.2f} ms  {queries:.1f} queries/request")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""차단 토큰 테이블의 키를 토큰 원문으로 둘 때와 SHA-256 다이제스트로 둘 때의 쓰기/조회 비용을 테이블 크기별로 비교합니다.
+
+    uv run python -m benchmarks.bench_blocked_tokens --sizes 10000 100000 1000000
+
+InnoDB 처럼 기본 키 순서로 행을 저장하도록 SQLite 의 WITHOUT ROWID 테이블을 파일 DB 에 만듭니다.
+토큰은 실제 JWT 처럼 모든 토큰이 같은 헤더로 시작하므로, 원문 키는 비교할 때마다 공통 접두어를 읽어야 합니다.
+"""
+import argparse
+import base64
+from datetime import datetime, timedelta
+import hashlib
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+import uuid
+
+from wapang.app.auth.settings import AUTH_SETTINGS
+from wapang.app.auth.utils import issue_token
+
+SCHEMAS = {
+    "token ": "CREATE TABLE blocked (token VARCHAR(512) PRIMARY KEY, expired_at TIMESTAMP NOT NULL) WITHOUT ROWID",
+    "digest": "CREATE TABLE blocked (token BLOB PRIMARY KEY, expired_at TIMESTAMP NOT NULL) WITHOUT ROWID",
+}
+
+
+def make_tokens(n: int, rng: random.Random) -> list[str]:
+    # 헤더와 길이는 진짜 리프레시 토큰과 같게, 페이로드와 서명은 임의로 만듭니다.
+    sample = issue_token(str(uuid.uuid4()), AUTH_SETTINGS.LONG_SESSION_LIFESPAN, AUTH_SETTINGS.REFRESH_TOKEN_SECRET)
+    header, payload, signature = sample.split(".")
+    size = (len(payload) + len(signature)) * 3 // 4
+    tokens = []
+    for _ in range(n):
+        body = base64.urlsafe_b64encode(rng.randbytes(size)).decode().rstrip("=")
+        tokens.append(f"{header}.{body[:len(payload)]}.{body[len(payload):]}")
+    return tokens
+
+
+def key(kind: str, token: str) -> str | bytes:
+    return token if kind == "token " else hashlib.sha256(token.encode()).digest()
+
+
+def fill(db: sqlite3.Connection, kind: str, tokens: list[str], expired_at: datetime) -> None:
+    db.executemany("INSERT INTO blocked VALUES (?, ?)", ((key(kind, token), expired_at) for token in tokens))
+    db.commit()
+
+
+def measure_inserts(db: sqlite3.Connection, kind: str, tokens: list[str], expired_at: datetime) -> list[float]:
+    # 로그아웃/리프레시처럼 한 토큰씩 넣고 커밋합니다.
+    latencies = []
+    for token in tokens:
+        start = time.perf_counter()
+        db.execute("INSERT INTO blocked VALUES (?, ?)", (key(kind, token), expired_at))
+        db.commit()
+        latencies.append(time.perf_counter() - start)
+    return sorted(latencies)
+
+
+def measure_lookups(db: sqlite3.Connection, kind: str, tokens: list[str]) -> list[float]:
+    latencies = []
+    for token in tokens:
+        start = time.perf_counter()
+        db.execute("SELECT 1 FROM blocked WHERE token = ?", (key(kind, token),)).fetchone()
+        latencies.append(time.perf_counter() - start)
+    return sorted(latencies)
+
+
+def report(label: str, latencies: list[float]) -> str:
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    return f"{label} p50 {statistics.median(latencies) * 1e6:8.1f} us  p95 {p95 * 1e6:8.1f} us"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--samples", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    expired_at = datetime.now() + timedelta(days=1)
+    tokens = make_tokens(max(args.sizes), rng)
+    probes = make_tokens(args.samples * 2, rng)
+    with tempfile.TemporaryDirectory() as directory:
+        for kind, schema in SCHEMAS.items():
+            path = os.path.join(directory, f"{kind.strip()}.db")
+            db = sqlite3.connect(path)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(schema)
+            filled = 0
+            for size in sorted(args.sizes):
+                fill(db, kind, tokens[filled:size], expired_at)
+                filled = size
+                hits = measure_lookups(db, kind, rng.sample(tokens[:size], args.samples))
+                misses = measure_lookups(db, kind, probes[:args.samples])
+                inserts = measure_inserts(db, kind, probes[args.samples:], expired_at)
+                db.executemany("DELETE FROM blocked WHERE token = ?",
+                               ((key(kind, token),) for token in probes[args.samples:]))
+                db.commit()
+                db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                megabytes = os.path.getsize(path) / 1024 / 1024
+                print(f"{kind} {size:>9} rows ({megabytes:7.1f} MiB)")
+                print("    " + report("insert", inserts))
+                print("    " + report("hit   ", hits))
+                print("    " + report("miss  ", misses))
+            db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""상품 이름 검색 지연 시간이 카탈로그 크기에 따라 어떻게 변하는지 측정하는 벤치마크입니다.
+
+    uv run python -m benchmarks.bench_item_search --sizes 1000 10000 100000
+
+같은 이름 목록으로 InvertedIndex 와 SQLite 의 LIKE '%검색어%' 전체 스캔을 비교합니다.
+"""
+import argparse
+import random
+import sqlite3
+import statistics
+import time
+import uuid
+
+from wapang.app.search.indexes import InvertedIndex
+
+# 실제 카탈로그처럼 어휘가 충분히 다양하도록 한글 음절을 조합해 단어를 만듭니다.
+SYLLABLES = [chr(0xAC00 + k * 37) for k in range(300)]
+
+
+def make_vocabulary(size: int, rng: random.Random) -> list[str]:
+    return ["".join(rng.choices(SYLLABLES, k=rng.randint(2, 4))) for _ in range(size)]
+
+
+def make_names(n: int, vocabulary: list[str], rng: random.Random) -> list[tuple[str, str]]:
+    return [
+        (str(uuid.UUID(int=rng.getrandbits(128))), " ".join(rng.sample(vocabulary, rng.randint(1, 3))) + f"_{i}")
+        for i in range(n)
+    ]
+
+
+def make_queries(vocabulary: list[str], rng: random.Random) -> list[str]:
+    # 단어 하나, 단어 두 개, 단어의 일부(부분 일치) 검색을 섞습니다.
+    queries = []
+    for word in rng.sample(vocabulary, 10):
+        queries.append(word)
+        queries.append(word[1:] if len(word) > 2 else word)
+        queries.append(f"{word} {rng.choice(vocabulary)}")
+    return queries
+
+
+def measure(search, queries: list[str], repeat: int) -> list[float]:
+    latencies = []
+    for _ in range(repeat):
+        for query in queries:
+            start = time.perf_counter()
+            search(query)
+            latencies.append(time.perf_counter() - start)
+    return sorted(latencies)
+
+
+def report(label: str, latencies: list[float]) -> str:
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    return f"{label} p50 {statistics.median(latencies) * 1000:8.3f} ms  p95 {p95 * 1000:8.3f} ms"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--vocabulary", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vocabulary = make_vocabulary(args.vocabulary, rng)
+    queries = make_queries(vocabulary, rng)
+    for size in args.sizes:
+        names = make_names(size, vocabulary, rng)
+
+        index = InvertedIndex()
+        start = time.perf_counter()
+        index.build(names)
+        build_seconds = time.perf_counter() - start
+
+        db = sqlite3.connect(":memory:")
+        db.execute("CREATE TABLE item (id TEXT PRIMARY KEY, name TEXT)")
+        db.executemany("INSERT INTO item VALUES (?, ?)", names)
+
+        def like_scan(query: str) -> list:
+            clauses = " AND ".join("lower(name) LIKE ?" for _ in query.split())
+            return db.execute(f"SELECT id FROM item WHERE {clauses}",
+                              [f"%{word.lower()}%" for word in query.split()]).fetchall()
+
+        print(f"{size:>8} items (index build {build_seconds * 1000:.0f} ms)")
+        print("  " + report("index", measure(index.search, queries, args.repeat)))
+        print("  " + report("LIKE ", measure(like_scan, queries, args.repeat)))
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
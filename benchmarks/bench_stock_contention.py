@@ -0,0 +1,134 @@
+"""인기 상품 하나에 주문이 몰릴 때 재고 차감의 처리량과 초과 판매 여부를 확인하는 벤치마크입니다.
+
+    uv run python -m benchmarks.bench_stock_contention --threads 16 --orders 2000 --stock 500
+
+여러 스레드가 각자의 세션으로 같은 상품을 1개씩 주문합니다. --mode naive 는 재고를 읽고
+ORM 으로 덮어쓰던 이전 방식이고, --mode atomic 은 OrderService.create_order 의 조건부 UPDATE 입니다.
+기본은 SQLite 파일이며, --url 로 MySQL 등 실제 DB 에 대해 실행할 수 있습니다.
+"""
+import argparse
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import sqlalchemy
+from sqlalchemy import orm, select
+
+from wapang.app.carts.repositories import ReservationRepository
+from wapang.app.carts.reservations import ReservationService
+from wapang.app.items.exceptions import ItemNotEnoughStockError
+from wapang.app.items.models import Item
+from wapang.app.items.repositories import ItemRepository
+from wapang.app.orders.repositories import OrderRepository
+from wapang.app.orders.schemas import ItemRequest, OrderCreateRequest
+from wapang.app.orders.services import OrderService
+from wapang.app.stores.models import Store
+from wapang.app.users.models import User
+from wapang.database.common import Base
+# 관계가 걸린 나머지 모델도 매퍼 초기화 전에 import 해야 합니다.
+import wapang.app.auth.models
+import wapang.app.reviews.models
+import wapang.app.carts.models
+
+
+def seed(engine: sqlalchemy.Engine, stock: int) -> tuple[str, str]:
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with orm.Session(engine) as session:
+        user = User(email="bench@snu.ac.kr", hashed_password="x")
+        session.add(user)
+        session.flush()
+        store = Store(name="bench", address="address", email="bench@snu.ac.kr",
+                      phone_number="010-0000-0000", delivery_fee=0, owner_id=user.id)
+        session.add(store)
+        session.flush()
+        item = Item(name="hot item", price=1000, stock=stock, store_id=store.id)
+        session.add(item)
+        session.commit()
+        return user.id, item.id
+
+
+def order_naive(session: orm.Session, user: User, item_id: str) -> None:
+    # 이전 create_order 처럼 읽은 재고 값으로 검사하고 ORM 으로 덮어씁니다.
+    item = session.scalar(select(Item).where(Item.id == item_id))
+    if item.stock < 1:
+        raise ItemNotEnoughStockError()
+    item.stock -= 1
+
+
+def order_atomic(session: orm.Session, user: User, item_id: str) -> None:
+    item_repository = ItemRepository(session)
+    service = OrderService(OrderRepository(session), item_repository,
+                           ReservationService(ReservationRepository(session), item_repository))
+    service.create_order(user, OrderCreateRequest(items=[ItemRequest(item_id=item_id, quantity=1)]))
+
+
+def run(engine: sqlalchemy.Engine, mode: str, n_threads: int, n_orders: int, stock: int) -> None:
+    user_id, item_id = seed(engine, stock)
+    session_factory = orm.sessionmaker(engine, expire_on_commit=False)
+    place_order = order_atomic if mode == "atomic" else order_naive
+
+    remaining = iter(range(n_orders))
+    lock = threading.Lock()
+    counts = {"accepted": 0, "rejected": 0, "errors": 0}
+
+    def worker() -> None:
+        while True:
+            with lock:
+                if next(remaining, None) is None:
+                    return
+            with session_factory() as session:
+                user = session.get(User, user_id)
+                try:
+                    place_order(session, user, item_id)
+                    session.commit()
+                    result = "accepted"
+                except ItemNotEnoughStockError:
+                    session.rollback()
+                    result = "rejected"
+                except sqlalchemy.exc.OperationalError:
+                    session.rollback()
+                    result = "errors"
+            with lock:
+                counts[result] += 1
+
+    threads = [threading.Thread(target=worker) for _ in range(n_threads)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    with orm.Session(engine) as session:
+        final_stock = session.scalar(select(Item.stock).where(Item.id == item_id))
+    oversold = counts["accepted"] - (stock - final_stock)
+    print(f"{mode:>6}: {n_orders / elapsed:8.1f} orders/s  accepted {counts['accepted']:5d}  "
+          f"rejected {counts['rejected']:5d}  errors {counts['errors']:3d}  "
+          f"final stock {final_stock:5d}  oversold {oversold}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--orders", type=int, default=2000)
+    parser.add_argument("--stock", type=int, default=500)
+    parser.add_argument("--mode", choices=["naive", "atomic", "both"], default="both")
+    parser.add_argument("--url", help="벤치마크용 DB URL (기본: 임시 SQLite 파일)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.url or f"sqlite:///{Path(tmp) / 'bench.db'}"
+        connect_args = {} if args.url else {"check_same_thread": False, "timeout": 30}
+        engine = sqlalchemy.create_engine(url, pool_size=args.threads, connect_args=connect_args)
+        print(f"{args.orders} orders of 1 x hot item (stock {args.stock}), {args.threads} threads")
+
+        modes = ["naive", "atomic"] if args.mode == "both" else [args.mode]
+        for mode in modes:
+            run(engine, mode, args.threads, args.orders, args.stock)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
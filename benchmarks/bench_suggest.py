@@ -0,0 +1,34 @@
+"""자동완성 접두어 조회 지연 시간과 색인 메모리 크기를 카탈로그 크기별로 측정하는 벤치마크입니다.
+
+    uv run python -m benchmarks.bench_suggest --sizes 10000 100000 1000000
+"""
+import argparse
+import random
+
+from benchmarks.bench_item_search import make_names, make_vocabulary, measure, report
+from wapang.app.search.indexes import PrefixIndex
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--vocabulary", type=int, default=20_000)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vocabulary = make_vocabulary(args.vocabulary, rng)
+    # 한 글자, 두 글자, 단어 전체 접두어를 섞습니다.
+    prefixes = [word[:length] for word in rng.sample(vocabulary, 20) for length in (1, 2, len(word))]
+    for size in args.sizes:
+        index = PrefixIndex(max_entries=10 * size)
+        index.build([("item", item_id, name) for item_id, name in make_names(size, vocabulary, rng)])
+        stats = index.stats()
+        print(f"{size:>8} names ({stats['entries']} keys, {stats['approx_bytes'] / 2 ** 20:.1f} MiB)")
+        print("  " + report("suggest", measure(lambda prefix: index.suggest(prefix, args.limit), prefixes, args.repeat)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""로그인 의존성에서 액세스 토큰을 확인하는 비용을 검증된 토큰 캐시 없이/있이 측정하는 마이크로벤치마크입니다.
+
+    uv run python -m benchmarks.bench_token_cache --calls 20000 --clients 100
+
+--clients 명의 사용자가 각자의 토큰으로 번갈아 요청하는 상황에서 get_user_id_from_header 한 번의 시간을 잽니다.
+"""
+import argparse
+import random
+import statistics
+import time
+import uuid
+
+import wapang.app.auth.utils as auth_utils
+from wapang.app.auth.settings import AUTH_SETTINGS
+from wapang.app.auth.token_cache import VerifiedTokenCache
+
+
+def measure(headers: list[str], calls: int, rng: random.Random) -> list[float]:
+    latencies = []
+    for _ in range(calls):
+        header = rng.choice(headers)
+        start = time.perf_counter()
+        auth_utils.get_user_id_from_header(header)
+        latencies.append(time.perf_counter() - start)
+    return sorted(latencies)
+
+
+def report(label: str, latencies: list[float]) -> str:
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    return f"{label:<9} p50 {statistics.median(latencies) * 1e6:7.1f} us  p95 {p95 * 1e6:7.1f} us"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=20_000)
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    headers = [f"Bearer {auth_utils.issue_token(str(uuid.uuid4()), 15, AUTH_SETTINGS.ACCESS_TOKEN_SECRET)}"
+               for _ in range(args.clients)]
+    print(f"{args.calls} calls over {args.clients} tokens")
+    for label, cache in [("no cache", VerifiedTokenCache(0)), ("cached", VerifiedTokenCache(10_000))]:
+        auth_utils.VERIFIED_TOKENS = cache
+        latencies = measure(headers, args.calls, random.Random(args.seed))
+        stats = cache.stats()
+        print(f"  {report(label, latencies)}  hit ratio {stats['hit_ratio']:.3f}  size {stats['size']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta
+import hashlib
+from typing import Callable, ContextManager, Iterable
+
+from fastapi.testclient import TestClient
+import pytest
+from sqlalchemy import func, orm, select
+
+from wapang.app.auth.denylist import (
+    REFRESH_TOKEN_DENYLIST,
+    BloomFilter,
+    RefreshTokenDenylist,
+    purge_expired_blocked_tokens,
+)
+from wapang.app.auth.models import BlockedToken, LegacyBlockedToken
+from wapang.app.auth.repositories import AuthRepository
+from wapang.app.auth.settings import AUTH_SETTINGS
+from wapang.database.instrumentation import QueryCollector
+
+
+@pytest.fixture
+def denylist() -> Iterable[RefreshTokenDenylist]:
+    # lifespan 이 돌지 않는 테스트에서는 비어 있는 테이블로 필터를 채운 것처럼 시작합니다.
+    REFRESH_TOKEN_DENYLIST.clear()
+    REFRESH_TOKEN_DENYLIST.rebuild([])
+    yield REFRESH_TOKEN_DENYLIST
+    REFRESH_TOKEN_DENYLIST.clear()
+
+def _digest(value: str) -> bytes:
+    return hashlib.sha256(value.encode()).digest()
+
+def test_bloom_filter_has_no_false_negatives_and_bounded_false_positives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(_digest(f"blocked-{i}"))
+    assert all(_digest(f"blocked-{i}") in bloom for i in range(1000))
+    false_positives = sum(_digest(f"other-{i}") in bloom for i in range(10_000))
+    assert false_positives < 300
+
+def _refresh(client: TestClient, refresh_token: str):
+    return client.get("/auth/tokens/refresh", headers={"Authorization": f"Bearer {refresh_token}"})
+
+def test_used_refresh_token_is_rejected(client: TestClient, token: dict):
+    res = _refresh(client, token["refresh_token"])
+    assert res.status_code == 200
+    rotated = res.json()["refresh_token"]
+    assert rotated != token["refresh_token"]
+
+    res = _refresh(client, token["refresh_token"])
+    assert res.status_code == 401
+    assert res.json()["error_code"] == "ERR_007"
+
+    assert client.delete("/auth/tokens", headers={"Authorization": f"Bearer {rotated}"}).status_code == 204
+    assert _refresh(client, rotated).status_code == 401
+
+def test_refresh_skips_denylist_query_for_unblocked_token(
+    client: TestClient,
+    token: dict,
+    denylist: RefreshTokenDenylist,
+    assert_max_queries: Callable[[int], ContextManager[QueryCollector]],
+    monkeypatch: pytest.MonkeyPatch,
+    metrics_headers: dict[str, str],
+):
+    monkeypatch.setattr(AUTH_SETTINGS, "DENYLIST_LEGACY_LOOKUP", False)
+    with assert_max_queries(1) as collector:
+        res = _refresh(client, token["refresh_token"])
+    assert res.status_code == 200
+    assert not [statement for statement, _ in collector.statements if statement.startswith("SELECT")]
+    assert denylist.stats()["skipped"] == 1
+
+    # 방금 차단한 토큰은 필터에 들어가 있으므로 DB 에서 확인하고 거부합니다.
+    res = _refresh(client, token["refresh_token"])
+    assert res.status_code == 401
+    stats = client.get("/metrics/token-denylist", headers=metrics_headers).json()
+    assert (stats["loaded"], stats["entries"], stats["checks"], stats["skipped"]) == (True, 1, 2, 1)
+
+def test_refresh_token_in_legacy_table_is_rejected(client: TestClient, token: dict, db_session: orm.Session):
+    # 배포 중 예전 버전이 토큰 원문으로 차단한 토큰
+    db_session.add(LegacyBlockedToken(token=token["refresh_token"], expired_at=datetime.now() + timedelta(days=1)))
+    db_session.flush()
+    res = _refresh(client, token["refresh_token"])
+    assert res.status_code == 401
+
+def test_legacy_row_inserted_after_filter_load_is_rejected(
+    client: TestClient,
+    token: dict,
+    db_session: orm.Session,
+    denylist: RefreshTokenDenylist,
+):
+    # 필터를 채운 뒤 예전 버전 워커가 차단한 토큰. 무효화 버스로 들어오지 않으므로 필터에는 없습니다.
+    db_session.add(LegacyBlockedToken(token=token["refresh_token"], expired_at=datetime.now() + timedelta(days=1)))
+    db_session.flush()
+    assert not denylist.might_contain(token["refresh_token"])
+    res = _refresh(client, token["refresh_token"])
+    assert res.status_code == 401
+    assert res.json()["error_code"] == "ERR_007"
+
+def test_purge_deletes_only_expired_tokens_in_batches(db_session: orm.Session):
+    now = datetime.now()
+    db_session.add_all([BlockedToken(token_digest=_digest(f"expired-{i}"), expired_at=now - timedelta(minutes=i + 1))
+                        for i in range(4)])
+    db_session.add(BlockedToken(token_digest=_digest("active"), expired_at=now + timedelta(minutes=1)))
+    db_session.add_all([LegacyBlockedToken(token="legacy-expired", expired_at=now - timedelta(minutes=1)),
+                        LegacyBlockedToken(token="legacy-active", expired_at=now + timedelta(minutes=1))])
+    db_session.flush()
+
+    assert purge_expired_blocked_tokens(AuthRepository(db_session), batch_size=2, now=now) == 5
+    assert db_session.scalars(select(BlockedToken.token_digest)).all() == [_digest("active")]
+    assert db_session.scalar(select(func.count()).select_from(LegacyBlockedToken)) == 1
+    assert set(AuthRepository(db_session).get_unexpired_blocked_token_digests(now)) \
+        == {_digest("active"), _digest("legacy-active")}
@@ -0,0 +1,177 @@
+import asyncio
+import threading
+import time
+
+from types import SimpleNamespace
+from typing import Iterable
+
+import argon2
+from fastapi.testclient import TestClient
+import httpx
+import pytest
+import sqlalchemy
+from sqlalchemy import orm
+
+from wapang.app.auth.calibrate import MIN_MEMORY_KIB, calibrate
+from wapang.app.auth.exceptions import InvalidAccountException
+from wapang.app.auth import services as auth_services
+from wapang.app.auth.hashing import PASSWORD_HASHER, PasswordHashingPool, hash_password, needs_rehash, verify_password
+from wapang.app.users import services as user_services
+from wapang.app.users.models import User
+from wapang.database import connection
+from wapang.database.common import Base
+from wapang.database.connection import InstrumentedQueuePool, get_db_session
+from wapang.main import app
+
+POOL_SIZE = 2
+BURST = 3 * POOL_SIZE
+
+def test_password_hashing_pool_limits_concurrency():
+    pool = PasswordHashingPool(max_workers=2)
+    lock = threading.Lock()
+    active = [0, 0]
+
+    def work() -> None:
+        with lock:
+            active[0] += 1
+            active[1] = max(active[1], active[0])
+        time.sleep(0.02)
+        with lock:
+            active[0] -= 1
+
+    async def burst() -> None:
+        await asyncio.gather(*(pool.run(work) for _ in range(6)))
+
+    try:
+        asyncio.run(burst())
+    finally:
+        pool.shutdown()
+    assert active[1] == 2
+    stats = pool.stats()
+    assert (stats["queued"], stats["running"], stats["completed"]) == (0, 0, 6)
+    assert stats["max_queued"] >= 4
+
+def test_hash_and_verify_password():
+    hashed_password = asyncio.run(hash_password("password123"))
+    asyncio.run(verify_password("password123", hashed_password))
+    with pytest.raises(InvalidAccountException):
+        asyncio.run(verify_password("wrong-password", hashed_password))
+
+def test_get_password_hashing_stats(
+    client: TestClient,
+    access_token: str,
+    metrics_headers: dict[str, str],
+):
+    res = client.get("/metrics/password-hashing", headers=metrics_headers)
+    assert res.status_code == 200
+    res_json = res.json()
+    # 회원가입 해시와 로그인 검증
+    assert res_json["completed"] >= 2
+    assert res_json["queued"] == 0
+
+def test_signin_rehashes_outdated_password_hash(
+    client: TestClient,
+    db_session: orm.Session,
+):
+    weak_hash = argon2.PasswordHasher(time_cost=1, memory_cost=8 * 1024, parallelism=1).hash("password123")
+    user = User(email="legacy@snu.ac.kr", hashed_password=weak_hash)
+    db_session.add(user)
+    # 로그인은 해시 검증 전에 조회 트랜잭션을 롤백하므로 미리 커밋해 둡니다.
+    db_session.commit()
+    assert needs_rehash(weak_hash)
+
+    res = client.post("/auth/tokens", json={"email": "legacy@snu.ac.kr", "password": "password123"})
+    assert res.status_code == 200
+    db_session.refresh(user)
+    assert user.hashed_password != weak_hash
+    assert not needs_rehash(user.hashed_password)
+
+    upgraded_hash = user.hashed_password
+    res = client.post("/auth/tokens", json={"email": "legacy@snu.ac.kr", "password": "password123"})
+    assert res.status_code == 200
+    db_session.refresh(user)
+    assert user.hashed_password == upgraded_hash
+
+def test_calibrate_lowers_memory_cost_for_tight_target():
+    time_cost, memory_cost, _ = calibrate(target_ms=0.001, memory_cost=4 * MIN_MEMORY_KIB, parallelism=1, samples=1)
+    assert (time_cost, memory_cost) == (1, MIN_MEMORY_KIB)
+
+@pytest.fixture
+def pooled_engine(
+    client: TestClient,
+    tmp_path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> Iterable[sqlalchemy.Engine]:
+    # 테스트 세션 대신 실제 get_db_session 이 작은 커넥션 풀에서 요청마다 세션을 엽니다.
+    engine = sqlalchemy.create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=POOL_SIZE,
+        max_overflow=0,
+        pool_timeout=1,
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(bind=engine)
+    session_factory = orm.sessionmaker(bind=engine, expire_on_commit=False)
+    monkeypatch.setattr(connection, "get_db_manager", lambda: SimpleNamespace(session_factory=session_factory))
+    monkeypatch.delitem(app.dependency_overrides, get_db_session)
+    try:
+        yield engine
+    finally:
+        engine.dispose()
+
+def _gated_hasher(engine: sqlalchemy.Engine, checked_out: list[int]):
+    # 느린 해시를 흉내 냅니다. BURST 개 요청이 모두 해시를 기다리는 순간의 체크아웃 수를 기록한 뒤 함께 풀어 줍니다.
+    hashed_password = PASSWORD_HASHER.hash("password123")
+    all_waiting = asyncio.Event()
+    waiting = 0
+
+    async def slow_hash(*args) -> str:
+        nonlocal waiting
+        waiting += 1
+        if waiting == BURST:
+            checked_out.append(engine.pool.checkedout())
+            all_waiting.set()
+        await asyncio.wait_for(all_waiting.wait(), timeout=5)
+        return hashed_password
+
+    return hashed_password, slow_hash
+
+def _send_burst(requests: list[tuple[str, dict]]) -> list[httpx.Response]:
+    async def burst() -> list[httpx.Response]:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as ac:
+            return await asyncio.gather(*(ac.post(url, json=body) for url, body in requests))
+
+    return asyncio.run(burst())
+
+def test_signin_burst_does_not_hold_connections_while_hashing(
+    pooled_engine: sqlalchemy.Engine,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    checked_out: list[int] = []
+    hashed_password, slow_hash = _gated_hasher(pooled_engine, checked_out)
+    with orm.Session(pooled_engine) as session:
+        session.add(User(email="burst@snu.ac.kr", hashed_password=hashed_password))
+        session.commit()
+    monkeypatch.setattr(auth_services, "verify_password", slow_hash)
+
+    responses = _send_burst([("/auth/tokens", {"email": "burst@snu.ac.kr", "password": "password123"})] * BURST)
+    assert [res.status_code for res in responses] == [200] * BURST
+    # 풀보다 많은 요청이 해시를 기다리는 동안에도 커넥션은 하나도 잡혀 있지 않습니다.
+    assert checked_out == [0]
+    assert pooled_engine.pool.timeout_count == 0
+
+def test_signup_burst_does_not_hold_connections_while_hashing(
+    pooled_engine: sqlalchemy.Engine,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    checked_out: list[int] = []
+    _, slow_hash = _gated_hasher(pooled_engine, checked_out)
+    monkeypatch.setattr(user_services, "hash_password", slow_hash)
+
+    responses = _send_burst([
+        ("/users/", {"email": f"burst{i}@snu.ac.kr", "password": "password123"}) for i in range(BURST)
+    ])
+    assert [res.status_code for res in responses] == [201] * BURST
+    assert checked_out == [0]
+    assert pooled_engine.pool.timeout_count == 0
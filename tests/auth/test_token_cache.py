@@ -0,0 +1,69 @@
+import time
+
+from authlib.jose import JWTClaims
+from fastapi.testclient import TestClient
+
+from wapang.app.auth.token_cache import VerifiedTokenCache
+
+def _claims(exp: float) -> JWTClaims:
+    return JWTClaims({"sub": "user", "exp": exp}, {"alg": "HS256"})
+
+def test_token_cache_expires_at_exp_and_evicts_lru():
+    cache = VerifiedTokenCache(max_entries=2)
+    cache.set("expired", "secret", _claims(time.time() - 1))
+    assert cache.get("expired", "secret") is None
+
+    cache.set("a", "secret", _claims(time.time() + 60))
+    cache.set("b", "secret", _claims(time.time() + 60))
+    assert cache.get("a", "secret") is not None
+    cache.set("c", "secret", _claims(time.time() + 60))
+    assert cache.get("b", "secret") is None
+    assert cache.stats()["size"] == 2
+    # 다른 비밀 키로 검증한 토큰은 캐시에서도 다른 항목입니다.
+    assert cache.get("a", "other-secret") is None
+
+def test_repeated_requests_skip_token_verification(
+    client: TestClient,
+    access_token: str,
+    verified_tokens: VerifiedTokenCache,
+    metrics_headers: dict[str, str],
+):
+    auth_header = {"Authorization": f"Bearer {access_token}"}
+    for _ in range(3):
+        assert client.get("/users/me", headers=auth_header).status_code == 200
+    stats = verified_tokens.stats()
+    assert (stats["size"], stats["hits"], stats["misses"]) == (1, 2, 1)
+
+    res = client.get("/metrics/token-cache", headers=metrics_headers)
+    assert res.status_code == 200
+    assert res.json()["hit_ratio"] == stats["hit_ratio"]
+
+def test_cached_refresh_token_is_not_an_access_token(
+    client: TestClient,
+    token: dict,
+):
+    refresh_header = {"Authorization": f"Bearer {token['refresh_token']}"}
+    res = client.delete("/auth/tokens", headers=refresh_header)
+    assert res.status_code == 204
+
+    res = client.get("/users/me", headers=refresh_header)
+    assert res.status_code == 401
+    assert res.json()["error_code"] == "ERR_007"
+
+def test_signin_query_budget(
+    client: TestClient,
+    user,
+    assert_max_queries,
+):
+    with assert_max_queries(1):
+        res = client.post("/auth/tokens", json={"email": "test1234@snu.ac.kr", "password": "password123"})
+    assert res.status_code == 200
+
+def test_signout_query_budget(
+    client: TestClient,
+    token: dict,
+    assert_max_queries,
+):
+    with assert_max_queries(3):
+        res = client.delete("/auth/tokens", headers={"Authorization": f"Bearer {token['refresh_token']}"})
+    assert res.status_code == 204
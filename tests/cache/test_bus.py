@@ -0,0 +1,125 @@
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+from wapang.cache.backends import MemoryCache
+from wapang.cache.bus import MAX_MESSAGE_BYTES, InvalidationBus, UnixSocketTransport
+
+# 다른 워커 프로세스 역할을 합니다. 캐시에 값을 넣고 준비되면 알린 뒤,
+# 다른 프로세스의 무효화로 값이 사라진 시각을 출력합니다.
+WORKER = """
+import sys, time
+from wapang.cache.backends import MemoryCache
+from wapang.cache.bus import InvalidationBus, UnixSocketTransport
+
+cache = MemoryCache(max_entries=10, ttl_seconds=3600)
+bus = InvalidationBus(UnixSocketTransport(sys.argv[1]))
+bus.subscribe(cache.invalidate)
+bus.start()
+cache.set("store:1", {"name": "old"}, ["store:1"], cache.generation())
+print("ready", flush=True)
+deadline = time.time() + 5
+while cache.get("store:1") is not None and time.time() < deadline:
+    time.sleep(0.0005)
+print(time.time() if cache.get("store:1") is None else "timeout", flush=True)
+bus.close()
+"""
+
+def test_invalidation_reaches_other_processes(tmp_path):
+    directory = str(tmp_path / "bus")
+    env = dict(os.environ, ENV="test")
+    workers = [subprocess.Popen([sys.executable, "-c", WORKER, directory], stdout=subprocess.PIPE, text=True, env=env)
+               for _ in range(3)]
+    bus = InvalidationBus(UnixSocketTransport(directory))
+    try:
+        for worker in workers:
+            assert worker.stdout.readline().strip() == "ready"
+        bus.start()
+        sent_at = time.time()
+        bus.publish(["store:1"])
+        latencies = [float(worker.stdout.readline()) - sent_at for worker in workers]
+    finally:
+        bus.close()
+        for worker in workers:
+            worker.wait(timeout=10)
+    assert bus.published == 1
+    assert max(latencies) < 0.5, latencies
+
+def test_bus_ignores_own_messages_and_stale_sockets(tmp_path):
+    directory = str(tmp_path / "bus")
+    os.makedirs(directory)
+    # 비정상 종료한 워커가 남긴 소켓 파일
+    open(os.path.join(directory, "0-dead.sock"), "w").close()
+    cache = MemoryCache(max_entries=10, ttl_seconds=3600)
+    bus = InvalidationBus(UnixSocketTransport(directory))
+    bus.subscribe(cache.invalidate)
+    bus.start()
+    try:
+        cache.set("store:1", {}, ["store:1"], cache.generation())
+        bus.publish(["store:1"])
+        assert cache.get("store:1") is not None
+        assert os.listdir(directory) == [os.path.basename(bus.transport.path)]
+    finally:
+        bus.close()
+    assert os.listdir(directory) == []
+
+def _collecting_bus(directory: str) -> tuple[InvalidationBus, list[str], threading.Event]:
+    received: list[str] = []
+    arrived = threading.Event()
+
+    def collect(tags: list[str]) -> None:
+        received.extend(tags)
+        arrived.set()
+
+    bus = InvalidationBus(UnixSocketTransport(directory))
+    bus.subscribe(collect)
+    bus.start()
+    return bus, received, arrived
+
+def test_bus_skips_peer_that_is_not_draining(tmp_path):
+    directory = str(tmp_path / "bus")
+    os.makedirs(directory)
+    # 소켓은 열어 두었지만 읽지 않는 워커입니다. 받는 버퍼가 가득 찰 때까지 미리 채워 둡니다.
+    stuck = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    stuck_path = os.path.join(directory, "0-stuck.sock")
+    stuck.bind(stuck_path)
+    filler = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    filler.setblocking(False)
+    try:
+        while True:
+            filler.sendto(b"x" * 1024, stuck_path)
+    except BlockingIOError:
+        pass
+    peer, received, arrived = _collecting_bus(directory)
+    bus = InvalidationBus(UnixSocketTransport(directory))
+    bus.start()
+    try:
+        bus.publish(["store:1"])
+        assert arrived.wait(timeout=2)
+        assert received == ["store:1"]
+        assert bus.published == 1
+    finally:
+        bus.close()
+        peer.close()
+        filler.close()
+        stuck.close()
+
+def test_bus_splits_large_tag_sets(tmp_path):
+    directory = str(tmp_path / "bus")
+    peer, received, _ = _collecting_bus(directory)
+    bus = InvalidationBus(UnixSocketTransport(directory))
+    bus.start()
+    tags = [f"item:{i}" for i in range(MAX_MESSAGE_BYTES // 8)]
+    try:
+        bus.publish(tags)
+        deadline = time.time() + 2
+        while len(received) < len(tags) and time.time() < deadline:
+            time.sleep(0.01)
+    finally:
+        bus.close()
+        peer.close()
+    assert bus.published > 1
+    assert sorted(received) == sorted(tags)
@@ -0,0 +1,153 @@
+from fastapi.testclient import TestClient
+import pytest
+from sqlalchemy import orm, text
+
+from wapang.cache.backends import CacheBackend, MemoryCache
+from wapang.cache.bus import INVALIDATION_BUS
+from wapang.cache.invalidation import invalidate
+from wapang.database.settings import DB_SETTINGS
+
+def test_memory_cache_ttl_and_lru(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr("wapang.cache.backends.time.monotonic", lambda: now[0])
+    cache = MemoryCache(max_entries=2, ttl_seconds=10)
+    cache.set("a", 1, [], cache.generation())
+    cache.set("b", 2, [], cache.generation())
+    assert cache.get("a") == 1
+    # 가장 오래 쓰지 않은 b 가 밀려납니다.
+    cache.set("c", 3, [], cache.generation())
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+    now[0] = 10
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (2, 2, 1)
+
+def test_memory_cache_invalidates_by_tag():
+    cache = MemoryCache(max_entries=10, ttl_seconds=10)
+    cache.set("items:1", [1], ["store:1"], cache.generation())
+    cache.set("items:2", [2], ["store:2"], cache.generation())
+    cache.invalidate(["store:1"])
+    assert cache.get("items:1") is None
+    assert cache.get("items:2") == [2]
+
+def test_memory_cache_skips_value_read_before_invalidation():
+    cache = MemoryCache(max_entries=10, ttl_seconds=10)
+    generation = cache.generation()
+    cache.invalidate(["store:1"])
+    cache.set("items:1", [1], ["store:1"], generation)
+    assert cache.get("items:1") is None
+
+def test_invalidate_again_after_commit(db_engine, catalog_cache: CacheBackend, monkeypatch):
+    published: list[list[str]] = []
+    monkeypatch.setattr(INVALIDATION_BUS, "publish", lambda tags: published.append(sorted(tags)))
+    # 쓰기와 커밋 사이에 다른 요청이 예전 값을 다시 넣은 경우
+    with orm.Session(db_engine) as session:
+        invalidate(session, ["store:1"])
+        catalog_cache.set("store:1", {"name": "old"}, ["store:1"], catalog_cache.generation())
+        assert catalog_cache.get("store:1") is not None
+        session.commit()
+    assert catalog_cache.get("store:1") is None
+    # 다른 워커에는 커밋된 뒤에만 알립니다.
+    assert published == [["store:1"]]
+
+    with orm.Session(db_engine) as session:
+        session.execute(text("SELECT 1"))
+        invalidate(session, ["store:1"])
+        session.rollback()
+        assert "cache_tags" not in session.info
+    assert len(published) == 1
+
+
+def test_get_store_is_cached(
+    client: TestClient,
+    store: dict,
+    catalog_cache: CacheBackend,
+):
+    hits = catalog_cache.stats()["hits"]
+    res = client.get(f"/stores/{store['id']}")
+    assert res.status_code == 200
+    assert int(res.headers["X-DB-Queries"]) >= 1
+
+    res_2 = client.get(f"/stores/{store['id']}")
+    assert res_2.status_code == 200
+    assert res_2.json() == res.json()
+    assert int(res_2.headers["X-DB-Queries"]) == 0
+    assert catalog_cache.stats()["hits"] == hits + 1
+
+def test_reads_from_separate_replica_are_not_cached(
+    client: TestClient,
+    store: dict,
+    item: dict,
+    catalog_cache: CacheBackend,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    # 복제본이 늦게 따라오면 무효화 뒤에 읽은 예전 값이 다시 캐시에 들어갈 수 있습니다.
+    monkeypatch.setattr(DB_SETTINGS, "replica_host", "replica.internal")
+    for path in [f"/stores/{store['id']}", "/items"]:
+        for _ in range(2):
+            res = client.get(path)
+            assert res.status_code == 200
+            assert int(res.headers["X-DB-Queries"]) >= 1
+    assert catalog_cache.stats()["entries"] == 0
+
+def test_store_update_invalidates_cache(
+    client: TestClient,
+    access_token: str,
+    store: dict,
+):
+    assert client.get(f"/stores/{store['id']}").status_code == 200
+    res = client.patch(f"/stores/{store['id']}", json={"delivery_fee": 1000},
+                       headers={"Authorization": f"Bearer {access_token}"})
+    assert res.status_code == 200
+    assert client.get(f"/stores/{store['id']}").json()["delivery_fee"] == 1000
+
+@pytest.mark.parametrize("path", ["/items", "/items?in_stock=true&sort=price_asc", "/stores/{store_id}/items"])
+def test_item_writes_invalidate_cached_lists(
+    client: TestClient,
+    access_token: str,
+    store: dict,
+    item: dict,
+    path: str,
+):
+    headers = {"Authorization": f"Bearer {access_token}"}
+    path = path.format(store_id=store["id"])
+
+    def stocks() -> dict[str, int]:
+        res = client.get(path)
+        assert res.status_code == 200
+        return {i["item_name"]: i["stock"] for i in res.json()}
+
+    assert stocks() == {"초콜릿": 20}
+
+    res = client.post("/orders", json={"items": [{"item_id": item["id"], "quantity": 5}]}, headers=headers)
+    assert res.status_code == 201
+    assert stocks() == {"초콜릿": 15}
+
+    res = client.patch(f"/items/{item['id']}", json={"item_name": "사탕"}, headers=headers)
+    assert res.status_code == 200
+    assert stocks() == {"사탕": 15}
+
+    res = client.post("/items", json={"item_name": "젤리", "price": 1000, "stock": 1}, headers=headers)
+    assert res.status_code == 201
+    assert stocks() == {"사탕": 15, "젤리": 1}
+
+    res = client.delete(f"/items/{item['id']}", headers=headers)
+    assert res.status_code == 204
+    assert stocks() == {"젤리": 1}
+
+def test_get_cache_stats(
+    client: TestClient,
+    item: dict,
+    metrics_headers: dict[str, str],
+):
+    client.get("/items")
+    client.get("/items")
+    res = client.get("/metrics/cache", headers=metrics_headers)
+    assert res.status_code == 200
+    res_json = res.json()
+    assert res_json["hits"] >= 1
+    assert res_json["misses"] >= 1
+    assert 0 < res_json["hit_ratio"] < 1
+    assert res_json["entries"] >= 1
@@ -197,3 +197,111 @@ def test_checkout_not_enough_stock(
 	assert res_json["error_code"] == "ERR_017"
 	assert res_json["error_msg"] == "NOT ENOUGH STOCK"
 
+
+def test_checkout_retry_with_idempotency_key(
+	client: TestClient,
+	access_token: str,
+	item: dict,
+	add_to_cart,
+):
+	assert add_to_cart(item_id=item["id"], quantity=1).status_code == 200
+	headers = {"Authorization": f"Bearer {access_token}", "Idempotency-Key": "checkout-1"}
+
+	first = client.post("/carts/checkout", headers=headers)
+	assert first.status_code == 201
+	# 장바구니가 이미 비었어도 재시도는 첫 주문을 돌려받습니다.
+	retry = client.post("/carts/checkout", headers=headers)
+	assert retry.status_code == 201
+	assert retry.json() == first.json()
+
+	res = client.post("/carts/checkout", headers={**headers, "Idempotency-Key": "checkout-2"})
+	assert res.status_code == 422
+	assert res.json()["error_code"] == "ERR_024"
+
+
+
+def _create_items(client: TestClient, access_token: str, n_items: int) -> list[dict]:
+	item_list = []
+	for i in range(n_items):
+		req = {"item_name": f"초콜릿_{i}", "price": 1000 + i, "stock": 100}
+		res = client.post("/items", json=req, headers={"Authorization": f"Bearer {access_token}"})
+		assert res.status_code == 201
+		item_list.append(res.json())
+	return item_list
+
+
+@pytest.mark.parametrize("n_items", [
+	1,
+	10,
+])
+def test_get_cart_query_budget(
+	client: TestClient,
+	access_token: str,
+	store: dict,
+	add_to_cart,
+	get_cart,
+	assert_max_queries,
+	n_items: int,
+):
+	for item in _create_items(client, access_token, n_items):
+		assert add_to_cart(item_id=item["id"], quantity=1).status_code == 200
+
+	with assert_max_queries(4):
+		res = get_cart()
+	assert res.status_code == 200
+	assert len(res.json()["details"][0]["items"]) == n_items
+
+
+@pytest.mark.parametrize("n_items", [
+	1,
+	10,
+])
+def test_add_to_cart_query_budget(
+	client: TestClient,
+	access_token: str,
+	store: dict,
+	add_to_cart,
+	assert_max_queries,
+	n_items: int,
+):
+	items = _create_items(client, access_token, n_items + 1)
+	for item in items[:-1]:
+		assert add_to_cart(item_id=item["id"], quantity=1).status_code == 200
+
+	with assert_max_queries(7):
+		res = add_to_cart(item_id=items[-1]["id"], quantity=2)
+	assert res.status_code == 200
+
+
+@pytest.mark.parametrize("n_items", [
+	1,
+	10,
+])
+def test_checkout_query_budget(
+	client: TestClient,
+	access_token: str,
+	store: dict,
+	add_to_cart,
+	checkout_cart,
+	assert_max_queries,
+	n_items: int,
+):
+	for item in _create_items(client, access_token, n_items):
+		assert add_to_cart(item_id=item["id"], quantity=1).status_code == 200
+
+	with assert_max_queries(10):
+		res = checkout_cart()
+	assert res.status_code == 201
+
+
+def test_clear_cart_query_budget(
+	item: dict,
+	add_to_cart,
+	clear_cart,
+	assert_max_queries,
+):
+	assert add_to_cart(item_id=item["id"], quantity=1).status_code == 200
+
+	with assert_max_queries(1):
+		res = clear_cart()
+	assert res.status_code == 204
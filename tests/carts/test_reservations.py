@@ -0,0 +1,102 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from wapang.app.carts.models import StockReservation
+from wapang.app.carts.repositories import ReservationRepository
+from wapang.app.carts.reservations import ReservationService, release_expired_reservations
+from wapang.app.carts.settings import CART_SETTINGS
+from wapang.app.items.models import Item
+from wapang.app.items.repositories import ItemRepository
+
+
+@pytest.fixture(autouse=True)
+def reservations_enabled(monkeypatch: pytest.MonkeyPatch) -> None:
+	monkeypatch.setattr(CART_SETTINGS, "reservations_enabled", True)
+
+def _stock(db_session: Session, item_id: str) -> int:
+	return db_session.scalar(select(Item.stock).where(Item.id == item_id))
+
+def _reserved(db_session: Session, item_id: str) -> int:
+	return db_session.scalar(
+		select(func.coalesce(func.sum(StockReservation.quantity), 0)).where(StockReservation.item_id == item_id)
+	)
+
+
+def test_add_to_cart_reserves_stock(
+	db_session: Session,
+	item: dict,
+	add_to_cart,
+):
+	assert add_to_cart(item_id=item["id"], quantity=3).status_code == 200
+	assert _stock(db_session, item["id"]) == item["stock"] - 3
+	assert _reserved(db_session, item["id"]) == 3
+
+	# 수량을 줄이면 줄인 만큼, 0 으로 만들면 전부 재고로 돌아갑니다.
+	assert add_to_cart(item_id=item["id"], quantity=1).status_code == 200
+	assert _stock(db_session, item["id"]) == item["stock"] - 1
+	assert add_to_cart(item_id=item["id"], quantity=0).status_code == 200
+	assert _stock(db_session, item["id"]) == item["stock"]
+	assert _reserved(db_session, item["id"]) == 0
+
+
+def test_add_to_cart_not_enough_stock(
+	db_session: Session,
+	item: dict,
+	add_to_cart,
+	get_cart,
+):
+	res = add_to_cart(item_id=item["id"], quantity=item["stock"] + 1)
+	assert res.status_code == 409
+	assert res.json()["error_code"] == "ERR_017"
+	assert _stock(db_session, item["id"]) == item["stock"]
+	assert get_cart().json()["details"] == []
+
+
+def test_checkout_consumes_reservation_without_locking_items(
+	db_session: Session,
+	item: dict,
+	add_to_cart,
+	checkout_cart,
+	get_cart,
+	assert_max_queries,
+):
+	assert add_to_cart(item_id=item["id"], quantity=2).status_code == 200
+
+	with assert_max_queries(12) as queries:
+		res = checkout_cart()
+	assert res.status_code == 201
+	assert not [s for s, _ in queries.statements if s.lstrip().upper().startswith("UPDATE ITEM")]
+	assert _stock(db_session, item["id"]) == item["stock"] - 2
+	assert _reserved(db_session, item["id"]) == 0
+	assert get_cart().json()["details"] == []
+
+
+def test_clear_cart_releases_reservations(
+	db_session: Session,
+	item: dict,
+	add_to_cart,
+	clear_cart,
+):
+	assert add_to_cart(item_id=item["id"], quantity=2).status_code == 200
+	assert clear_cart().status_code == 204
+	assert _stock(db_session, item["id"]) == item["stock"]
+	assert _reserved(db_session, item["id"]) == 0
+
+
+def test_expired_reservations_are_released(
+	db_session: Session,
+	item: dict,
+	add_to_cart,
+):
+	assert add_to_cart(item_id=item["id"], quantity=2).status_code == 200
+	item_repository = ItemRepository(db_session)
+	reservation_service = ReservationService(ReservationRepository(db_session), item_repository)
+
+	assert release_expired_reservations(reservation_service, 100) == 0
+	later = datetime.now() + timedelta(seconds=CART_SETTINGS.reservation_ttl_seconds + 1)
+	assert release_expired_reservations(reservation_service, 100, now=later) == 1
+	assert _stock(db_session, item["id"]) == item["stock"]
+	assert _reserved(db_session, item["id"]) == 0
@@ -1,18 +1,30 @@
-from typing import Iterable
+import os
+# 숨은 지연 로딩을 잡도록 테스트는 항상 strict loading 으로 돌립니다.
+# LAZY_LOADING 은 모델을 import 할 때 정해지므로 wapang 을 import 하기 전에 설정합니다.
+os.environ.setdefault("DB_STRICT_LOADING", "true")
+
+from contextlib import contextmanager
+from typing import Callable, ContextManager, Iterable, Iterator
 
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 import pytest
 import sqlalchemy
-from sqlalchemy import orm
+from sqlalchemy import event, orm
 from sqlalchemy.pool import StaticPool
 
 from wapang.main import app
 from wapang.api import api_router
+from wapang.app.auth.token_cache import VerifiedTokenCache
+from wapang.app.auth.utils import VERIFIED_TOKENS
+from wapang.app.metrics.settings import METRICS_SETTINGS
+from wapang.app.search.indexes import ITEM_NAME_INDEX, SUGGESTION_INDEX, InvertedIndex
 from wapang.app.users.models import User
+from wapang.cache.backends import CATALOG_CACHE, USER_CACHE, CacheBackend
 from wapang.database.common import Base
 from wapang.database.settings import DB_SETTINGS
-from wapang.database.connection import get_db_session
+from wapang.database.connection import get_db_session, get_replica_db_session, has_pending_writes
+from wapang.database.instrumentation import QueryCollector
 from wapang.settings import ENV
  
 # 하위 테스트 모듈에서 공통으로 사용할 플러그인/픽스처 로드
@@ -27,6 +39,33 @@ def set_test_env():
     ENV = "test"
 
 
+@pytest.fixture(autouse=True)
+def item_name_index() -> Iterable[InvertedIndex]:
+    # 워커 전역 검색 색인은 테스트마다 비운 상태에서 시작합니다.
+    ITEM_NAME_INDEX.clear()
+    SUGGESTION_INDEX.clear()
+    yield ITEM_NAME_INDEX
+    ITEM_NAME_INDEX.clear()
+    SUGGESTION_INDEX.clear()
+
+
+@pytest.fixture(autouse=True)
+def catalog_cache() -> Iterable[CacheBackend]:
+    # 조회 캐시도 워커 전역이므로 테스트마다 비웁니다.
+    CATALOG_CACHE.clear()
+    USER_CACHE.clear()
+    yield CATALOG_CACHE
+    CATALOG_CACHE.clear()
+    USER_CACHE.clear()
+
+
+@pytest.fixture(autouse=True)
+def verified_tokens() -> Iterable[VerifiedTokenCache]:
+    VERIFIED_TOKENS.clear()
+    yield VERIFIED_TOKENS
+    VERIFIED_TOKENS.clear()
+
+
 @pytest.fixture(scope="function")
 def db_engine(set_test_env) -> Iterable[sqlalchemy.Engine]:
     url = "sqlite:///:memory:"
@@ -64,17 +103,57 @@ def db_session(db_engine: sqlalchemy.Engine) -> Iterable[orm.Session]:
         connection.close()
 
 
+@pytest.fixture
+def assert_max_queries(
+    db_engine: sqlalchemy.Engine,
+    db_session: orm.Session,
+) -> Callable[[int], ContextManager[QueryCollector]]:
+    # with assert_max_queries(3): ... 블록 안에서 db_engine 으로 실행된 SQL 문 수가
+    # 예산을 넘으면 실패합니다. 결과 크기를 바꿔가며 같은 예산을 검사해 N+1 회귀를 잡습니다.
+    @contextmanager
+    def _assert_max_queries(max_queries: int) -> Iterator[QueryCollector]:
+        # 테스트는 요청 사이에 세션을 공유하므로, 실제 요청처럼 빈 identity map 에서 시작합니다.
+        db_session.expunge_all()
+        collector = QueryCollector()
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            # 요청 세션의 커밋은 테스트 트랜잭션 안의 SAVEPOINT 로 실행됩니다. 실제 DB 에는 없는 문이므로 세지 않습니다.
+            if not statement.startswith(("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")):
+                collector.record(statement, parameters, 0)
+
+        event.listen(db_engine, "after_cursor_execute", record)
+        try:
+            yield collector
+        finally:
+            event.remove(db_engine, "after_cursor_execute", record)
+        statements = "\n".join(statement for statement, _ in collector.statements)
+        assert collector.count <= max_queries, \
+            f"expected at most {max_queries} statements, got {collector.count}:\n{statements}"
+
+    return _assert_max_queries
+
+
 @pytest.fixture
 def client(db_session: orm.Session) -> TestClient:
     app.include_router(api_router)
 
     def override_get_db_session():
-        return db_session
+        # 실제 요청처럼 쓰기가 있으면 커밋해서 커밋 뒤 훅(캐시 무효화 전파, 검색 색인 갱신)이 돌게 합니다.
+        # 세션은 테스트 트랜잭션 안의 SAVEPOINT 로 커밋하므로 테스트가 끝나면 모두 롤백됩니다.
+        yield db_session
+        if has_pending_writes(db_session):
+            db_session.commit()
 
     app.dependency_overrides[get_db_session] = override_get_db_session
+    app.dependency_overrides[get_replica_db_session] = override_get_db_session
     client = TestClient(app)
     return client
 
+@pytest.fixture
+def metrics_headers(monkeypatch: pytest.MonkeyPatch) -> dict[str, str]:
+    monkeypatch.setattr(METRICS_SETTINGS, "token", "test-metrics-token")
+    return {"X-Metrics-Token": "test-metrics-token"}
+
 @pytest.fixture
 def user(
     client: TestClient
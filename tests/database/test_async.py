@@ -0,0 +1,99 @@
+from typing import AsyncIterator, Iterable
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import pytest
+import sqlalchemy
+from sqlalchemy import orm
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from wapang.api import async_api_router
+from wapang.app.items.models import Item
+from wapang.app.reviews.models import Review
+from wapang.app.stores.models import Store
+from wapang.app.users.models import User
+from wapang.common.exceptions import WapangException
+from wapang.database.common import Base
+from wapang.database.connection import get_async_db_session
+from wapang.main import wapang_exception_handler
+
+
+@pytest.fixture
+def seeded_db(tmp_path: Path) -> Iterable[dict]:
+    # 동기/비동기 엔진이 같은 데이터를 보도록 파일 기반 SQLite 를 사용합니다.
+    path = tmp_path / "async.db"
+    engine = sqlalchemy.create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    with orm.Session(engine) as session:
+        user = User(email="async@snu.ac.kr", hashed_password="x", nickname="waffle")
+        session.add(user)
+        session.flush()
+        store = Store(name="store", address="address", email="store@snu.ac.kr",
+                      phone_number="010-1234-5678", delivery_fee=500, owner_id=user.id)
+        session.add(store)
+        session.flush()
+        items = [Item(name=f"item{i}", price=1000 * (i + 1), stock=i, store_id=store.id) for i in range(3)]
+        session.add_all(items)
+        session.flush()
+        review = Review(rating=5, comment="good", user_id=user.id, item_id=items[0].id)
+        session.add(review)
+        session.commit()
+        seeded = {
+            "path": path,
+            "store_id": store.id,
+            "item_ids": [item.id for item in items],
+            "review_id": review.id,
+        }
+    engine.dispose()
+    yield seeded
+
+
+@pytest.fixture
+def async_client(seeded_db: dict) -> Iterable[TestClient]:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{seeded_db['path']}")
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def override_get_async_db_session() -> AsyncIterator[AsyncSession]:
+        async with session_factory() as session:
+            yield session
+            await session.commit()
+
+    app = FastAPI()
+    app.include_router(async_api_router)
+    app.add_exception_handler(WapangException, wapang_exception_handler)
+    app.dependency_overrides[get_async_db_session] = override_get_async_db_session
+    with TestClient(app) as client:
+        yield client
+
+
+def test_async_get_items(async_client: TestClient, seeded_db: dict):
+    res = async_client.get("/items", params={"in_stock": True})
+    assert res.status_code == 200
+    res_json = res.json()
+    assert sorted(item["id"] for item in res_json) == sorted(seeded_db["item_ids"][1:])
+
+def test_async_get_store_and_items(async_client: TestClient, seeded_db: dict):
+    res = async_client.get(f"/stores/{seeded_db['store_id']}")
+    assert res.status_code == 200
+    assert res.json()["store_name"] == "store"
+
+    res = async_client.get(f"/stores/{seeded_db['store_id']}/items")
+    assert res.status_code == 200
+    assert len(res.json()) == 3
+
+def test_async_get_store_not_found(async_client: TestClient):
+    res = async_client.get("/stores/nonexistent")
+    assert res.status_code == 404
+    assert res.json()["error_code"] == "ERR_010"
+
+def test_async_get_reviews(async_client: TestClient, seeded_db: dict):
+    res = async_client.get(f"/items/{seeded_db['item_ids'][0]}/reviews")
+    assert res.status_code == 200
+    res_json = res.json()
+    assert len(res_json) == 1
+    assert res_json[0]["writer_nickname"] == "waffle"
+
+    res = async_client.get(f"/reviews/{seeded_db['review_id']}")
+    assert res.status_code == 200
+    assert res.json()["review_id"] == seeded_db["review_id"]
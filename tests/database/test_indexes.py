@@ -0,0 +1,102 @@
+from datetime import datetime
+import re
+from typing import Any, Callable
+
+import pytest
+from sqlalchemy import event, orm, select
+
+from wapang.app.auth.repositories import AuthRepository
+from wapang.app.carts.models import CartItem
+from wapang.app.carts.repositories import CartRepository
+from wapang.app.items.models import Item
+from wapang.app.items.repositories import ItemRepository
+from wapang.app.items.schemas import ItemSort
+from wapang.app.orders.models import Order, OrderItem
+from wapang.app.orders.repositories import OrderRepository
+from wapang.app.reviews.models import Review
+from wapang.app.reviews.repositories import ReviewRepository
+from wapang.app.stores.models import Store
+from wapang.app.stores.repositories import StoreRepository
+from wapang.app.users.models import User
+from wapang.app.users.repositories import UserRepository
+
+
+@pytest.fixture
+def seeded(db_session: orm.Session) -> dict[str, str]:
+    user = User(email="owner@snu.ac.kr", hashed_password="x", nickname="owner")
+    db_session.add(user)
+    db_session.flush()
+    store = Store(name="store", address="address", email="store@snu.ac.kr",
+                  phone_number="010-1234-5678", delivery_fee=3000, owner_id=user.id)
+    db_session.add(store)
+    db_session.flush()
+    items = [Item(name=f"item{i}", price=1000 * i, stock=i, store_id=store.id) for i in range(5)]
+    db_session.add_all(items)
+    db_session.flush()
+    db_session.add_all([
+        Order(user_id=user.id, total_price=4000, order_items=[
+            OrderItem(item_id=items[1].id, quantity=1, item_name=items[1].name, unit_price=items[1].price,
+                      store_id=store.id, store_name=store.name, delivery_fee=store.delivery_fee),
+        ]),
+        Review(rating=5, comment="good", user_id=user.id, item_id=items[1].id),
+        CartItem(user_id=user.id, item_id=items[1].id, quantity=1),
+    ])
+    db_session.flush()
+    ids = {"user_id": user.id, "store_id": store.id, "item_id": items[1].id}
+    ids["order_id"] = db_session.scalar(select(Order.id))
+    db_session.expunge_all()
+    return ids
+
+
+# 리포지토리가 실제로 실행하는 조회 경로. 각 경로의 모든 SQL 문이 인덱스를 타야 합니다.
+ACCESS_PATHS: dict[str, Callable[[orm.Session, dict[str, str]], Any]] = {
+    "items_by_store_price": lambda s, ids: ItemRepository(s).get_items(
+        store_id=ids["store_id"], in_stock=True, sort=ItemSort.PRICE_ASC, limit=21),
+    "items_by_store_newest": lambda s, ids: ItemRepository(s).get_items(
+        store_id=ids["store_id"], sort=ItemSort.NEWEST, limit=21),
+    "items_by_price_range": lambda s, ids: ItemRepository(s).get_items(
+        min_price=1000, max_price=3000, sort=ItemSort.PRICE_ASC, limit=21),
+    "items_after_cursor": lambda s, ids: ItemRepository(s).get_items(
+        sort=ItemSort.PRICE_DESC, after=(3000, ids["item_id"]), limit=21),
+    "items_newest": lambda s, ids: ItemRepository(s).get_items(sort=ItemSort.NEWEST, limit=21),
+    "store_items": lambda s, ids: ItemRepository(s).get_items(store_id=ids["store_id"]),
+    "items_for_update": lambda s, ids: ItemRepository(s).get_items_by_ids_for_update([ids["item_id"]]),
+    "orders_by_user": lambda s, ids: OrderRepository(s).get_orders_by_user_id(ids["user_id"]),
+    "order_with_details": lambda s, ids: OrderRepository(s).get_order_by_id_with_details(ids["order_id"]),
+    "cart_items_by_user": lambda s, ids: CartRepository(s).get_cart_items_by_user_id(ids["user_id"]),
+    "reviews_by_item": lambda s, ids: ReviewRepository(s).get_reviews_by_item_id(ids["item_id"]),
+    "reviews_by_user": lambda s, ids: ReviewRepository(s).get_reviews_by_user_id(ids["user_id"]),
+    "review_by_user_and_item": lambda s, ids: ReviewRepository(s).get_review_by_user_and_item(
+        ids["user_id"], ids["item_id"]),
+    "store_by_owner": lambda s, ids: StoreRepository(s).get_store_by_owner_id(ids["user_id"]),
+    "store_by_phone_number": lambda s, ids: StoreRepository(s).get_store_by_phone_number("010-1234-5678"),
+    "store_by_name": lambda s, ids: StoreRepository(s).get_store_by_store_name("store"),
+    "user_by_email": lambda s, ids: UserRepository(s).get_user_by_email("owner@snu.ac.kr"),
+    "user_by_nickname": lambda s, ids: UserRepository(s).get_user_by_nickname("owner"),
+    "blocked_token": lambda s, ids: AuthRepository(s).is_refresh_token_blocked("token"),
+    "expired_blocked_tokens": lambda s, ids: AuthRepository(s).delete_expired_blocked_tokens(datetime.now(), 100),
+}
+
+# SQLite 의 EXPLAIN QUERY PLAN 에서 인덱스 없이 테이블 전체를 읽는 단계
+_FULL_SCAN = re.compile(r"SCAN \S+")
+
+@pytest.mark.parametrize("access_path", ACCESS_PATHS)
+def test_repository_query_uses_index(db_session: orm.Session, seeded: dict[str, str], access_path: str):
+    engine = db_session.get_bind().engine
+    statements: list[tuple[str, Any]] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        ACCESS_PATHS[access_path](db_session, seeded)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert statements
+    connection = db_session.connection()
+    for statement, parameters in statements:
+        plan = [row[-1] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)]
+        assert not [step for step in plan if _FULL_SCAN.fullmatch(step) or "TEMP B-TREE" in step], \
+            f"{statement}\n" + "\n".join(plan)
@@ -0,0 +1,30 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import orm, select
+from sqlalchemy.exc import InvalidRequestError
+
+from wapang.app.orders.models import Order
+from wapang.app.orders.repositories import OrderRepository
+
+
+@pytest.fixture
+def order_id(client: TestClient, access_token: str, items: list[dict], db_session: orm.Session) -> str:
+    req = {"items": [{"item_id": item["id"], "quantity": 1} for item in items[:3]]}
+    res = client.post("/orders", json=req, headers={"Authorization": f"Bearer {access_token}"})
+    assert res.status_code == 201
+    # 실제 요청처럼 비어 있는 identity map 에서 시작합니다.
+    db_session.expunge_all()
+    return res.json()["order_id"]
+
+def test_hidden_lazy_load_raises(order_id: str, db_session: orm.Session):
+    order = db_session.scalar(select(Order).where(Order.id == order_id))
+    with pytest.raises(InvalidRequestError):
+        order.order_items
+
+def test_order_with_details_reads_only_order_tables(order_id: str, db_session: orm.Session):
+    order = OrderRepository(db_session).get_order_by_id_with_details(order_id)
+    assert order is not None
+    assert all(order_item.store_name for order_item in order.order_items)
+    # 응답에 필요한 값은 주문 상품의 스냅샷에 있으므로 상품은 불러오지 않습니다.
+    with pytest.raises(InvalidRequestError):
+        order.order_items[0].item
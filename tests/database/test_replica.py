@@ -0,0 +1,68 @@
+from typing import Iterable
+
+from fastapi.testclient import TestClient
+import pytest
+import sqlalchemy
+from sqlalchemy import orm
+from sqlalchemy.pool import StaticPool
+
+from wapang.database.common import Base
+from wapang.database.connection import get_replica_db_session
+from wapang.main import app
+
+
+@pytest.fixture
+def replica_session(client: TestClient) -> Iterable[orm.Session]:
+    # primary 와 분리된 빈 SQLite 를 복제본으로 사용해 어느 쪽으로 라우팅되는지 확인합니다.
+    engine = sqlalchemy.create_engine(
+        "sqlite:///:memory:",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(bind=engine)
+    session = orm.Session(engine)
+    app.dependency_overrides[get_replica_db_session] = lambda: session
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def test_read_routes_use_replica(
+    client: TestClient,
+    store: dict,
+    item: dict,
+    replica_session: orm.Session,
+):
+    res = client.get("/items")
+    assert res.status_code == 200
+    assert res.json() == []
+
+    res = client.get(f"/stores/{store['id']}")
+    assert res.status_code == 404
+
+    res = client.get(f"/items/{item['id']}/reviews")
+    assert res.status_code == 404
+
+def test_write_routes_use_primary(
+    client: TestClient,
+    access_token: str,
+    store: dict,
+    item: dict,
+    replica_session: orm.Session,
+):
+    res = client.patch(
+        f"/items/{item['id']}",
+        json={"price": 1234},
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+    assert res.status_code == 200
+    assert res.json()["price"] == 1234
+
+    res = client.post(
+        "/orders",
+        json={"items": [{"item_id": item["id"], "quantity": 1}]},
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+    assert res.status_code == 201
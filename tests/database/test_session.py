@@ -0,0 +1,29 @@
+from sqlalchemy import orm, select, update
+
+from wapang.app.users.models import User
+from wapang.database.connection import get_db_manager, get_db_session, has_pending_writes
+
+
+def test_unused_session_does_not_check_out_connection():
+    pool = get_db_manager().engine.pool
+    checkouts = pool.checkout_count
+
+    session_generator = get_db_session()
+    next(session_generator)
+    next(session_generator, None)
+
+    assert pool.checkout_count == checkouts
+
+def test_read_only_session_has_no_pending_writes(db_session: orm.Session):
+    db_session.scalar(select(User))
+    assert not has_pending_writes(db_session)
+
+def test_flushed_session_has_pending_writes(db_session: orm.Session):
+    db_session.add(User(email="writer@snu.ac.kr", hashed_password="x"))
+    assert has_pending_writes(db_session)
+    db_session.flush()
+    assert has_pending_writes(db_session)
+
+def test_dml_statement_marks_pending_writes(db_session: orm.Session):
+    db_session.execute(update(User).where(User.email == "nobody@snu.ac.kr").values(nickname="x"))
+    assert has_pending_writes(db_session)
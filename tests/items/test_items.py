@@ -1,5 +1,10 @@
+import re
+
+import pytest
 from fastapi.testclient import TestClient
 
+from wapang.app.items import services as item_services
+
 def test_create_item(
     client: TestClient,
     access_token: str,
@@ -263,6 +268,150 @@ def test_get_items(
         assert item["price"] <= query_params["max_price"]
         assert item["stock"] > 0
 
+@pytest.mark.parametrize("sort", ["price_asc", "price_desc", "newest"])
+def test_get_items_with_cursor(
+    client: TestClient,
+    items: dict,
+    sort: str,
+):
+    res = client.get("/items", params={"sort": sort})
+    assert res.status_code == 200
+    assert "X-Next-Cursor" not in res.headers
+    expected = res.json()
+
+    pages: list[dict] = []
+    cursor = None
+    while True:
+        query_params = {"sort": sort, "limit": 2}
+        if cursor is not None:
+            query_params["cursor"] = cursor
+        res = client.get("/items", params=query_params)
+        assert res.status_code == 200
+        assert len(res.json()) <= 2
+        pages.extend(res.json())
+        cursor = res.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+
+    assert pages == expected
+    prices = [item["price"] for item in pages]
+    if sort == "price_asc":
+        assert prices == sorted(prices)
+    elif sort == "price_desc":
+        assert prices == sorted(prices, reverse=True)
+    else:
+        assert [item["id"] for item in pages[:len(items)]] == [item["id"] for item in reversed(items)]
+
+def test_get_items_with_invalid_cursor(
+    client: TestClient,
+    items: dict,
+):
+    res = client.get("/items", params={"sort": "price_asc", "limit": 2})
+    cursor = res.headers["X-Next-Cursor"]
+
+    for query_params in (
+        {"sort": "price_desc", "cursor": cursor},
+        {"sort": "price_asc", "cursor": "not-a-cursor"},
+        {"limit": 0},
+        {"limit": 101},
+    ):
+        res = client.get("/items", params=query_params)
+        assert res.status_code == 400
+        assert res.json()["error_code"] == "ERR_003"
+
+def test_search_items(
+    client: TestClient,
+    access_token: str,
+    items: dict,
+):
+    req = {"item_name": "다크초콜릿", "price": 1000, "stock": 1}
+    res = client.post("/items", json=req, headers={"Authorization": f"Bearer {access_token}"})
+    assert res.status_code == 201
+
+    res = client.get("/items", params={"q": "초콜릿"})
+    assert res.status_code == 200
+    names = [item["item_name"] for item in res.json()]
+    # 단어 전체가 일치하는 상품이 부분 일치("다크초콜릿")보다 앞에 옵니다.
+    assert sorted(names[:5]) == [f"초콜릿_{i}" for i in range(5)]
+    assert names[5:] == ["다크초콜릿"]
+
+    res = client.get("/items", params={"q": "초콜릿", "sort": "price_asc", "min_price": 5000})
+    assert res.status_code == 200
+    assert [item["item_name"] for item in res.json()] == [f"초콜릿_{i}" for i in range(5)]
+
+    res = client.get("/items", params={"q": "사탕초콜릿"})
+    assert res.status_code == 200
+    assert res.json() == []
+
+def test_search_items_with_cursor(
+    client: TestClient,
+    items: dict,
+):
+    expected = client.get("/items", params={"q": "초콜릿"}).json()
+    pages: list[dict] = []
+    query_params = {"q": "초콜릿", "limit": 2}
+    while True:
+        res = client.get("/items", params=query_params)
+        assert res.status_code == 200
+        pages.extend(res.json())
+        if "X-Next-Cursor" not in res.headers:
+            break
+        query_params["cursor"] = res.headers["X-Next-Cursor"]
+    assert pages == expected
+    assert len(pages) == 5
+
+def test_sorted_search_reads_candidates_in_batches(
+    client: TestClient,
+    items: dict,
+    assert_max_queries,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(item_services, "_SEARCH_BATCH_SIZE", 2)
+    pages: list[dict] = []
+    query_params = {"q": "초콜릿", "sort": "price_desc", "limit": 2}
+    while True:
+        with assert_max_queries(3) as collector:
+            res = client.get("/items", params=query_params)
+        assert res.status_code == 200
+        # IN 목록은 묶음 크기를 넘지 않습니다.
+        in_lists = [re.search(r"IN \(([^)]*)\)", statement) for statement, _ in collector.statements]
+        assert any(in_lists) and all(in_list.group(1).count("?") <= 2 for in_list in in_lists if in_list)
+        pages.extend(res.json())
+        if "X-Next-Cursor" not in res.headers:
+            break
+        query_params["cursor"] = res.headers["X-Next-Cursor"]
+    assert [item["item_name"] for item in pages] == [f"초콜릿_{i}" for i in reversed(range(5))]
+
+    # 후보가 상한을 넘으면 관련도 상위 후보 안에서만 정렬합니다.
+    monkeypatch.setattr(item_services, "_SEARCH_SORT_CANDIDATES", 3)
+    prices = [item["price"] for item in client.get("/items", params={"q": "초콜릿", "sort": "price_asc"}).json()]
+    assert len(prices) == 3 and prices == sorted(prices)
+
+def test_search_items_after_update_and_delete(
+    client: TestClient,
+    access_token: str,
+    items: dict,
+):
+    auth_header = {"Authorization": f"Bearer {access_token}"}
+    res = client.patch(f"/items/{items[0]['id']}", json={"item_name": "젤리"}, headers=auth_header)
+    assert res.status_code == 200
+    res = client.delete(f"/items/{items[1]['id']}", headers=auth_header)
+    assert res.status_code == 204
+
+    res = client.get("/items", params={"q": "젤리"})
+    assert [item["id"] for item in res.json()] == [items[0]["id"]]
+    res = client.get("/items", params={"q": "초콜릿"})
+    assert {item["id"] for item in res.json()} == {item["id"] for item in items[2:5]}
+
+def test_search_items_with_invalid_query(
+    client: TestClient,
+    items: dict,
+):
+    for query_params in ({"q": "  "}, {"q": "a" * 51}, {"sort": "relevance"}):
+        res = client.get("/items", params=query_params)
+        assert res.status_code == 400
+        assert res.json()["error_code"] == "ERR_003"
+
 def test_get_items_no_store(
     client: TestClient,
     items: dict
@@ -333,4 +482,75 @@ def test_get_store_items_no_store(
     res_json = res.json()
     assert res.status_code == 404
     assert res_json["error_code"] == "ERR_010"
-    assert res_json["error_msg"] == "STORE NOT FOUND"
\ No newline at end of file
+    assert res_json["error_msg"] == "STORE NOT FOUND"
+
+@pytest.mark.parametrize("n_items", [1, 10])
+def test_get_items_query_budget(
+    client: TestClient,
+    access_token: str,
+    store: dict,
+    assert_max_queries,
+    n_items: int,
+):
+    for i in range(n_items):
+        req = {"item_name": f"초콜릿_{i}", "price": 1000 + i, "stock": 10}
+        res = client.post("/items", json=req, headers={"Authorization": f"Bearer {access_token}"})
+        assert res.status_code == 201
+
+    with assert_max_queries(2):
+        res = client.get("/items", params={"store_id": store["id"], "in_stock": True})
+    assert res.status_code == 200
+    assert len(res.json()) == n_items
+
+@pytest.mark.parametrize("n_reviews", [1, 4])
+def test_get_item_reviews_query_budget(
+    client: TestClient,
+    item: dict,
+    assert_max_queries,
+    n_reviews: int,
+):
+    for i in range(n_reviews):
+        user = {"email": f"reviewer{i}@snu.ac.kr", "password": "password123"}
+        client.post("/users", json=user)
+        token = client.post("/auth/tokens", json=user).json()["access_token"]
+        auth_header = {"Authorization": f"Bearer {token}"}
+        client.patch("/users/me", json={"nickname": f"리뷰어{i}"}, headers=auth_header)
+        res = client.post(f"/items/{item['id']}/reviews", json={"rating": 5, "comment": "Great"}, headers=auth_header)
+        assert res.status_code == 201
+
+    with assert_max_queries(3):
+        res = client.get(f"/items/{item['id']}/reviews")
+    assert res.status_code == 200
+    assert len(res.json()) == n_reviews
+
+def test_create_item_query_budget(
+    client: TestClient,
+    access_token: str,
+    store: dict,
+    item_create_request: dict,
+    assert_max_queries,
+):
+    with assert_max_queries(2):
+        res = client.post("/items", json=item_create_request, headers={"Authorization": f"Bearer {access_token}"})
+    assert res.status_code == 201
+
+def test_update_item_query_budget(
+    client: TestClient,
+    access_token: str,
+    item: dict,
+    assert_max_queries,
+):
+    with assert_max_queries(3):
+        res = client.patch(f"/items/{item['id']}", json={"item_name": "다크 초콜릿", "price": 2000},
+                           headers={"Authorization": f"Bearer {access_token}"})
+    assert res.status_code == 200
+
+def test_delete_item_query_budget(
+    client: TestClient,
+    access_token: str,
+    item: dict,
+    assert_max_queries,
+):
+    with assert_max_queries(5):
+        res = client.delete(f"/items/{item['id']}", headers={"Authorization": f"Bearer {access_token}"})
+    assert res.status_code == 204
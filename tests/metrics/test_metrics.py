@@ -0,0 +1,78 @@
+import logging
+
+from fastapi.testclient import TestClient
+import pytest
+import sqlalchemy
+
+from wapang.app.metrics.settings import METRICS_SETTINGS
+from wapang.database.connection import InstrumentedQueuePool
+from wapang.database.settings import DB_SETTINGS
+
+METRICS_ROUTES = ["db-pool", "cache", "cache-bus", "token-cache", "password-hashing", "token-denylist", "search-index"]
+
+def test_get_db_pool_stats(client: TestClient, metrics_headers: dict[str, str]):
+    res = client.get("/metrics/db-pool", headers=metrics_headers)
+    assert res.status_code == 200
+    res_json = res.json()
+    for key in ["size", "checked_in", "checked_out", "overflow", "checkouts", "timeouts", "total_wait_ms", "max_wait_ms"]:
+        assert key in res_json
+
+def test_instrumented_pool_counts_checkouts():
+    engine = sqlalchemy.create_engine("sqlite://", poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=0)
+    try:
+        for _ in range(3):
+            with engine.connect() as connection:
+                connection.execute(sqlalchemy.text("SELECT 1"))
+        pool = engine.pool
+        assert isinstance(pool, InstrumentedQueuePool)
+        assert pool.checkout_count == 3
+        assert pool.checkedout() == 0
+        assert pool.max_wait_seconds >= 0
+    finally:
+        engine.dispose()
+
+def test_db_query_headers(client: TestClient, items: list[dict]):
+    res = client.get("/items")
+    assert res.status_code == 200
+    assert int(res.headers["X-DB-Queries"]) >= 1
+    assert res.headers["Server-Timing"].startswith("db;dur=")
+
+def test_repeated_statement_warning(
+    client: TestClient,
+    access_token: str,
+    items: list[dict],
+    monkeypatch,
+    caplog,
+):
+    # 임계값을 0 으로 두면 한 번이라도 실행된 문장이 경고 대상이 됩니다.
+    monkeypatch.setattr(DB_SETTINGS, "query_repeat_warning_threshold", 0)
+    with caplog.at_level(logging.WARNING, logger="uvicorn.error"):
+        res = client.get("/items")
+    assert res.status_code == 200
+    assert any("Possible N+1 query on GET /items" in record.message for record in caplog.records)
+
+def test_metrics_routes_do_not_query_db(
+    client: TestClient,
+    assert_max_queries,
+    metrics_headers: dict[str, str],
+):
+    with assert_max_queries(0):
+        for name in METRICS_ROUTES:
+            assert client.get(f"/metrics/{name}", headers=metrics_headers).status_code == 200
+
+@pytest.mark.parametrize("token, headers", [
+    (None, {"X-Metrics-Token": "test-metrics-token"}),
+    ("test-metrics-token", {}),
+    ("test-metrics-token", {"X-Metrics-Token": "wrong-token"}),
+])
+def test_metrics_routes_require_token(
+    client: TestClient,
+    token: str | None,
+    headers: dict[str, str],
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(METRICS_SETTINGS, "token", token)
+    for name in METRICS_ROUTES:
+        res = client.get(f"/metrics/{name}", headers=headers)
+        assert res.status_code == 404
+        assert res.json()["error_code"] == "ERR_027"
@@ -0,0 +1,178 @@
+from types import SimpleNamespace
+from typing import Callable, ContextManager
+
+from fastapi.testclient import TestClient
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from wapang.app.carts.models import StockReservation
+from wapang.app.carts.repositories import ReservationRepository
+from wapang.app.carts.reservations import ReservationService
+from wapang.app.carts.settings import CART_SETTINGS
+from wapang.app.items.models import Item
+from wapang.app.items.repositories import ItemRepository
+from wapang.app.orders import queue
+from wapang.app.orders.models import Order, QueuedOrder, StatusEnum
+from wapang.app.orders.repositories import OrderRepository
+from wapang.app.orders.services import OrderService
+from wapang.app.orders.settings import ORDER_SETTINGS
+from wapang.app.users.models import User
+from wapang.database.instrumentation import QueryCollector
+
+
+@pytest.fixture(autouse=True)
+def queue_enabled(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(ORDER_SETTINGS, "queue_enabled", True)
+
+def _process(db_session: Session) -> int:
+    # 백그라운드 워커 대신 테스트 세션으로 대기열을 한 묶음 처리합니다.
+    item_repository = ItemRepository(db_session)
+    order_service = OrderService(OrderRepository(db_session), item_repository,
+                                 ReservationService(ReservationRepository(db_session), item_repository))
+    return order_service.process_queued_orders(100)
+
+def _stock(db_session: Session, item_id: str) -> int:
+    return db_session.scalar(select(Item.stock).where(Item.id == item_id))
+
+def test_queued_order_is_accepted_then_processed(
+    client: TestClient,
+    access_token: str,
+    item: dict,
+    db_session: Session,
+):
+    headers = {"Authorization": f"Bearer {access_token}"}
+    res = client.post("/orders", json={"items": [{"item_id": item["id"], "quantity": 3}]}, headers=headers)
+    assert res.status_code == 202
+    accepted = res.json()
+    assert accepted["status"] == "PENDING"
+    assert _stock(db_session, item["id"]) == item["stock"]
+
+    res = client.get(f"/orders/{accepted['order_id']}", headers=headers)
+    assert res.json()["status"] == "PENDING"
+
+    assert _process(db_session) == 1
+    res = client.get(f"/orders/{accepted['order_id']}", headers=headers)
+    order = res.json()
+    assert order["status"] == "ORDERED"
+    assert order["details"][0]["items"][0]["quantity"] == 3
+    assert order["total_price"] == item["price"] * 3 + order["details"][0]["delivery_fee"]
+    assert _stock(db_session, item["id"]) == item["stock"] - 3
+    assert db_session.scalar(select(func.count()).select_from(QueuedOrder)) == 0
+
+def test_queued_orders_for_hot_item_decrement_stock_once_per_batch(
+    client: TestClient,
+    access_token: str,
+    item: dict,
+    db_session: Session,
+    assert_max_queries: Callable[[int], ContextManager[QueryCollector]],
+):
+    headers = {"Authorization": f"Bearer {access_token}"}
+    quantity = item["stock"] // 2 - 1
+    order_ids = []
+    for _ in range(3):
+        res = client.post("/orders", json={"items": [{"item_id": item["id"], "quantity": quantity}]}, headers=headers)
+        assert res.status_code == 202
+        order_ids.append(res.json()["order_id"])
+
+    # 대기열 조회, 상품/상점 잠금, 재고 차감, 주문 상품 insert, 대기열 delete 각 1번과 주문마다 상태 update 1번
+    with assert_max_queries(9) as collector:
+        assert _process(db_session) == 3
+    updates = [statement for statement, _ in collector.statements if statement.startswith("UPDATE item")]
+    assert len(updates) == 1
+
+    # 먼저 접수된 두 주문에 재고를 배정하고, 남은 재고로 부족한 세 번째 주문은 거절합니다.
+    statuses = [client.get(f"/orders/{order_id}", headers=headers).json()["status"] for order_id in order_ids]
+    assert statuses == ["ORDERED", "ORDERED", "REJECTED"]
+    assert _stock(db_session, item["id"]) == item["stock"] - quantity * 2
+
+def test_queued_order_canceled_before_processing(
+    client: TestClient,
+    access_token: str,
+    item: dict,
+    db_session: Session,
+):
+    headers = {"Authorization": f"Bearer {access_token}"}
+    res = client.post("/orders", json={"items": [{"item_id": item["id"], "quantity": 1}]}, headers=headers)
+    order_id = res.json()["order_id"]
+
+    res = client.patch(f"/orders/{order_id}", json={"status": "COMPLETED"}, headers=headers)
+    assert res.status_code == 409
+    res = client.patch(f"/orders/{order_id}", json={"status": "CANCELED"}, headers=headers)
+    assert res.status_code == 200
+
+    assert _process(db_session) == 1
+    assert client.get(f"/orders/{order_id}", headers=headers).json()["status"] == "CANCELED"
+    assert _stock(db_session, item["id"]) == item["stock"]
+
+def test_queued_order_validates_before_enqueue(
+    client: TestClient,
+    access_token: str,
+    item: dict,
+):
+    headers = {"Authorization": f"Bearer {access_token}"}
+    res = client.post("/orders", json={"items": [{"item_id": item["id"], "quantity": item["stock"] + 1}]},
+                      headers=headers)
+    assert res.status_code == 409
+    assert res.json()["error_code"] == "ERR_017"
+    res = client.post("/orders", json={"items": []}, headers=headers)
+    assert res.status_code == 422
+
+@pytest.mark.parametrize("reserved, ordered", [
+    (20, 20),
+    (5, 3),
+    (3, 5),
+])
+def test_queued_order_uses_cart_reservation(
+    client: TestClient,
+    access_token: str,
+    item: dict,
+    db_session: Session,
+    monkeypatch: pytest.MonkeyPatch,
+    reserved: int,
+    ordered: int,
+):
+    monkeypatch.setattr(CART_SETTINGS, "reservations_enabled", True)
+    headers = {"Authorization": f"Bearer {access_token}"}
+    res = client.patch("/carts", json={"item_id": item["id"], "quantity": reserved}, headers=headers)
+    assert res.status_code == 200
+
+    # 예약해 둔 수량은 재고에서 이미 빠져 있으므로, 재고가 모두 예약돼 있어도 접수됩니다.
+    res = client.post("/orders", json={"items": [{"item_id": item["id"], "quantity": ordered}]}, headers=headers)
+    assert res.status_code == 202
+    assert _process(db_session) == 1
+    assert client.get(f"/orders/{res.json()['order_id']}", headers=headers).json()["status"] == "ORDERED"
+
+    # 재고는 예약과 주문 중 큰 쪽만큼만 줄고, 남은 예약은 주문한 만큼 줄어듭니다.
+    assert _stock(db_session, item["id"]) == item["stock"] - max(reserved, ordered)
+    left = db_session.scalar(select(StockReservation.quantity).where(StockReservation.item_id == item["id"]))
+    assert left == (reserved - ordered if reserved > ordered else None)
+
+def test_poison_queued_order_is_rejected_without_blocking_batch(
+    client: TestClient,
+    access_token: str,
+    user: User,
+    item: dict,
+    db_session: Session,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    # 워커는 테스트 연결 위에서 자기 세션을 열고, 커밋과 롤백은 테스트 트랜잭션 안의 SAVEPOINT 로 합니다.
+    monkeypatch.setattr(queue, "get_db_manager",
+                        lambda: SimpleNamespace(session_factory=sessionmaker(db_session.bind, expire_on_commit=False)))
+    headers = {"Authorization": f"Bearer {access_token}"}
+    # 대기열 맨 앞에 처리할 수 없는 주문을 넣습니다.
+    poison = Order(user_id=user.id, total_price=0, status=StatusEnum.PENDING)
+    db_session.add(poison)
+    db_session.flush()
+    db_session.add(QueuedOrder(order_id=poison.id, lines="not json"))
+    db_session.commit()
+    res = client.post("/orders", json={"items": [{"item_id": item["id"], "quantity": 3}]}, headers=headers)
+    assert res.status_code == 202
+    order_id = res.json()["order_id"]
+
+    assert queue.drain_order_queue() == 2
+    assert client.get(f"/orders/{poison.id}", headers=headers).json()["status"] == "REJECTED"
+    assert client.get(f"/orders/{order_id}", headers=headers).json()["status"] == "ORDERED"
+    assert _stock(db_session, item["id"]) == item["stock"] - 3
+    assert db_session.scalar(select(func.count()).select_from(QueuedOrder)) == 0
+    assert queue.drain_order_queue() == 0
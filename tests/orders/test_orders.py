@@ -1,6 +1,17 @@
+from datetime import datetime, timedelta
 from fastapi.testclient import TestClient
 import pytest
 import random
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from wapang.app.idempotency.models import IdempotencyKey
+from wapang.app.idempotency.repositories import IdempotencyRepository
+from wapang.app.idempotency.services import purge_expired_idempotency_keys
+from wapang.app.idempotency.settings import IDEMPOTENCY_SETTINGS
+from wapang.app.items.models import Item
+from wapang.app.items.repositories import ItemRepository
+from wapang.app.orders.models import Order
 
 
 def test_create_order(
@@ -89,6 +100,29 @@ def test_create_order_with_not_enough_stock(
     assert res_json["error_code"] == "ERR_017"
     assert res_json["error_msg"] == "NOT ENOUGH STOCK"
 
+def test_create_order_when_stock_taken_after_read(
+    client: TestClient,
+    access_token: str,
+    item: dict,
+    db_session: Session,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    # 상품을 읽은 직후 다른 주문이 재고를 모두 가져간 상황을 흉내냅니다.
+    get_items = ItemRepository.get_items_by_ids_for_update
+
+    def get_items_then_sell_out(self: ItemRepository, item_ids: list[str]):
+        items = get_items(self, item_ids)
+        self.session.execute(update(Item).where(Item.id == item["id"]).values(stock=0))
+        return items
+
+    monkeypatch.setattr(ItemRepository, "get_items_by_ids_for_update", get_items_then_sell_out)
+
+    req = [{"item_id": item["id"], "quantity": 1}]
+    res = client.post("/orders", json={"items": req}, headers={"Authorization": f"Bearer {access_token}"})
+    assert res.status_code == 409
+    assert res.json()["error_code"] == "ERR_017"
+    assert db_session.scalar(select(Item.stock).where(Item.id == item["id"])) == 0
+
 def test_create_order_with_no_items(
     client: TestClient,
     access_token: str,
@@ -101,6 +135,55 @@ def test_create_order_with_no_items(
     assert res_json["error_code"] == "ERR_018"
     assert res_json["error_msg"] == "EMPTY ITEM LIST"
 
+def test_create_order_with_idempotency_key_replays_first_response(
+    client: TestClient,
+    access_token: str,
+    item: dict,
+    db_session: Session,
+):
+    headers = {"Authorization": f"Bearer {access_token}", "Idempotency-Key": "order-1"}
+    req = {"items": [{"item_id": item["id"], "quantity": 2}]}
+    first = client.post("/orders", json=req, headers=headers)
+    assert first.status_code == 201
+
+    # 타임아웃 뒤의 재시도: 주문을 다시 만들거나 재고를 다시 차감하지 않습니다.
+    retry = client.post("/orders", json=req, headers=headers)
+    assert retry.status_code == 201
+    assert retry.json() == first.json()
+    assert db_session.scalar(select(func.count()).select_from(Order)) == 1
+    assert db_session.scalar(select(Item.stock).where(Item.id == item["id"])) == item["stock"] - 2
+
+    # 같은 키로 다른 주문을 보내면 거부합니다.
+    req["items"][0]["quantity"] = 3
+    res = client.post("/orders", json=req, headers=headers)
+    assert res.status_code == 422
+    assert res.json()["error_code"] == "ERR_025"
+
+    # 키가 다르면 새 주문입니다.
+    res = client.post("/orders", json=req, headers={**headers, "Idempotency-Key": "order-2"})
+    assert res.status_code == 201
+    assert res.json()["order_id"] != first.json()["order_id"]
+
+def test_purge_expired_idempotency_keys(
+    client: TestClient,
+    access_token: str,
+    item: dict,
+    db_session: Session,
+):
+    headers = {"Authorization": f"Bearer {access_token}", "Idempotency-Key": "order-1"}
+    req = {"items": [{"item_id": item["id"], "quantity": 1}]}
+    first = client.post("/orders", json=req, headers=headers)
+    assert first.status_code == 201
+
+    later = datetime.now() + timedelta(seconds=IDEMPOTENCY_SETTINGS.ttl_seconds + 1)
+    assert purge_expired_idempotency_keys(IdempotencyRepository(db_session), batch_size=10, now=later) == 1
+    assert db_session.scalar(select(func.count()).select_from(IdempotencyKey)) == 0
+
+    # 만료된 키는 새 요청으로 처리합니다.
+    retry = client.post("/orders", json=req, headers=headers)
+    assert retry.status_code == 201
+    assert retry.json()["order_id"] != first.json()["order_id"]
+
 def test_get_order(
     client: TestClient,
     access_token: str,
@@ -112,6 +195,28 @@ def test_get_order(
     res_json = res.json()
     assert res_json == order
 
+def test_get_order_after_item_repriced_or_deleted(
+    client: TestClient,
+    access_token: str,
+    order: dict,
+    order_items: list[dict],
+):
+    auth_header = {"Authorization": f"Bearer {access_token}"}
+    repriced, deleted = order_items[0], order_items[1]
+    res = client.patch(f"/items/{repriced['id']}", json={"price": repriced["price"] + 1000}, headers=auth_header)
+    assert res.status_code == 200
+    res = client.delete(f"/items/{deleted['id']}", headers=auth_header)
+    assert res.status_code == 204
+
+    res = client.get(f"/orders/{order['order_id']}", headers=auth_header)
+    assert res.status_code == 200
+    res_json = res.json()
+    assert res_json["total_price"] == order["total_price"]
+    lines = {line["item_name"]: line for detail in res_json["details"] for line in detail["items"]}
+    assert lines[repriced["item_name"]]["price"] == repriced["price"]
+    assert lines[deleted["item_name"]]["item_id"] is None
+    assert lines[deleted["item_name"]]["price"] == deleted["price"]
+
 def test_get_order_with_invalid_order_id(
     client: TestClient,
     access_token: str,
@@ -216,4 +321,62 @@ def test_get_orders_by_user(
     assert res.status_code == 200
     res_json = res.json()
     assert isinstance(res_json, list)
-    assert len(res_json) >= 1
\ No newline at end of file
+    assert len(res_json) >= 1
+def _create_items(client: TestClient, access_token: str, n_items: int) -> list[dict]:
+    item_list = []
+    for i in range(n_items):
+        req = {"item_name": f"초콜릿_{i}", "price": 1000 + i, "stock": 100}
+        res = client.post("/items", json=req, headers={"Authorization": f"Bearer {access_token}"})
+        assert res.status_code == 201
+        item_list.append(res.json())
+    return item_list
+
+@pytest.mark.parametrize("n_items", [
+    1,
+    10,
+])
+def test_create_order_query_budget(
+    client: TestClient,
+    access_token: str,
+    store: dict,
+    assert_max_queries,
+    n_items: int,
+):
+    items = _create_items(client, access_token, n_items)
+    req = {"items": [{"item_id": item["id"], "quantity": 1} for item in items]}
+
+    with assert_max_queries(7):
+        res = client.post("/orders", json=req, headers={"Authorization": f"Bearer {access_token}"})
+    assert res.status_code == 201
+
+@pytest.mark.parametrize("n_items", [
+    1,
+    10,
+])
+def test_get_order_query_budget(
+    client: TestClient,
+    access_token: str,
+    store: dict,
+    assert_max_queries,
+    n_items: int,
+):
+    items = _create_items(client, access_token, n_items)
+    req = {"items": [{"item_id": item["id"], "quantity": 1} for item in items]}
+    res = client.post("/orders", json=req, headers={"Authorization": f"Bearer {access_token}"})
+    order_id = res.json()["order_id"]
+
+    with assert_max_queries(3):
+        res = client.get(f"/orders/{order_id}", headers={"Authorization": f"Bearer {access_token}"})
+    assert res.status_code == 200
+    assert len(res.json()["details"][0]["items"]) == n_items
+
+def test_update_order_status_query_budget(
+    client: TestClient,
+    access_token: str,
+    order: dict,
+    assert_max_queries,
+):
+    with assert_max_queries(2):
+        res = client.patch(f"/orders/{order['order_id']}", json={"status": "CANCELED"},
+                           headers={"Authorization": f"Bearer {access_token}"})
+    assert res.status_code == 200
@@ -345,4 +345,49 @@ def test_list_user_reviews(
                 assert r["rating"] == review["rating"]
                 assert r["comment"] == review["comment"]
                 break
-        assert found is True
\ No newline at end of file
+        assert found is True
+
+
+def test_create_review_query_budget(
+    client: TestClient,
+    access_token: str,
+    item: dict,
+    assert_max_queries,
+):
+    res = client.patch("/users/me", json={"nickname": "김와플"}, headers={"Authorization": f"Bearer {access_token}"})
+    assert res.status_code == 200
+    with assert_max_queries(4):
+        res = client.post(f"/items/{item['id']}/reviews", json={"rating": 4, "comment": "Good"},
+                          headers={"Authorization": f"Bearer {access_token}"})
+    assert res.status_code == 201
+
+def test_get_review_query_budget(
+    client: TestClient,
+    access_token: str,
+    review: dict,
+    assert_max_queries,
+):
+    with assert_max_queries(1):
+        res = client.get(f"/reviews/{review['review_id']}", headers={"Authorization": f"Bearer {access_token}"})
+    assert res.status_code == 200
+
+def test_update_review_query_budget(
+    client: TestClient,
+    access_token: str,
+    review: dict,
+    assert_max_queries,
+):
+    with assert_max_queries(2):
+        res = client.patch(f"/reviews/{review['review_id']}", json={"rating": 3, "comment": "So-so"},
+                           headers={"Authorization": f"Bearer {access_token}"})
+    assert res.status_code == 200
+
+def test_delete_review_query_budget(
+    client: TestClient,
+    access_token: str,
+    review: dict,
+    assert_max_queries,
+):
+    with assert_max_queries(2):
+        res = client.delete(f"/reviews/{review['review_id']}", headers={"Authorization": f"Bearer {access_token}"})
+    assert res.status_code == 204
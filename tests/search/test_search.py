@@ -0,0 +1,128 @@
+import json
+import time
+
+from fastapi.testclient import TestClient
+from sqlalchemy import orm
+
+from wapang.app.items.repositories import ItemRepository
+from wapang.app.search.indexes import ITEM_NAME_INDEX, PrefixIndex
+from wapang.cache.bus import INVALIDATION_BUS
+from wapang.cache.invalidation import search_tag
+
+def test_suggest_items_and_stores(
+    client: TestClient,
+    items: list[dict],
+    store: dict,
+):
+    res = client.get("/search/suggest", params={"prefix": "초콜"})
+    assert res.status_code == 200
+    assert [suggestion["name"] for suggestion in res.json()] == [f"초콜릿_{i}" for i in range(5)]
+    assert all(suggestion["type"] == "item" for suggestion in res.json())
+
+    res = client.get("/search/suggest", params={"prefix": "my"})
+    assert res.status_code == 200
+    assert res.json() == [{"type": "store", "id": store["id"], "name": "My Store"}]
+
+    # 이름 중간의 단어로도 시작할 수 있습니다.
+    res = client.get("/search/suggest", params={"prefix": "STO"})
+    assert res.status_code == 200
+    assert [suggestion["id"] for suggestion in res.json()] == [store["id"]]
+
+def test_suggest_with_limit(
+    client: TestClient,
+    items: list[dict],
+):
+    res = client.get("/search/suggest", params={"prefix": "초", "limit": 2})
+    assert res.status_code == 200
+    assert [suggestion["name"] for suggestion in res.json()] == ["초콜릿_0", "초콜릿_1"]
+
+def test_suggest_after_update_and_delete(
+    client: TestClient,
+    access_token: str,
+    item: dict,
+    store: dict,
+):
+    headers = {"Authorization": f"Bearer {access_token}"}
+    res = client.patch(f"/items/{item['id']}", json={"item_name": "다크 초콜릿"}, headers=headers)
+    assert res.status_code == 200
+    res = client.patch(f"/stores/{store['id']}", json={"store_name": "초코 가게"}, headers=headers)
+    assert res.status_code == 200
+
+    res = client.get("/search/suggest", params={"prefix": "초"})
+    assert [(suggestion["type"], suggestion["name"]) for suggestion in res.json()] == \
+        [("store", "초코 가게"), ("item", "다크 초콜릿")]
+    assert client.get("/search/suggest", params={"prefix": "my"}).json() == []
+
+    res = client.delete(f"/items/{item['id']}", headers=headers)
+    assert res.status_code == 204
+    assert [suggestion["type"] for suggestion in client.get("/search/suggest", params={"prefix": "초"}).json()] == \
+        ["store"]
+
+def test_rolled_back_name_is_not_indexed(
+    client: TestClient,
+    db_session: orm.Session,
+):
+    ItemRepository(db_session).reindex_item("00000000-0000-0000-0000-000000000000", "유령 상품")
+    db_session.rollback()
+    assert client.get("/search/suggest", params={"prefix": "유령"}).json() == []
+    assert ITEM_NAME_INDEX.search("유령") == []
+
+def test_name_change_from_other_worker_is_indexed(
+    client: TestClient,
+):
+    item_id = "00000000-0000-0000-0000-000000000001"
+    def receive(tag: str) -> None:
+        INVALIDATION_BUS._receive(json.dumps({"origin": "other", "sent_at": time.time(), "tags": [tag]}).encode())
+
+    receive(search_tag("item", item_id, "원격: 상품"))
+    assert client.get("/search/suggest", params={"prefix": "원격"}).json() == \
+        [{"type": "item", "id": item_id, "name": "원격: 상품"}]
+    assert [found for found, _ in ITEM_NAME_INDEX.search("상품")] == [item_id]
+
+    receive(search_tag("item", item_id, None))
+    assert client.get("/search/suggest", params={"prefix": "원격"}).json() == []
+    assert ITEM_NAME_INDEX.search("상품") == []
+
+def test_suggest_with_invalid_params(
+    client: TestClient,
+):
+    for params in [{}, {"prefix": " "}, {"prefix": "a" * 21}, {"prefix": "a", "limit": 0}, {"prefix": "a", "limit": 21}]:
+        res = client.get("/search/suggest", params=params)
+        assert res.status_code == 400
+
+def test_search_index_stats(
+    client: TestClient,
+    items: list[dict],
+    metrics_headers: dict[str, str],
+):
+    res = client.get("/metrics/search-index", headers=metrics_headers)
+    assert res.status_code == 200
+    res_json = res.json()
+    assert res_json["item_names"] == len(items)
+    # 상점 이름 하나와 상품 이름들이 들어 있습니다.
+    assert res_json["suggestions"]["names"] == len(items) + 1
+    assert res_json["suggestions"]["entries"] >= res_json["suggestions"]["names"]
+    assert res_json["suggestions"]["approx_bytes"] > 0
+
+def test_prefix_index_is_bounded():
+    index = PrefixIndex(max_key_length=4, max_entries=2)
+    index.build([("item", "1", "abcdefgh"), ("item", "2", "ab cd"), ("item", "3", "zz")])
+    # "ab cd" 는 키가 두 개("ab c", "cd")라 자리가 부족해 빠집니다.
+    assert index.stats()["entries"] == 2
+    assert index.stats()["dropped"] == 1
+    assert index.suggest("abcdef", 10) == [("item", "1", "abcdefgh")]
+
+    index.add("store", "4", "ab")
+    assert index.stats()["dropped"] == 2
+    index.remove("item", "3")
+    index.add("store", "4", "ab")
+    assert [entity_id for _, entity_id, _ in index.suggest("ab", 10)] == ["4", "1"]
+
+def test_search_routes_do_not_query_db(
+    client: TestClient,
+    items: list[dict],
+    assert_max_queries,
+):
+    # 색인만 읽습니다.
+    with assert_max_queries(0):
+        assert client.get("/search/suggest", params={"prefix": "초콜"}).status_code == 200
@@ -1,3 +1,4 @@
+import pytest
 from fastapi.testclient import TestClient
 
 from wapang.app.users.models import User
@@ -376,4 +377,53 @@ def test_get_store_not_found(
     assert res.status_code == 404
     res_json = res.json()
     assert res_json["error_code"] == "ERR_010"
-    assert res_json["error_msg"] == "STORE NOT FOUND"
\ No newline at end of file
+    assert res_json["error_msg"] == "STORE NOT FOUND"
+
+@pytest.mark.parametrize("n_items", [1, 10])
+def test_get_store_items_query_budget(
+    client: TestClient,
+    access_token: str,
+    store: dict,
+    assert_max_queries,
+    n_items: int,
+):
+    for i in range(n_items):
+        req = {"item_name": f"초콜릿_{i}", "price": 1000 + i, "stock": 10}
+        res = client.post("/items", json=req, headers={"Authorization": f"Bearer {access_token}"})
+        assert res.status_code == 201
+
+    with assert_max_queries(2):
+        res = client.get(f"/stores/{store['id']}/items")
+    assert res.status_code == 200
+    assert len(res.json()) == n_items
+
+def test_create_store_query_budget(
+    client: TestClient,
+    access_token: str,
+    store_create_request: dict,
+    assert_max_queries,
+):
+    # 사용자, 이미 가진 상점, 이름/이메일/전화번호 중복 확인 각 1번과 insert
+    with assert_max_queries(6):
+        res = client.post("/stores", json=store_create_request, headers={"Authorization": f"Bearer {access_token}"})
+    assert res.status_code == 201
+
+def test_patch_store_query_budget(
+    client: TestClient,
+    access_token: str,
+    store: dict,
+    assert_max_queries,
+):
+    req = {"store_name": "Updated Store", "email": "updated@wafflestudio.com", "phone_number": "010-9999-8888"}
+    with assert_max_queries(6):
+        res = client.patch(f"/stores/{store['id']}", json=req, headers={"Authorization": f"Bearer {access_token}"})
+    assert res.status_code == 200
+
+def test_get_store_query_budget(
+    client: TestClient,
+    store: dict,
+    assert_max_queries,
+):
+    with assert_max_queries(1):
+        res = client.get(f"/stores/{store['id']}")
+    assert res.status_code == 200
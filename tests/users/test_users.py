@@ -148,6 +148,37 @@ def test_get_me_invalid_token(
     assert res_json["error_code"] == "ERR_007"
     assert res_json["error_msg"] == "INVALID TOKEN"
 
+def test_get_me_uses_cached_user(
+    client: TestClient,
+    access_token: str,
+    assert_max_queries,
+):
+    auth_header = {"Authorization": f"Bearer {access_token}"}
+    assert client.get("/users/me", headers=auth_header).status_code == 200
+
+    # 토큰의 사용자를 다시 조회하지 않습니다.
+    with assert_max_queries(0):
+        res = client.get("/users/me", headers=auth_header)
+    assert res.status_code == 200
+    assert res.json()["email"] == "test1234@snu.ac.kr"
+
+def test_patch_me_refreshes_cached_user(
+    client: TestClient,
+    access_token: str,
+):
+    auth_header = {"Authorization": f"Bearer {access_token}"}
+    assert client.get("/users/me", headers=auth_header).json()["nickname"] is None
+
+    res = client.patch("/users/me", headers=auth_header, json={"nickname": "waffle"})
+    assert res.status_code == 200
+    assert client.get("/users/me", headers=auth_header).json()["nickname"] == "waffle"
+
+    # 캐시에서 나온 사용자로도 수정이 반영됩니다.
+    res = client.patch("/users/me", headers=auth_header, json={"address": "Seoul"})
+    assert res.status_code == 200
+    res_json = client.get("/users/me", headers=auth_header).json()
+    assert (res_json["nickname"], res_json["address"]) == ("waffle", "Seoul")
+
 # TEST PATCH /api/users/me
 def test_patch_me(
     client: TestClient,
@@ -248,4 +279,52 @@ def test_get_me_reviews(
     assert len(res_json) == 1
     assert res_json[0]["item_name"] == "item0"
     assert res_json[0]["rating"] == 3
-    assert res_json[0]["comment"] == "good"
\ No newline at end of file
+    assert res_json[0]["comment"] == "good"
+
+@pytest.mark.parametrize("n_reviews", [1, 3])
+def test_get_me_reviews_query_budget(
+    client: TestClient,
+    access_token: str,
+    items,
+    assert_max_queries,
+    n_reviews: int,
+):
+    auth_header = {"Authorization": f"Bearer {access_token}"}
+    client.patch("/users/me", headers=auth_header, json={"nickname": "waffle"})
+    for item in items[:n_reviews]:
+        res = client.post(f"/items/{item['id']}/reviews", headers=auth_header, json={"rating": 3, "comment": "good"})
+        assert res.status_code == 201
+
+    with assert_max_queries(3):
+        res = client.get("/users/me/reviews", headers=auth_header)
+    assert res.status_code == 200
+    assert len(res.json()) == n_reviews
+
+def test_get_me_orders_query_budget(
+    client: TestClient,
+    access_token: str,
+    orders,
+    assert_max_queries,
+):
+    with assert_max_queries(2):
+        res = client.get("/users/me/orders", headers={"Authorization": f"Bearer {access_token}"})
+    assert res.status_code == 200
+    assert len(res.json()) == 3
+
+def test_signup_query_budget(
+    client: TestClient,
+    assert_max_queries,
+):
+    with assert_max_queries(2):
+        res = client.post("/users", json={"email": "budget@snu.ac.kr", "password": "password123"})
+    assert res.status_code == 201
+
+def test_patch_me_query_budget(
+    client: TestClient,
+    access_token: str,
+    assert_max_queries,
+):
+    req = {"nickname": "김와플", "address": "서울시 관악구", "phone_number": "010-1234-5678"}
+    with assert_max_queries(2):
+        res = client.patch("/users/me", json=req, headers={"Authorization": f"Bearer {access_token}"})
+    assert res.status_code == 200
@@ -1,19 +1,34 @@
 from fastapi import APIRouter
 
-from wapang.app.users.router import user_router
+from wapang.app.users.router import user_router, async_user_router
 from wapang.app.auth.router import auth_router
-from wapang.app.stores.router import store_router
-from wapang.app.items.router import item_router
+from wapang.app.stores.router import store_router, async_store_router
+from wapang.app.items.router import item_router, async_item_router
 from wapang.app.orders.router import order_router
-from wapang.app.reviews.router import review_router
+from wapang.app.reviews.router import review_router, async_review_router
 from wapang.app.carts.router import cart_router
+from wapang.app.search.router import search_router
+from wapang.app.metrics.router import metrics_router
+from wapang.database.settings import DB_SETTINGS
 
 api_router = APIRouter()
 
+# 같은 경로라면 먼저 등록된 라우트가 처리하므로, 비동기 라우트를 먼저 등록합니다.
+async_api_router = APIRouter()
+async_api_router.include_router(async_user_router, prefix="/users", tags=["users"])
+async_api_router.include_router(async_store_router, prefix="/stores", tags=["stores"])
+async_api_router.include_router(async_item_router, prefix="/items", tags=["items"])
+async_api_router.include_router(async_review_router, prefix="/reviews", tags=["reviews"])
+
+if DB_SETTINGS.async_enabled:
+    api_router.include_router(async_api_router)
+
 api_router.include_router(user_router, prefix="/users", tags=["users"])
 api_router.include_router(auth_router, prefix="/auth", tags=["auth"])
 api_router.include_router(store_router, prefix="/stores", tags=["stores"])
 api_router.include_router(item_router, prefix="/items", tags=["items"])
 api_router.include_router(order_router, prefix="/orders", tags=["orders"])
 api_router.include_router(review_router, prefix="/reviews", tags=["reviews"])
-api_router.include_router(cart_router, prefix="/carts", tags=["carts"])
\ No newline at end of file
+api_router.include_router(cart_router, prefix="/carts", tags=["carts"])
+api_router.include_router(search_router, prefix="/search", tags=["search"])
+api_router.include_router(metrics_router, prefix="/metrics", tags=["metrics"])
\ No newline at end of file
@@ -0,0 +1,61 @@
+"""현재 머신에서 비밀번호 해시 한 번이 목표 시간 안에 끝나도록 Argon2 비용을 고르는 명령입니다.
+
+    uv run python -m wapang.app.auth.calibrate --target-ms 100 --memory-mib 64
+
+메모리 비용을 고정하고 시간 비용을 1 부터 늘려 가며, 목표 시간을 넘지 않는 가장 큰 값을 고릅니다.
+시간 비용 1 로도 목표를 넘으면 메모리 비용을 절반씩 줄입니다. 출력된 값을 .env 에 넣고 재시작하면
+새 비용보다 약한 기존 해시는 각 사용자가 다음에 로그인할 때 새 비용으로 바뀝니다.
+"""
+import argparse
+import statistics
+import time
+
+import argon2
+
+# 메모리 비용을 이보다 낮추지는 않습니다 (OWASP 권장 최소값 19 MiB 근처).
+MIN_MEMORY_KIB = 16 * 1024
+MAX_TIME_COST = 20
+
+
+def measure_ms(time_cost: int, memory_cost: int, parallelism: int, samples: int) -> float:
+    hasher = argon2.PasswordHasher(time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism)
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        hasher.hash("calibration-password")
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate(target_ms: float, memory_cost: int, parallelism: int, samples: int) -> tuple[int, int, float]:
+    while True:
+        elapsed = measure_ms(1, memory_cost, parallelism, samples)
+        if elapsed <= target_ms or memory_cost // 2 < MIN_MEMORY_KIB:
+            break
+        memory_cost //= 2
+    time_cost = 1
+    while time_cost < MAX_TIME_COST:
+        next_elapsed = measure_ms(time_cost + 1, memory_cost, parallelism, samples)
+        if next_elapsed > target_ms:
+            break
+        time_cost, elapsed = time_cost + 1, next_elapsed
+    return time_cost, memory_cost, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--target-ms", type=float, default=100)
+    parser.add_argument("--memory-mib", type=int, default=64)
+    parser.add_argument("--parallelism", type=int, default=4)
+    parser.add_argument("--samples", type=int, default=5)
+    args = parser.parse_args()
+
+    time_cost, memory_cost, elapsed = calibrate(args.target_ms, args.memory_mib * 1024, args.parallelism, args.samples)
+    print(f"# hash {elapsed:.1f} ms (target {args.target_ms:.0f} ms)")
+    print(f"ARGON2_TIME_COST={time_cost}")
+    print(f"ARGON2_MEMORY_COST={memory_cost}")
+    print(f"ARGON2_PARALLELISM={args.parallelism}")
+
+
+if __name__ == "__main__":
+    main()
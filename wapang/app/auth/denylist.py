@@ -0,0 +1,130 @@
+from datetime import datetime
+import math
+import threading
+from typing import Iterable
+
+from wapang.app.auth.repositories import AuthRepository
+from wapang.app.auth.settings import AUTH_SETTINGS
+from wapang.cache.bus import INVALIDATION_BUS
+from wapang.cache.invalidation import BLOCKED_TOKEN_TAG_PREFIX, token_digest
+from wapang.database.connection import get_db_manager
+from wapang.database.maintenance import delete_in_batches
+
+
+class BloomFilter:
+    # 비트 배열 하나와 k 개의 해시로 "확실히 없음" 또는 "있을 수도 있음" 을 답합니다.
+    # 원소는 SHA-256 다이제스트로 받고, 다이제스트의 앞 16 바이트로 double hashing 해서 k 개의 위치를 만듭니다.
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        capacity = max(capacity, 1)
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, digest: bytes) -> Iterable[int]:
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:16], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, digest: bytes) -> None:
+        # 커밋 전후로 같은 다이제스트가 두 번 들어오므로, 이미 있다고 나오는 원소는 세지 않습니다.
+        if digest in self:
+            return
+        for position in self._positions(digest):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, digest: bytes) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(digest))
+
+
+class RefreshTokenDenylist:
+    # 차단 토큰 테이블 앞에 두는 Bloom 필터입니다 (워커 프로세스 단위).
+    # 필터에 없는 토큰은 차단되지 않은 것이 확실하므로 DB 를 조회하지 않고, 있을 수도 있는 토큰만 테이블에서 확인합니다.
+    # lifespan 에서 테이블로 채우기 전에는 모든 토큰을 DB 에서 확인합니다.
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._lock = threading.Lock()
+        self._filter: BloomFilter | None = None
+        # 다시 만드는 동안 추가된 토큰. 테이블을 읽은 뒤에 차단된 토큰을 새 필터에 빠뜨리지 않기 위해 모아 둡니다.
+        self._pending: list[bytes] | None = None
+        self.checks = 0
+        self.skipped = 0
+        self.purged = 0
+
+    def rebuild(self, digests: Iterable[bytes]) -> None:
+        with self._lock:
+            self._pending = []
+        bloom = BloomFilter(self.capacity, self.error_rate)
+        try:
+            for digest in digests:
+                bloom.add(digest)
+        finally:
+            with self._lock:
+                pending, self._pending = self._pending, None
+        with self._lock:
+            for digest in pending:
+                bloom.add(digest)
+            self._filter = bloom
+
+    def add(self, digest: bytes) -> None:
+        with self._lock:
+            if self._filter is not None:
+                self._filter.add(digest)
+            if self._pending is not None:
+                self._pending.append(digest)
+
+    def might_contain(self, token: str) -> bool:
+        digest = token_digest(token)
+        with self._lock:
+            self.checks += 1
+            if self._filter is None or digest in self._filter:
+                return True
+            self.skipped += 1
+            return False
+
+    def clear(self) -> None:
+        with self._lock:
+            self._filter = None
+            self._pending = None
+            self.checks = 0
+            self.skipped = 0
+            self.purged = 0
+
+    def _on_invalidation(self, tags: list[str]) -> None:
+        # 이 워커와 다른 워커에서 차단된 토큰이 무효화 버스로 들어옵니다.
+        for tag in tags:
+            if tag.startswith(BLOCKED_TOKEN_TAG_PREFIX):
+                self.add(bytes.fromhex(tag[len(BLOCKED_TOKEN_TAG_PREFIX):]))
+
+    def stats(self) -> dict[str, int | bool]:
+        with self._lock:
+            bloom = self._filter
+            return dict(loaded=bloom is not None, entries=bloom.count if bloom else 0,
+                        bits=bloom.size if bloom else 0, hashes=bloom.hashes if bloom else 0,
+                        checks=self.checks, skipped=self.skipped, purged=self.purged)
+
+
+REFRESH_TOKEN_DENYLIST = RefreshTokenDenylist(AUTH_SETTINGS.DENYLIST_BLOOM_CAPACITY,
+                                              AUTH_SETTINGS.DENYLIST_BLOOM_ERROR_RATE)
+INVALIDATION_BUS.subscribe(REFRESH_TOKEN_DENYLIST._on_invalidation)
+
+def load_refresh_token_denylist() -> None:
+    # 만료되지 않은 차단 토큰만 읽습니다. 만료된 토큰은 서명 검증에서 이미 거부됩니다.
+    with get_db_manager().session_factory() as session:
+        REFRESH_TOKEN_DENYLIST.rebuild(AuthRepository(session).get_unexpired_blocked_token_digests(datetime.now()))
+
+def purge_expired_blocked_tokens(repository: AuthRepository, batch_size: int, now: datetime | None = None) -> int:
+    now = now or datetime.now()
+    purged = delete_in_batches(repository.session,
+                               lambda limit: repository.delete_expired_blocked_tokens(now, limit), batch_size)
+    REFRESH_TOKEN_DENYLIST.purged += purged
+    return purged
+
+def purge_and_reload_denylist() -> None:
+    with get_db_manager().session_factory() as session:
+        purged = purge_expired_blocked_tokens(AuthRepository(session), AUTH_SETTINGS.DENYLIST_PURGE_BATCH_SIZE)
+    # 지운 토큰이 필터에 남아 있으면 오탐만 늘어나므로 남은 토큰으로 필터를 다시 만듭니다.
+    if purged:
+        load_refresh_token_denylist()
@@ -0,0 +1,89 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import threading
+from typing import Callable, TypeVar
+
+import argon2
+
+from wapang.app.auth.exceptions import InvalidAccountException
+from wapang.app.auth.settings import AUTH_SETTINGS
+
+T = TypeVar("T")
+
+
+def create_password_hasher() -> argon2.PasswordHasher:
+    return argon2.PasswordHasher(
+        time_cost=AUTH_SETTINGS.ARGON2_TIME_COST,
+        memory_cost=AUTH_SETTINGS.ARGON2_MEMORY_COST,
+        parallelism=AUTH_SETTINGS.ARGON2_PARALLELISM,
+    )
+
+# PasswordHasher 는 설정만 들고 있는 불변 객체이므로 한 번 만들어 모든 스레드에서 함께 씁니다.
+PASSWORD_HASHER = create_password_hasher()
+
+
+class PasswordHashingPool:
+    # Argon2 는 요청 하나에 수십 ms 의 CPU 와 수십 MB 의 메모리를 쓰므로, 다른 동기 라우트가 함께 쓰는
+    # anyio 스레드 풀이 아니라 이 전용 스레드 풀에서 실행합니다. 로그인이 몰려도 동시에 도는 해시는
+    # max_workers 개로 제한되고, 나머지는 큐에서 기다리므로 로그인 지연만 늘어납니다.
+    # argon2-cffi 는 해시 중에 GIL 을 놓으므로 프로세스 풀이 아니어도 코어를 나눠 씁니다.
+    def __init__(self, max_workers: int) -> None:
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.max_queued = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # 첫 사용 때 만들고, shutdown 뒤에 다시 쓰면 새로 만듭니다.
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="argon2")
+            return self._executor
+
+    def _run(self, func: Callable[..., T], *args) -> T:
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self.running -= 1
+                self.completed += 1
+
+    async def run(self, func: Callable[..., T], *args) -> T:
+        executor = self._get_executor()
+        with self._lock:
+            self.queued += 1
+            self.max_queued = max(self.max_queued, self.queued)
+        return await asyncio.wrap_future(executor.submit(self._run, func, *args))
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return dict(max_workers=self.max_workers, queued=self.queued, running=self.running,
+                        completed=self.completed, max_queued=self.max_queued)
+
+
+PASSWORD_HASHING = PasswordHashingPool(AUTH_SETTINGS.PASSWORD_HASH_WORKERS)
+
+async def hash_password(password: str) -> str:
+    return await PASSWORD_HASHING.run(PASSWORD_HASHER.hash, password)
+
+def needs_rehash(hashed_password: str) -> bool:
+    # 해시에 기록된 비용이 현재 설정과 다르면 True 입니다. 해시를 다시 계산하지 않으므로 가볍습니다.
+    return PASSWORD_HASHER.check_needs_rehash(hashed_password)
+
+async def verify_password(plain_password: str, hashed_password: str) -> None:
+    try:
+        await PASSWORD_HASHING.run(PASSWORD_HASHER.verify, hashed_password, plain_password)
+    except argon2.exceptions.VerifyMismatchError:
+        raise InvalidAccountException()
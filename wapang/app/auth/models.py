@@ -1,11 +1,22 @@
 from datetime import datetime
 
-from sqlalchemy import String, DateTime
+from sqlalchemy import BINARY, String, DateTime
 from sqlalchemy.orm import Mapped, mapped_column
 from wapang.database.common import Base
 
 class BlockedToken(Base):
+    __tablename__ = "blocked_token_digests"
+
+    # 토큰 원문(최대 512자) 대신 SHA-256 다이제스트 32바이트를 키로 써서 클러스터드 인덱스를 좁게 유지합니다.
+    token_digest: Mapped[bytes] = mapped_column(BINARY(32), primary_key=True)
+    # 만료된 행을 주기적으로 지울 때 expired_at 으로 찾습니다.
+    expired_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+
+
+class LegacyBlockedToken(Base):
+    # 토큰 원문을 키로 쓰던 예전 테이블입니다. 새로 차단하는 토큰은 더 넣지 않고,
+    # 배포 중 예전 버전이 넣은 행과 남은 행이 모두 만료될 때까지 (AUTH_SETTINGS.DENYLIST_LEGACY_LOOKUP) 조회와 삭제만 합니다.
     __tablename__ = "blocked_tokens"
 
     token: Mapped[str] = mapped_column(String(512), primary_key=True)
-    expired_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
\ No newline at end of file
+    expired_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
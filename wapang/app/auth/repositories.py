@@ -1,20 +1,74 @@
-from typing import Annotated
+from typing import Annotated, Iterator
 from datetime import datetime
 
 from fastapi import Depends
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, select
+from sqlalchemy.orm import InstrumentedAttribute, Session
 
 from wapang.database.connection import get_db_session
-from wapang.app.auth.models import BlockedToken
+from wapang.app.auth.models import BlockedToken, LegacyBlockedToken
+from wapang.app.auth.settings import AUTH_SETTINGS
+from wapang.cache.invalidation import blocked_token_tags, invalidate, token_digest
 
 class AuthRepository:
-    def __init__(self, session: Annotated[Session, Depends(get_db_session)]) -> None:
+    def __init__(self, session: Annotated[Session, Depends(get_db_session, scope="function")]) -> None:
         self.session = session
 
     def block_refresh_token(self, token: str, exp: datetime) -> None:
         blocked_token = BlockedToken(
-            token=token,
+            token_digest=token_digest(token),
             expired_at=exp
         )
         self.session.add(blocked_token)
-        self.session.flush()
\ No newline at end of file
+        self.session.flush()
+        # 이 워커의 차단 목록 필터에 바로 넣고, 커밋되면 다른 워커에도 알립니다.
+        invalidate(self.session, blocked_token_tags(token))
+
+    def is_refresh_token_blocked(self, token: str) -> bool:
+        digest = self.session.scalar(
+            select(BlockedToken.token_digest).where(BlockedToken.token_digest == token_digest(token))
+        )
+        if digest is not None:
+            return True
+        return self.is_legacy_refresh_token_blocked(token)
+
+    def is_legacy_refresh_token_blocked(self, token: str) -> bool:
+        if not AUTH_SETTINGS.DENYLIST_LEGACY_LOOKUP:
+            return False
+        return self.session.scalar(
+            select(LegacyBlockedToken.token).where(LegacyBlockedToken.token == token)
+        ) is not None
+
+    def get_unexpired_blocked_token_digests(self, now: datetime) -> Iterator[bytes]:
+        yield from self.session.scalars(
+            select(BlockedToken.token_digest)
+            .where(BlockedToken.expired_at >= now)
+            .execution_options(yield_per=10_000)
+        )
+        if AUTH_SETTINGS.DENYLIST_LEGACY_LOOKUP:
+            for token in self.session.scalars(
+                select(LegacyBlockedToken.token)
+                .where(LegacyBlockedToken.expired_at >= now)
+                .execution_options(yield_per=10_000)
+            ):
+                yield token_digest(token)
+
+    def delete_expired_blocked_tokens(self, now: datetime, limit: int) -> int:
+        deleted = self._delete_expired(BlockedToken.token_digest, BlockedToken.expired_at, now, limit)
+        if AUTH_SETTINGS.DENYLIST_LEGACY_LOOKUP and deleted < limit:
+            deleted += self._delete_expired(LegacyBlockedToken.token, LegacyBlockedToken.expired_at, now,
+                                            limit - deleted)
+        return deleted
+
+    def _delete_expired(self, key: InstrumentedAttribute, expired_at: InstrumentedAttribute,
+                        now: datetime, limit: int) -> int:
+        # DELETE ... LIMIT 은 DB 마다 지원이 달라서, expired_at 인덱스로 지울 키를 먼저 고릅니다.
+        keys = self.session.scalars(
+            select(key)
+            .where(expired_at < now)
+            .order_by(expired_at)
+            .limit(limit)
+        ).all()
+        if keys:
+            self.session.execute(delete(key.class_).where(key.in_(keys)))
+        return len(keys)
@@ -15,10 +15,10 @@ SHORT_SESSION_LIFESPAN = AUTH_SETTINGS.SHORT_SESSION_LIFESPAN
 LONG_SESSION_LIFESPAN = AUTH_SETTINGS.LONG_SESSION_LIFESPAN
 
 @auth_router.post("/tokens")
-def signin(
+async def signin(
     signin_request: UserSigninRequest, auth_service: Annotated[AuthService, Depends()]
 ) -> TokenResponse:
-    access_token, refresh_token = auth_service.signin(
+    access_token, refresh_token = await auth_service.signin(
         signin_request.email, signin_request.password
     )
 
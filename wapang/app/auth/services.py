@@ -2,9 +2,12 @@ from typing import Annotated
 from datetime import datetime
 
 from fastapi import Depends
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.exc import IntegrityError
 
+from wapang.app.auth.denylist import REFRESH_TOKEN_DENYLIST
+from wapang.app.auth.hashing import hash_password, needs_rehash, verify_password
 from wapang.app.auth.utils import (
-    verify_password,
     issue_token,
     get_token_from_authorization_header,
     verify_and_decode_token
@@ -30,20 +33,42 @@ class AuthService:
         self.auth_repository = auth_repository
         self.user_repository = user_repository
 
-    def signin(self, email: str, password: str) -> tuple[str, str]:
-        user = self.user_repository.get_user_by_email(email)
-        if user is None:
+    def _get_credentials(self, email: str) -> tuple[str, str] | None:
+        credentials = self.user_repository.get_credentials_by_email(email)
+        self.user_repository.end_read()
+        return credentials
+
+    async def signin(self, email: str, password: str) -> tuple[str, str]:
+        # DB 조회는 anyio 스레드 풀에서, 비밀번호 검증은 전용 스레드 풀에서 실행합니다.
+        # 해시 큐에서 기다리는 동안 커넥션을 잡고 있지 않도록 조회 트랜잭션은 검증 전에 끝냅니다.
+        credentials = await run_in_threadpool(self._get_credentials, email)
+        if credentials is None:
             raise InvalidAccountException()
+        user_id, hashed_password = credentials
 
-        verify_password(password, user.hashed_password)
+        await verify_password(password, hashed_password)
+        # 평문 비밀번호를 아는 지금이 예전 비용으로 만든 해시를 바꿀 수 있는 유일한 때입니다.
+        if needs_rehash(hashed_password):
+            await run_in_threadpool(self.user_repository.update_password, user_id, await hash_password(password))
 
-        access_token = issue_token(user.id, SHORT_SESSION_LIFESPAN, ACCESS_TOKEN_SECRET)
-        refresh_token = issue_token(user.id, LONG_SESSION_LIFESPAN, REFRESH_TOKEN_SECRET)
+        access_token = issue_token(user_id, SHORT_SESSION_LIFESPAN, ACCESS_TOKEN_SECRET)
+        refresh_token = issue_token(user_id, LONG_SESSION_LIFESPAN, REFRESH_TOKEN_SECRET)
 
         return access_token, refresh_token
     
     def block_refresh_token(self, token: str, exp: datetime) -> None:
-        self.auth_repository.block_refresh_token(token, exp)
+        # 차단 목록 필터에 없다고 나온 토큰도, 다른 워커가 방금 차단했다면 기본 키 충돌로 여기서 걸립니다.
+        # 예전 버전이 blocked_tokens 에 넣는 행은 필터에 들어오지 않으므로 그 테이블은 필터와 상관없이 확인합니다.
+        if REFRESH_TOKEN_DENYLIST.might_contain(token):
+            blocked = self.auth_repository.is_refresh_token_blocked(token)
+        else:
+            blocked = self.auth_repository.is_legacy_refresh_token_blocked(token)
+        if blocked:
+            raise InvalidTokenException()
+        try:
+            self.auth_repository.block_refresh_token(token, exp)
+        except IntegrityError:
+            raise InvalidTokenException()
     
     def refresh_tokens(self, authorization: str | None) -> tuple[str, str]:
         if authorization is None:
@@ -6,6 +6,26 @@ class AuthSettings(BaseSettings):
     REFRESH_TOKEN_SECRET: str
     SHORT_SESSION_LIFESPAN: int = 15
     LONG_SESSION_LIFESPAN: int = 24 * 60
+    # 검증된 토큰 캐시의 최대 항목 수 (워커 프로세스 단위). 0 이면 매번 검증합니다.
+    VERIFIED_TOKEN_CACHE_SIZE: int = 10_000
+
+    # Argon2 비용 (argon2-cffi 기본값). python -m wapang.app.auth.calibrate 로 머신에 맞는 값을 고를 수 있습니다.
+    # 바꾸면 새로 만드는 해시부터 적용되고, 기존 해시는 사용자가 로그인할 때 새 비용으로 바뀝니다.
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 64 * 1024
+    ARGON2_PARALLELISM: int = 4
+    # 비밀번호 해시/검증을 동시에 실행하는 스레드 수 (워커 프로세스 단위)
+    PASSWORD_HASH_WORKERS: int = 4
+
+    # 리프레시 토큰 차단 목록 앞의 Bloom 필터 크기. 차단된 토큰이 CAPACITY 개일 때 오탐률이 ERROR_RATE 가 됩니다.
+    DENYLIST_BLOOM_CAPACITY: int = 1_000_000
+    DENYLIST_BLOOM_ERROR_RATE: float = 0.001
+    # 만료된 차단 토큰을 지우는 주기와 한 번에 지우는 행 수
+    DENYLIST_PURGE_INTERVAL_SECONDS: int = 600
+    DENYLIST_PURGE_BATCH_SIZE: int = 1000
+    # 토큰 원문을 키로 쓰던 blocked_tokens 테이블도 확인합니다. 예전 버전이 모두 내려가고
+    # LONG_SESSION_LIFESPAN 이 지나 그 테이블의 행이 모두 만료되면 끄고 테이블을 지워도 됩니다.
+    DENYLIST_LEGACY_LOOKUP: bool = True
 
     model_config = SettingsConfigDict(
         case_sensitive=False,
@@ -0,0 +1,59 @@
+from collections import OrderedDict
+import hashlib
+import threading
+import time
+
+from authlib.jose import JWTClaims
+
+
+class VerifiedTokenCache:
+    # 서명과 클레임 검증을 통과한 토큰의 클레임을 토큰의 exp 까지 보관하는 LRU 입니다.
+    # 키는 (비밀 키, 토큰) 의 SHA-256 다이제스트이므로 토큰 원문을 들고 있지 않고,
+    # 다른 비밀 키로 발급된 토큰(예: 리프레시 토큰을 액세스 토큰 자리에)은 캐시에서도 통과하지 못합니다.
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[bytes, tuple[float, JWTClaims]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(token: str, secret: str) -> bytes:
+        return hashlib.sha256(f"{secret}\0{token}".encode()).digest()
+
+    def get(self, token: str, secret: str) -> JWTClaims | None:
+        key = self._key(token, secret)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, token: str, secret: str, claims: JWTClaims) -> None:
+        exp = claims.get("exp")
+        # 만료 시각이 없는 토큰은 언제까지 유효한지 알 수 없으므로 캐시하지 않습니다.
+        if not isinstance(exp, (int, float)) or self.max_entries <= 0:
+            return
+        key = self._key(token, secret)
+        with self._lock:
+            self._entries[key] = (exp, claims)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict[str, int | float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return dict(size=len(self._entries), max_entries=self.max_entries, hits=self.hits, misses=self.misses,
+                        hit_ratio=self.hits / lookups if lookups else 0.0)
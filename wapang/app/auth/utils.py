@@ -1,13 +1,14 @@
 from datetime import datetime, timedelta
 from typing import Annotated
+import uuid
 
 from fastapi import Depends, Header
-import argon2
 from authlib.jose import jwt, JWTClaims
 from authlib.jose.errors import JoseError
 
-from wapang.app.users.services import UserService
+from wapang.app.users.services import UserService, AsyncUserService
 from wapang.app.auth.settings import AUTH_SETTINGS
+from wapang.app.auth.token_cache import VerifiedTokenCache
 from wapang.app.auth.exceptions import (
     BadAuthorizationHeaderException,
 	UnauthenticatedException,
@@ -15,27 +16,30 @@ from wapang.app.auth.exceptions import (
     InvalidTokenException
 )
 
-def verify_password(plain_password: str, hashed_password: str) -> None:
-	try:
-		argon2.PasswordHasher().verify(hashed_password, plain_password)
-	except argon2.exceptions.VerifyMismatchError:
-		raise InvalidAccountException()
-	
+VERIFIED_TOKENS = VerifiedTokenCache(AUTH_SETTINGS.VERIFIED_TOKEN_CACHE_SIZE)
+
 def issue_token(user_id: str, lifespan_minutes: int, secret: str) -> str:
 	header = {'alg': 'HS256'}
 	payload = {
 		'sub': user_id,
-		'exp': int((datetime.now() + timedelta(minutes=lifespan_minutes)).timestamp())
+		'exp': int((datetime.now() + timedelta(minutes=lifespan_minutes)).timestamp()),
+		# 같은 초에 같은 사용자에게 발급한 토큰도 서로 달라야 하나만 차단할 수 있습니다.
+		'jti': uuid.uuid4().hex
 	}
 	return str(jwt.encode(header, payload, key=secret), 'utf-8')
 
 def verify_and_decode_token(token: str, secret: str) -> JWTClaims:
+	# 같은 토큰이 만료 전까지 여러 번 오므로, 한 번 검증한 토큰은 exp 까지 다시 검증하지 않습니다.
+	claims = VERIFIED_TOKENS.get(token, secret)
+	if claims is not None:
+		return claims
 	try:
 		claims = jwt.decode(token, key=secret)
 		claims.validate()
-		return claims
 	except JoseError:
 		raise InvalidTokenException()
+	VERIFIED_TOKENS.set(token, secret, claims)
+	return claims
 	
 def get_token_from_authorization_header(authorization: str) -> str:
 	authorization_parts = authorization.split()
@@ -45,6 +49,15 @@ def get_token_from_authorization_header(authorization: str) -> str:
 	token = authorization_parts[1]
 	return token
 
+def get_user_id_from_header(authorization: str) -> str:
+	token = get_token_from_authorization_header(authorization)
+	claims = verify_and_decode_token(token, AUTH_SETTINGS.ACCESS_TOKEN_SECRET)
+
+	user_id = claims.get('sub', None)
+	if user_id is None:
+		raise InvalidTokenException()
+	return user_id
+
 def login_with_header(
         user_service: Annotated[UserService, Depends()],
         authorization: Annotated[str | None, Header()] = None
@@ -52,14 +65,9 @@ def login_with_header(
 	if authorization is None:
 		raise UnauthenticatedException()
 	
-	token = get_token_from_authorization_header(authorization)
-	claims = verify_and_decode_token(token, AUTH_SETTINGS.ACCESS_TOKEN_SECRET)
+	user_id = get_user_id_from_header(authorization)
 
-	user_id = claims.get('sub', None)
-	if user_id is None:
-		raise InvalidTokenException()
-	
-	user = user_service.get_user_by_id(user_id)
+	user = user_service.get_authenticated_user(user_id)
 	if user is None:
 		raise InvalidAccountException()
 	return user
@@ -71,14 +79,37 @@ def login_with_header_optional(
 	if authorization is None:
 		return None
 
-	token = get_token_from_authorization_header(authorization)
-	claims = verify_and_decode_token(token, AUTH_SETTINGS.ACCESS_TOKEN_SECRET)
+	user_id = get_user_id_from_header(authorization)
 
-	user_id = claims.get('sub', None)
-	if user_id is None:
-		raise InvalidTokenException()
+	user = user_service.get_authenticated_user(user_id)
+	if user is None:
+		raise InvalidAccountException()
+	return user
+
+async def async_login_with_header(
+		user_service: Annotated[AsyncUserService, Depends()],
+		authorization: Annotated[str | None, Header()] = None
+):
+	if authorization is None:
+		raise UnauthenticatedException()
+
+	user_id = get_user_id_from_header(authorization)
+
+	user = await user_service.get_authenticated_user(user_id)
+	if user is None:
+		raise InvalidAccountException()
+	return user
+
+async def async_login_with_header_optional(
+		user_service: Annotated[AsyncUserService, Depends()],
+		authorization: Annotated[str | None, Header()] = None
+):
+	if authorization is None:
+		return None
+
+	user_id = get_user_id_from_header(authorization)
 
-	user = user_service.get_user_by_id(user_id)
+	user = await user_service.get_authenticated_user(user_id)
 	if user is None:
 		raise InvalidAccountException()
 	return user
\ No newline at end of file
@@ -1,7 +1,9 @@
-from sqlalchemy import String, Integer, ForeignKey, CheckConstraint
+from datetime import datetime
+
+from sqlalchemy import DateTime, String, Integer, ForeignKey, CheckConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from wapang.app.users.models import User
-from wapang.database.common import Base
+from wapang.database.common import Base, LAZY_LOADING
 
 from wapang.app.items.models import Item
 
@@ -13,5 +15,16 @@ class CartItem(Base):
 
     quantity: Mapped[int] = mapped_column(Integer, nullable=False)
     
-    user: Mapped[User] = relationship("User")
-    item: Mapped[Item] = relationship("Item")
\ No newline at end of file
+    user: Mapped[User] = relationship("User", lazy=LAZY_LOADING)
+    item: Mapped[Item] = relationship("Item", lazy=LAZY_LOADING)
+
+
+class StockReservation(Base):
+    # 장바구니에 담은 수량만큼 상품 재고를 미리 빼 두는 예약입니다 (CART_SETTINGS.reservations_enabled).
+    # 주문하면 예약한 만큼은 상품 행을 다시 잠그지 않고 쓰고, 만료되면 주기적으로 재고를 돌려줍니다.
+    __tablename__ = "stock_reservation"
+
+    user_id: Mapped[str] = mapped_column(String(36), ForeignKey("user.id", ondelete="CASCADE"), primary_key=True)
+    item_id: Mapped[str] = mapped_column(String(36), ForeignKey("item.id", ondelete="CASCADE"), primary_key=True)
+    quantity: Mapped[int] = mapped_column(Integer, nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
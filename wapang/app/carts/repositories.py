@@ -1,14 +1,17 @@
 from typing import Annotated, Sequence
+from datetime import datetime
 import uuid
 
 from fastapi import Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import select
-from wapang.app.carts.models import CartItem
-from wapang.database.connection import get_db_session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import delete, select
+from wapang.app.carts.models import CartItem, StockReservation
+from wapang.app.items.models import Item
+from wapang.database.connection import get_db_session, get_async_db_session
 
 class CartRepository:
-    def __init__(self, session: Annotated[Session, Depends(get_db_session)]) -> None:
+    def __init__(self, session: Annotated[Session, Depends(get_db_session, scope="function")]) -> None:
         self.session = session
 
     def add_cart_item(self, cart_item: CartItem) -> None:
@@ -28,7 +31,101 @@ class CartRepository:
         self.session.delete(cart_item)
         self.session.flush()
 
+    def delete_cart_items_by_user_id(self, user_id: str) -> None:
+        self.session.execute(delete(CartItem).where(CartItem.user_id == user_id))
+
     def get_cart_items_by_user_id(self, user_id: str) -> Sequence[CartItem]:
+        # 장바구니 응답은 상품과 상점 정보가 모두 필요하므로 한 번의 조인으로 함께 불러옵니다.
+        return self.session.scalars(
+            select(CartItem)
+            .where(CartItem.user_id == user_id)
+            .options(joinedload(CartItem.item).joinedload(Item.store))
+        ).all()
+
+
+class ReservationRepository:
+    def __init__(self, session: Annotated[Session, Depends(get_db_session, scope="function")]) -> None:
+        self.session = session
+
+    def get_reservations(self, user_id: str, item_ids: list[str]) -> Sequence[StockReservation]:
+        return self.session.scalars(
+            select(StockReservation)
+            .where(StockReservation.user_id == user_id, StockReservation.item_id.in_(item_ids))
+        ).all()
+
+    def get_reservations_by_users_for_update(self, user_ids: list[str],
+                                             item_ids: list[str]) -> Sequence[StockReservation]:
         return self.session.scalars(
-            select(CartItem).where(CartItem.user_id == user_id)
-        ).all()
\ No newline at end of file
+            select(StockReservation)
+            .where(StockReservation.user_id.in_(user_ids), StockReservation.item_id.in_(item_ids))
+            .order_by(StockReservation.user_id, StockReservation.item_id)
+            .with_for_update()
+        ).all()
+
+    def get_reservations_for_update(self, user_id: str, item_ids: list[str]) -> Sequence[StockReservation]:
+        return self.session.scalars(
+            select(StockReservation)
+            .where(StockReservation.user_id == user_id, StockReservation.item_id.in_(item_ids))
+            .order_by(StockReservation.item_id)
+            .with_for_update()
+        ).all()
+
+    def get_reservations_by_user_id_for_update(self, user_id: str) -> Sequence[StockReservation]:
+        return self.session.scalars(
+            select(StockReservation)
+            .where(StockReservation.user_id == user_id)
+            .order_by(StockReservation.item_id)
+            .with_for_update()
+        ).all()
+
+    def get_expired_reservations_for_update(self, now: datetime, limit: int) -> Sequence[StockReservation]:
+        # 사용자가 주문하면서 잠근 예약은 건너뛰고 다음 주기에 다시 봅니다.
+        return self.session.scalars(
+            select(StockReservation)
+            .where(StockReservation.expires_at < now)
+            .order_by(StockReservation.expires_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        ).all()
+
+    def save_reservation(self, reservation: StockReservation) -> None:
+        self.session.add(reservation)
+        self.session.flush()
+
+    def delete_reservations(self, reservations: Sequence[StockReservation]) -> None:
+        for reservation in reservations:
+            self.session.delete(reservation)
+        self.session.flush()
+
+
+class AsyncCartRepository:
+    def __init__(self, session: Annotated[AsyncSession, Depends(get_async_db_session, scope="function")]) -> None:
+        self.session = session
+
+    async def add_cart_item(self, cart_item: CartItem) -> None:
+        self.session.add(cart_item)
+        await self.session.flush()
+
+    async def update_cart_item(self, cart_item: CartItem) -> None:
+        await self.session.merge(cart_item)
+        await self.session.flush()
+
+    async def get_cart_item_by_user_and_item(self, user_id: str, item_id: str) -> CartItem | None:
+        return await self.session.scalar(
+            select(CartItem).where(CartItem.user_id == user_id, CartItem.item_id == item_id)
+        )
+
+    async def delete_cart_item(self, cart_item: CartItem) -> None:
+        await self.session.delete(cart_item)
+        await self.session.flush()
+
+    async def delete_cart_items_by_user_id(self, user_id: str) -> None:
+        await self.session.execute(delete(CartItem).where(CartItem.user_id == user_id))
+
+    async def get_cart_items_by_user_id(self, user_id: str) -> Sequence[CartItem]:
+        # 비동기 세션에서는 지연 로딩을 쓸 수 없으므로 상품과 상점을 함께 불러옵니다.
+        return (await self.session.scalars(
+            select(CartItem)
+            .where(CartItem.user_id == user_id)
+            .options(selectinload(CartItem.item).selectinload(Item.store))
+        )).all()
\ No newline at end of file
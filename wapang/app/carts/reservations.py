@@ -0,0 +1,108 @@
+from typing import Annotated, Iterable, Sequence
+from datetime import datetime, timedelta
+
+from fastapi import Depends
+
+from wapang.app.carts.models import StockReservation
+from wapang.app.carts.repositories import ReservationRepository
+from wapang.app.carts.settings import CART_SETTINGS
+from wapang.app.items.exceptions import ItemNotEnoughStockError
+from wapang.app.items.models import Item
+from wapang.app.items.repositories import ItemRepository
+from wapang.database.connection import get_db_manager
+from wapang.database.maintenance import delete_in_batches
+
+class ReservationService:
+    # 예약은 상품 재고에서 미리 빼 두는 방식이므로, 예약이 있는 동안 상품의 stock 은 예약분을 뺀 판매 가능 수량입니다.
+    # 예약 행을 먼저 잠그고 상품 행을 바꾸는 순서를 지켜 주문, 장바구니, 만료 처리 사이의 데드락을 피합니다.
+    def __init__(self,
+                 reservation_repository: Annotated[ReservationRepository, Depends()],
+                 item_repository: Annotated[ItemRepository, Depends()],
+                 ) -> None:
+        self.reservation_repository = reservation_repository
+        self.item_repository = item_repository
+
+    def reserve(self, user_id: str, item: Item, quantity: int) -> None:
+        # 장바구니 수량이 바뀔 때마다 예약 수량을 맞추고 만료 시각을 늦춥니다. 0 이면 예약을 풉니다.
+        reservations = self.reservation_repository.get_reservations_for_update(user_id, [item.id])
+        reservation = reservations[0] if reservations else None
+        delta = quantity - (reservation.quantity if reservation else 0)
+        if delta > 0 and not self.item_repository.decrement_stock({item.id: delta}):
+            raise ItemNotEnoughStockError()
+        if delta < 0:
+            self.item_repository.increment_stock({item.id: -delta})
+        if delta != 0:
+            self.item_repository.invalidate_cached_items([item])
+
+        if quantity == 0:
+            if reservation is not None:
+                self.reservation_repository.delete_reservations([reservation])
+            return
+        if reservation is None:
+            reservation = StockReservation(user_id=user_id, item_id=item.id)
+        reservation.quantity = quantity
+        reservation.expires_at = datetime.now() + timedelta(seconds=CART_SETTINGS.reservation_ttl_seconds)
+        self.reservation_repository.save_reservation(reservation)
+
+    def consume(self, user_id: str, quantities: dict[str, int]) -> dict[str, int]:
+        # 주문 수량 중 예약으로 이미 빼 둔 수량을 상품별로 반환하고, 그만큼 예약을 줄입니다.
+        # 만료됐지만 아직 정리되지 않은 예약도 재고를 들고 있으므로 그대로 씁니다.
+        reservations = self.reservation_repository.get_reservations_for_update(user_id, sorted(quantities))
+        covered = self.cover(reservations, quantities)
+        self.delete_used_up(reservations)
+        return covered
+
+    def reserved_quantities(self, user_id: str, item_ids: list[str]) -> dict[str, int]:
+        # 잠그지 않고 읽는 예약 수량. 주문 접수처럼 빠른 실패를 위한 검사에만 씁니다.
+        return {reservation.item_id: reservation.quantity
+                for reservation in self.reservation_repository.get_reservations(user_id, item_ids)}
+
+    def lock_reservations(self, user_ids: list[str],
+                          item_ids: list[str]) -> dict[tuple[str, str], StockReservation]:
+        # 여러 사용자의 주문을 한 번에 처리할 때 (사용자 id, 상품 id) 별 예약을 미리 잠가 둡니다.
+        reservations = self.reservation_repository.get_reservations_by_users_for_update(user_ids, item_ids)
+        return {(reservation.user_id, reservation.item_id): reservation for reservation in reservations}
+
+    def cover(self, reservations: Iterable[StockReservation], quantities: dict[str, int]) -> dict[str, int]:
+        # 예약으로 채울 수 있는 수량을 상품별로 반환하고 예약 수량을 그만큼 줄입니다 (flush 전까지는 메모리에서만).
+        covered: dict[str, int] = {}
+        for reservation in reservations:
+            if reservation.item_id in quantities:
+                covered[reservation.item_id] = min(reservation.quantity, quantities[reservation.item_id])
+                reservation.quantity -= covered[reservation.item_id]
+        return covered
+
+    def delete_used_up(self, reservations: Iterable[StockReservation]) -> None:
+        self.reservation_repository.delete_reservations(
+            [reservation for reservation in reservations if reservation.quantity == 0])
+
+    def release_all(self, user_id: str) -> None:
+        reservations = self.reservation_repository.get_reservations_by_user_id_for_update(user_id)
+        self._release(reservations)
+
+    def release_expired(self, now: datetime, limit: int) -> int:
+        reservations = self.reservation_repository.get_expired_reservations_for_update(now, limit)
+        self._release(reservations)
+        return len(reservations)
+
+    def _release(self, reservations: Sequence[StockReservation]) -> None:
+        if not reservations:
+            return
+        quantities: dict[str, int] = {}
+        for reservation in reservations:
+            quantities[reservation.item_id] = quantities.get(reservation.item_id, 0) + reservation.quantity
+        self.item_repository.increment_stock(quantities)
+        self.item_repository.invalidate_cached_items(self.item_repository.get_items(item_ids=sorted(quantities)))
+        self.reservation_repository.delete_reservations(reservations)
+
+
+def release_expired_reservations(reservation_service: ReservationService, batch_size: int,
+                                 now: datetime | None = None) -> int:
+    now = now or datetime.now()
+    return delete_in_batches(reservation_service.reservation_repository.session,
+                             lambda limit: reservation_service.release_expired(now, limit), batch_size)
+
+def sweep_expired_reservations() -> None:
+    with get_db_manager().session_factory() as session:
+        reservation_service = ReservationService(ReservationRepository(session), ItemRepository(session))
+        release_expired_reservations(reservation_service, CART_SETTINGS.reservation_sweep_batch_size)
@@ -1,9 +1,10 @@
 from typing import Annotated
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Header, Query
 
 from wapang.app.auth.utils import login_with_header
 from wapang.app.carts.schemas import CartItemRequest, CartResponse
 from wapang.app.carts.services import CartService
+from wapang.app.idempotency.services import IdempotencyService
 from wapang.app.orders.services import OrderService
 from wapang.app.orders.schemas import ItemRequest, ItemRequest, OrderCreateRequest, OrderResponse
 from wapang.app.users.models import User
@@ -42,6 +43,10 @@ def checkout_cart(
     user: Annotated[User, Depends(login_with_header)],
     cart_service: Annotated[CartService, Depends()],
     order_service: Annotated[OrderService, Depends()],
+    idempotency_service: Annotated[IdempotencyService, Depends()],
+    idempotency_key: Annotated[str | None, Header(min_length=1, max_length=64)] = None,
 ) -> OrderResponse:
-    order = cart_service.checkout(user, order_service)
+    # 재시도가 장바구니를 비운 뒤에 도착해도 첫 주문의 응답을 돌려받습니다.
+    order = idempotency_service.run(user, idempotency_key, "POST /carts/checkout", OrderResponse,
+                                    lambda: cart_service.checkout(user, order_service))
     return order
\ No newline at end of file
@@ -6,6 +6,8 @@ from wapang.app.carts.models import CartItem
 from wapang.app.carts.schemas import CartItemRequest
 from wapang.app.carts.exceptions import EmptyItemListError
 from wapang.app.carts.repositories import CartRepository
+from wapang.app.carts.reservations import ReservationService
+from wapang.app.carts.settings import CART_SETTINGS
 from wapang.app.items.repositories import ItemRepository
 from wapang.app.items.exceptions import ItemNotFoundError
 from wapang.app.orders.schemas import OrderCreateRequest, ItemRequest
@@ -15,9 +17,11 @@ class CartService:
     def __init__(self, 
                  cart_repository: Annotated[CartRepository, Depends()],
                  item_repository: Annotated[ItemRepository, Depends()],
+                 reservation_service: Annotated[ReservationService, Depends()],
                  ) -> None:
         self.cart_repository = cart_repository
         self.item_repository = item_repository
+        self.reservation_service = reservation_service
     
     def add_or_update_cart(
             self,
@@ -28,6 +32,9 @@ class CartService:
         item = self.item_repository.get_item_by_id(request.item_id)
         if not item:
             raise ItemNotFoundError()
+        # 재고가 부족하면 주문할 때가 아니라 지금 알려줍니다.
+        if CART_SETTINGS.reservations_enabled:
+            self.reservation_service.reserve(user.id, item, request.quantity)
         cartitem = self.cart_repository.get_cart_item_by_user_and_item(user.id, request.item_id)
         if request.quantity == 0 and cartitem:
             self.cart_repository.delete_cart_item(cartitem)
@@ -40,16 +47,21 @@ class CartService:
 
         all_cart_items = self.cart_repository.get_cart_items_by_user_id(user.id)
 
-        return order_service._compose_details_and_total([(ci.item, ci.quantity) for ci in all_cart_items])
+        return order_service._compose_details_and_total(
+            [order_service._snapshot_line(ci.item, ci.quantity) for ci in all_cart_items]
+        )
 
     def get_cart_items(self, user: User, order_service: OrderService) -> tuple[list, int]:
         all_cart_items = self.cart_repository.get_cart_items_by_user_id(user.id)
-        return order_service._compose_details_and_total([(ci.item, ci.quantity) for ci in all_cart_items])
+        return order_service._compose_details_and_total(
+            [order_service._snapshot_line(ci.item, ci.quantity) for ci in all_cart_items]
+        )
     
     def clear_cart(self, user: User) -> None:
-        all_cart_items = self.cart_repository.get_cart_items_by_user_id(user.id)
-        for ci in all_cart_items:
-            self.cart_repository.delete_cart_item(ci)
+        # 주문으로 쓰인 예약은 이미 없어졌으므로, 남은 예약만 재고로 돌려줍니다.
+        if CART_SETTINGS.reservations_enabled:
+            self.reservation_service.release_all(user.id)
+        self.cart_repository.delete_cart_items_by_user_id(user.id)
 
     def checkout(self, user: User, order_service: OrderService) -> list[CartItem]:
         cart_items = self.cart_repository.get_cart_items_by_user_id(user.id)
@@ -0,0 +1,22 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from wapang.settings import SETTINGS
+
+
+class CartSettings(BaseSettings):
+    # 켜면 장바구니에 담을 때 재고를 예약하므로, 재고가 부족하면 주문할 때가 아니라 담을 때 알 수 있습니다.
+    # 예약한 재고는 reservation_ttl_seconds 동안 다른 사용자에게 팔리지 않습니다.
+    reservations_enabled: bool = False
+    reservation_ttl_seconds: int = 15 * 60
+    # 만료된 예약의 재고를 돌려주는 주기와 한 번에 처리하는 예약 수
+    reservation_sweep_interval_seconds: int = 60
+    reservation_sweep_batch_size: int = 1000
+
+    model_config = SettingsConfigDict(
+        case_sensitive=False,
+        env_prefix="CART_",
+        env_file=SETTINGS.env_file,
+        extra='ignore'
+    )
+
+
+CART_SETTINGS = CartSettings()
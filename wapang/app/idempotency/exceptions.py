@@ -0,0 +1,9 @@
+from wapang.common.exceptions import WapangException
+
+class IdempotencyKeyReusedError(WapangException):
+    def __init__(self):
+        super().__init__(status_code=422, error_code="ERR_025", error_msg="IDEMPOTENCY KEY REUSED")
+
+class IdempotencyKeyInProgressError(WapangException):
+    def __init__(self):
+        super().__init__(status_code=409, error_code="ERR_026", error_msg="IDEMPOTENCY KEY IN PROGRESS")
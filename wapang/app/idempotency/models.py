@@ -0,0 +1,17 @@
+from datetime import datetime
+
+from sqlalchemy import BINARY, DateTime, ForeignKey, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+from wapang.database.common import Base
+
+
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_key"
+
+    user_id: Mapped[str] = mapped_column(ForeignKey("user.id"), primary_key=True)
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    # 같은 키로 다른 요청을 보내면 거부하기 위해 엔드포인트와 요청 본문의 SHA-256 다이제스트를 저장합니다.
+    request_digest: Mapped[bytes] = mapped_column(BINARY(32), nullable=False)
+    # 첫 요청이 성공했을 때의 응답 본문(JSON). 같은 트랜잭션에서 채워지므로 커밋된 행에는 항상 있습니다.
+    response: Mapped[str | None] = mapped_column(Text)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
@@ -0,0 +1,42 @@
+from typing import Annotated
+from datetime import datetime
+
+from fastapi import Depends
+from sqlalchemy import delete, select, tuple_
+from sqlalchemy.orm import Session
+
+from wapang.database.connection import get_db_session
+from wapang.app.idempotency.models import IdempotencyKey
+
+class IdempotencyRepository:
+    def __init__(self, session: Annotated[Session, Depends(get_db_session, scope="function")]) -> None:
+        self.session = session
+
+    def get_key(self, user_id: str, key: str) -> IdempotencyKey | None:
+        return self.session.get(IdempotencyKey, (user_id, key))
+
+    def create_key(self, idempotency_key: IdempotencyKey) -> None:
+        self.session.add(idempotency_key)
+        self.session.flush()
+
+    def delete_key(self, idempotency_key: IdempotencyKey) -> None:
+        self.session.delete(idempotency_key)
+        self.session.flush()
+
+    def save_response(self, idempotency_key: IdempotencyKey, response: str) -> None:
+        idempotency_key.response = response
+        self.session.flush()
+
+    def delete_expired_keys(self, now: datetime, limit: int) -> int:
+        # DELETE ... LIMIT 은 DB 마다 지원이 달라서, expires_at 인덱스로 지울 키를 먼저 고릅니다.
+        keys = self.session.execute(
+            select(IdempotencyKey.user_id, IdempotencyKey.key)
+            .where(IdempotencyKey.expires_at < now)
+            .order_by(IdempotencyKey.expires_at)
+            .limit(limit)
+        ).tuples().all()
+        if keys:
+            self.session.execute(
+                delete(IdempotencyKey).where(tuple_(IdempotencyKey.user_id, IdempotencyKey.key).in_(keys))
+            )
+        return len(keys)
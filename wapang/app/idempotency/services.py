@@ -0,0 +1,78 @@
+from typing import Annotated, Callable, TypeVar
+from datetime import datetime, timedelta
+import hashlib
+
+from fastapi import Depends
+from pydantic import BaseModel
+from sqlalchemy.exc import IntegrityError
+
+from wapang.app.idempotency.exceptions import IdempotencyKeyInProgressError, IdempotencyKeyReusedError
+from wapang.app.idempotency.models import IdempotencyKey
+from wapang.app.idempotency.repositories import IdempotencyRepository
+from wapang.app.idempotency.settings import IDEMPOTENCY_SETTINGS
+from wapang.app.users.models import User
+from wapang.database.connection import get_db_manager
+from wapang.database.maintenance import delete_in_batches
+
+ResponseT = TypeVar("ResponseT", bound=BaseModel)
+
+class IdempotencyService:
+    # Idempotency-Key 헤더가 있는 요청은 처음 성공한 응답을 저장해 두고, 같은 키의 재시도에는 다시 실행하지 않고 그 응답을 돌려줍니다.
+    # 키는 요청과 같은 트랜잭션에 저장되므로 요청이 실패해 롤백되면 키도 사라지고, 재시도가 처음부터 다시 실행됩니다.
+    def __init__(self, idempotency_repository: Annotated[IdempotencyRepository, Depends()]) -> None:
+        self.idempotency_repository = idempotency_repository
+
+    def run(
+        self,
+        user: User,
+        key: str | None,
+        fingerprint: str,
+        response_model: type[ResponseT],
+        handler: Callable[[], ResponseT],
+    ) -> ResponseT:
+        if key is None:
+            return handler()
+        request_digest = hashlib.sha256(fingerprint.encode()).digest()
+        idempotency_key = self._claim(user.id, key, request_digest)
+        if idempotency_key.response is not None:
+            return response_model.model_validate_json(idempotency_key.response)
+        response = handler()
+        self.idempotency_repository.save_response(idempotency_key, response.model_dump_json())
+        return response
+
+    def _claim(self, user_id: str, key: str, request_digest: bytes) -> IdempotencyKey:
+        now = datetime.now()
+        idempotency_key = self.idempotency_repository.get_key(user_id, key)
+        if idempotency_key is not None and idempotency_key.expires_at < now:
+            self.idempotency_repository.delete_key(idempotency_key)
+            idempotency_key = None
+
+        if idempotency_key is None:
+            idempotency_key = IdempotencyKey(user_id=user_id, key=key, request_digest=request_digest,
+                                             expires_at=now + timedelta(seconds=IDEMPOTENCY_SETTINGS.ttl_seconds))
+            try:
+                self.idempotency_repository.create_key(idempotency_key)
+                return idempotency_key
+            except IntegrityError:
+                # 같은 키로 먼저 시작한 요청이 있으면 insert 가 그 요청의 커밋(또는 롤백)까지 기본 키 잠금을 기다렸다가 충돌합니다.
+                # 아직 아무것도 쓰지 않았으므로 롤백하고, 커밋된 첫 요청의 응답을 읽습니다.
+                self.idempotency_repository.session.rollback()
+                idempotency_key = self.idempotency_repository.get_key(user_id, key)
+                if idempotency_key is None:
+                    raise IdempotencyKeyInProgressError()
+
+        if idempotency_key.request_digest != request_digest:
+            raise IdempotencyKeyReusedError()
+        if idempotency_key.response is None:
+            raise IdempotencyKeyInProgressError()
+        return idempotency_key
+
+
+def purge_expired_idempotency_keys(repository: IdempotencyRepository, batch_size: int,
+                                   now: datetime | None = None) -> int:
+    now = now or datetime.now()
+    return delete_in_batches(repository.session, lambda limit: repository.delete_expired_keys(now, limit), batch_size)
+
+def purge_idempotency_keys() -> None:
+    with get_db_manager().session_factory() as session:
+        purge_expired_idempotency_keys(IdempotencyRepository(session), IDEMPOTENCY_SETTINGS.purge_batch_size)
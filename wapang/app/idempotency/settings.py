@@ -0,0 +1,20 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from wapang.settings import SETTINGS
+
+
+class IdempotencySettings(BaseSettings):
+    # Idempotency-Key 로 저장한 응답을 재생하는 기간. 클라이언트의 재시도 기간보다 길어야 합니다.
+    ttl_seconds: int = 24 * 60 * 60
+    # 만료된 키를 지우는 주기와 한 번에 지우는 행 수
+    purge_interval_seconds: int = 600
+    purge_batch_size: int = 1000
+
+    model_config = SettingsConfigDict(
+        case_sensitive=False,
+        env_prefix="IDEMPOTENCY_",
+        env_file=SETTINGS.env_file,
+        extra='ignore'
+    )
+
+
+IDEMPOTENCY_SETTINGS = IdempotencySettings()
@@ -1,20 +1,29 @@
+from datetime import datetime
 import uuid
-from sqlalchemy import String, Integer, ForeignKey
+from sqlalchemy import DateTime, Index, String, Integer, ForeignKey, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from wapang.app.stores.models import Store
-from wapang.database.common import Base
+from wapang.database.common import Base, LAZY_LOADING
 
 
 class Item(Base):
     __tablename__ = "item"
+    # 상품 목록의 정렬 옵션마다 (정렬 키, id) 인덱스를 두어 깊은 페이지도 첫 페이지와 같은 비용으로 읽습니다.
+    __table_args__ = (
+        Index("ix_item_price_id", "price", "id"),
+        Index("ix_item_created_at_id", "created_at", "id"),
+        Index("ix_item_store_id_price_id", "store_id", "price", "id"),
+        Index("ix_item_store_id_created_at_id", "store_id", "created_at", "id"),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
     name: Mapped[str] = mapped_column(String(50))
     price: Mapped[int] = mapped_column(Integer)
     stock: Mapped[int] = mapped_column(Integer)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now, server_default=func.now())
 
     store_id: Mapped[str] = mapped_column(ForeignKey("store.id"))
-    store: Mapped[Store] = relationship(back_populates="items")
+    store: Mapped[Store] = relationship(back_populates="items", lazy=LAZY_LOADING)
 
-    order_items = relationship("OrderItem", back_populates="item")
-    reviews = relationship("Review", back_populates="item")
\ No newline at end of file
+    order_items = relationship("OrderItem", back_populates="item", lazy=LAZY_LOADING)
+    reviews = relationship("Review", back_populates="item", lazy=LAZY_LOADING)
\ No newline at end of file
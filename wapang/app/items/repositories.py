@@ -1,14 +1,68 @@
-from typing import Annotated, Sequence
+from typing import Annotated, Any, Iterable, Sequence
 import uuid
 
 from fastapi import Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.orm.util import identity_key
+from sqlalchemy import Select, case, select, tuple_, update
 from wapang.app.items.models import Item
-from wapang.database.connection import get_db_session
+from wapang.app.items.schemas import ItemSort
+from wapang.cache.backends import CATALOG_CACHE
+from wapang.cache.catalog import caches_replica_reads, item_list_key, item_list_tags
+from wapang.cache.snapshots import restore, snapshot
+from wapang.cache.invalidation import invalidate, item_tags, reindex_after_commit
+from wapang.database.connection import get_db_session, get_replica_db_session, get_async_db_session
+
+
+# 정렬 옵션별 (정렬 컬럼, 내림차순 여부). id 를 두 번째 키로 써서 동점인 행도 커서가 하나로 가리킵니다.
+_SORT_KEYS = {
+    ItemSort.PRICE_ASC: (Item.price, False),
+    ItemSort.PRICE_DESC: (Item.price, True),
+    ItemSort.NEWEST: (Item.created_at, True),
+}
+
+def _items_query(
+        store_id: str | None = None,
+        min_price: int | None = None,
+        max_price: int | None = None,
+        in_stock: bool = False,
+        sort: ItemSort | None = None,
+        after: tuple[Any, str] | None = None,
+        limit: int | None = None,
+        item_ids: list[str] | None = None,
+    ) -> Select[tuple[Item]]:
+    query = select(Item)
+    if item_ids is not None:
+        query = query.where(Item.id.in_(item_ids))
+    if store_id:
+        query = query.where(Item.store_id == store_id)
+    if min_price is not None:
+        query = query.where(Item.price >= min_price)
+    if max_price is not None:
+        query = query.where(Item.price <= max_price)
+    if in_stock:
+        query = query.where(Item.stock > 0)
+    if sort is not None:
+        column, descending = _SORT_KEYS[sort]
+        # OFFSET 대신 마지막으로 본 (정렬 키, id) 다음부터 인덱스를 이어서 읽습니다.
+        if after is not None:
+            key = tuple_(column, Item.id)
+            query = query.where(key < tuple_(*after) if descending else key > tuple_(*after))
+        if descending:
+            query = query.order_by(column.desc(), Item.id.desc())
+        else:
+            query = query.order_by(column, Item.id)
+    if limit is not None:
+        query = query.limit(limit)
+    return query
+
+def _items_cache_key(store_id, min_price, max_price, in_stock, sort, after, limit, item_ids) -> str:
+    return item_list_key(dict(store_id=store_id, min_price=min_price, max_price=max_price, in_stock=in_stock,
+                              sort=sort, after=after, limit=limit, item_ids=item_ids))
 
 class ItemRepository:
-    def __init__(self, session: Annotated[Session, Depends(get_db_session)]) -> None:
+    def __init__(self, session: Annotated[Session, Depends(get_db_session, scope="function")]) -> None:
         self.session = session
 
     def create_item(self, item: Item) -> None:
@@ -24,22 +78,145 @@ class ItemRepository:
 
     def get_item_by_id(self, item_id: str) -> Item | None:
         return self.session.scalar(select(Item).where(Item.id == item_id))
+
+    def get_items_by_ids_for_update(self, item_ids: list[str]) -> Sequence[Item]:
+        # 하나의 IN 쿼리로 상품과 상점을 불러오고, 데드락을 피하도록 항상 id 순서로 행을 잠급니다.
+        query = (
+            select(Item)
+            .where(Item.id.in_(item_ids))
+            .order_by(Item.id)
+            .options(selectinload(Item.store))
+            .with_for_update(of=Item)
+        )
+        return self.session.scalars(query).all()
+
+    def get_items_by_ids(self, item_ids: list[str]) -> Sequence[Item]:
+        # get_items_by_ids_for_update 와 같지만 행을 잠그지 않습니다. 재고를 바꾸지 않고 상품 정보만 필요할 때 씁니다.
+        query = (
+            select(Item)
+            .where(Item.id.in_(item_ids))
+            .order_by(Item.id)
+            .options(selectinload(Item.store))
+        )
+        return self.session.scalars(query).all()
+
+    def decrement_stock(self, quantities: dict[str, int]) -> bool:
+        # 재고가 충분한 행만 하나의 조건부 UPDATE 로 차감합니다.
+        # 조건을 만족한 행 수가 상품 수와 다르면 재고가 부족한 상품이 있다는 뜻이므로
+        # 호출한 쪽에서 예외를 던져 트랜잭션 전체를 롤백해야 합니다.
+        quantity = case(quantities, value=Item.id)
+        result = self.session.execute(
+            update(Item)
+            .where(Item.id.in_(list(quantities)), Item.stock >= quantity)
+            .values(stock=Item.stock - quantity)
+            .execution_options(synchronize_session=False)
+        )
+        self._expire_stock(quantities)
+        return result.rowcount == len(quantities)
+
+    def increment_stock(self, quantities: dict[str, int]) -> None:
+        # 예약했던 재고를 돌려줄 때 씁니다. 상품마다 한 번이 아니라 하나의 UPDATE 로 돌려줍니다.
+        quantity = case(quantities, value=Item.id)
+        self.session.execute(
+            update(Item)
+            .where(Item.id.in_(list(quantities)))
+            .values(stock=Item.stock + quantity)
+            .execution_options(synchronize_session=False)
+        )
+        self._expire_stock(quantities)
+
+    def _expire_stock(self, item_ids: Iterable[str]) -> None:
+        # 이미 불러온 상품의 재고는 다음 접근 때 DB 에서 다시 읽도록 만료시킵니다.
+        for item_id in item_ids:
+            item = self.session.identity_map.get(identity_key(Item, item_id))
+            if item is not None:
+                self.session.expire(item, ["stock"])
     
     def get_items(
             self, 
             store_id: str | None = None, 
             min_price: int | None = None, 
             max_price: int | None = None, 
-            in_stock: bool = False
+            in_stock: bool = False,
+            sort: ItemSort | None = None,
+            after: tuple[Any, str] | None = None,
+            limit: int | None = None,
+            item_ids: list[str] | None = None,
+        ) -> Sequence[Item]:
+        query = _items_query(store_id, min_price, max_price, in_stock, sort, after, limit, item_ids)
+        return self.session.scalars(query).all()
+
+    def invalidate_cached_items(self, items: Iterable[Item]) -> None:
+        invalidate(self.session, [tag for item in items for tag in item_tags(item.id, item.store_id)])
+
+    def reindex_item(self, item_id: str, name: str | None) -> None:
+        reindex_after_commit(self.session, "item", item_id, name)
+
+
+
+class ReplicaItemRepository(ItemRepository):
+    # 읽기 전용 복제본에 연결된 세션을 사용합니다. 조회 라우트에서만 사용하세요.
+    # 상품 목록은 캐시를 거쳐 읽으므로 캐시에서 나온 상품은 세션에 속하지 않습니다 (caches_replica_reads 참고).
+    def __init__(self, session: Annotated[Session, Depends(get_replica_db_session, scope="function")]) -> None:
+        super().__init__(session)
+
+    def get_items(
+            self,
+            store_id: str | None = None,
+            min_price: int | None = None,
+            max_price: int | None = None,
+            in_stock: bool = False,
+            sort: ItemSort | None = None,
+            after: tuple[Any, str] | None = None,
+            limit: int | None = None,
+            item_ids: list[str] | None = None,
+        ) -> Sequence[Item]:
+        if not caches_replica_reads():
+            return super().get_items(store_id, min_price, max_price, in_stock, sort, after, limit, item_ids)
+        key = _items_cache_key(store_id, min_price, max_price, in_stock, sort, after, limit, item_ids)
+        cached = CATALOG_CACHE.get(key)
+        if cached is not None:
+            return [restore(Item, values) for values in cached]
+        generation = CATALOG_CACHE.generation()
+        items = super().get_items(store_id, min_price, max_price, in_stock, sort, after, limit, item_ids)
+        CATALOG_CACHE.set(key, [snapshot(item) for item in items], item_list_tags(store_id, item_ids), generation)
+        return items
+
+class AsyncItemRepository:
+    def __init__(self, session: Annotated[AsyncSession, Depends(get_async_db_session, scope="function")]) -> None:
+        self.session = session
+
+    async def create_item(self, item: Item) -> None:
+        self.session.add(item)
+        await self.session.flush()
+
+    async def update_item(self, item: Item) -> None:
+        await self.session.merge(item)
+        await self.session.flush()
+
+    async def delete_item(self, item: Item) -> None:
+        await self.session.delete(item)
+
+    async def get_item_by_id(self, item_id: str) -> Item | None:
+        return await self.session.scalar(select(Item).where(Item.id == item_id))
+
+    async def get_items(
+            self,
+            store_id: str | None = None,
+            min_price: int | None = None,
+            max_price: int | None = None,
+            in_stock: bool = False,
+            sort: ItemSort | None = None,
+            after: tuple[Any, str] | None = None,
+            limit: int | None = None,
+            item_ids: list[str] | None = None,
         ) -> Sequence[Item]:
-        query = select(Item)
-        if store_id:
-            query = query.where(Item.store_id == store_id)
-        if min_price is not None:
-            query = query.where(Item.price >= min_price)
-        if max_price is not None:
-            query = query.where(Item.price <= max_price)
-        if in_stock:
-            query = query.where(Item.stock > 0)
-        
-        return self.session.scalars(query).all()
\ No newline at end of file
+        key = _items_cache_key(store_id, min_price, max_price, in_stock, sort, after, limit, item_ids)
+        cached = CATALOG_CACHE.get(key)
+        if cached is not None:
+            return [restore(Item, values) for values in cached]
+        generation = CATALOG_CACHE.generation()
+        query = _items_query(store_id, min_price, max_price, in_stock, sort, after, limit, item_ids)
+        items = (await self.session.scalars(query)).all()
+        CATALOG_CACHE.set(key, [snapshot(item) for item in items], item_list_tags(store_id, item_ids), generation)
+        return items
\ No newline at end of file
@@ -1,14 +1,16 @@
 from typing import Annotated
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 
-from wapang.app.auth.utils import login_with_header, login_with_header_optional
+from wapang.app.auth.utils import login_with_header, login_with_header_optional, async_login_with_header_optional
 from wapang.app.reviews.schemas import ReviewCreateRequest, ReviewResponse
-from wapang.app.reviews.services import ReviewService
+from wapang.app.reviews.services import ReviewService, ReplicaReviewService, AsyncReviewService
 from wapang.app.users.models import User
 from wapang.app.items.schemas import ItemCreateRequest, ItemResponse, ItemUpdateRequest, ItemQueryParams
-from wapang.app.items.services import ItemService
+from wapang.app.items.services import ItemService, ReplicaItemService, AsyncItemService
 
 item_router = APIRouter()
+# DB_ASYNC_ENABLED 일 때 동기 라우트보다 먼저 등록되는 비동기 라우트입니다.
+async_item_router = APIRouter()
 
 @item_router.post("/", status_code=201)
 def create_item(
@@ -42,9 +44,13 @@ def update_item(
 @item_router.get("/", status_code=200)
 def get_items(
     query_params: Annotated[ItemQueryParams, Query()],
-    item_service: Annotated[ItemService, Depends()],
+    item_service: Annotated[ItemService, Depends(ReplicaItemService)],
+    response: Response,
 ):
-    items = item_service.get_items(query_params)
+    items, next_cursor = item_service.get_items(query_params)
+    # 응답 본문은 기존처럼 목록을 유지하고, 다음 페이지 커서는 헤더로 내려줍니다.
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
     return [ItemResponse(
         id=item.id,
         item_name=item.name,
@@ -86,7 +92,7 @@ def create_review(
 def get_item_reviews(
     item_id: str,
     user: Annotated[User | None, Depends(login_with_header_optional)],
-    review_service: Annotated[ReviewService, Depends()],
+    review_service: Annotated[ReviewService, Depends(ReplicaReviewService)],
 ):
     reviews = review_service.get_reviews_by_item(item_id)
     return [ReviewResponse(
@@ -97,3 +103,41 @@ def get_item_reviews(
         rating=review.rating,
         comment=review.comment,
     ) for review in reviews]
+
+
+@async_item_router.get("/", status_code=200)
+async def async_get_items(
+    query_params: Annotated[ItemQueryParams, Query()],
+    item_service: Annotated[AsyncItemService, Depends()],
+    response: Response,
+):
+    items, next_cursor = await item_service.get_items(query_params)
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return [ItemResponse(
+        id=item.id,
+        item_name=item.name,
+        price=item.price,
+        stock=item.stock
+    ) for item in items]
+
+@async_item_router.get(
+    "/{item_id}/reviews",
+    status_code=200,
+    response_model=list[ReviewResponse],
+    response_model_exclude_none=True,
+)
+async def async_get_item_reviews(
+    item_id: str,
+    user: Annotated[User | None, Depends(async_login_with_header_optional)],
+    review_service: Annotated[AsyncReviewService, Depends()],
+):
+    reviews = await review_service.get_reviews_by_item(item_id)
+    return [ReviewResponse(
+        review_id=review.id,
+        item_id=review.item_id,
+        writer_nickname=review.user.nickname or "",
+        is_writer=(review.user_id == user.id) if user is not None else None,
+        rating=review.rating,
+        comment=review.comment,
+    ) for review in reviews]
@@ -1,5 +1,6 @@
+from enum import Enum
 from typing import Annotated
-from pydantic import BaseModel
+from pydantic import BaseModel, model_validator
 from pydantic.functional_validators import AfterValidator
 
 from wapang.common.exceptions import InvalidFormatException
@@ -20,6 +21,17 @@ def validate_stock(v: int) -> int:
         raise InvalidFormatException()
     return v
 
+def validate_limit(v: int) -> int:
+    if v < 1 or v > 100:
+        raise InvalidFormatException()
+    return v
+
+def validate_search_query(v: str) -> str:
+    v = v.strip()
+    if not v or len(v) > 50:
+        raise InvalidFormatException()
+    return v
+
 class ItemCreateRequest(BaseModel):
     item_name: Annotated[str, AfterValidator(validate_item_name)]
     price: Annotated[int, AfterValidator(validate_price)]
@@ -39,8 +51,27 @@ class ItemResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class ItemSort(str, Enum):
+    PRICE_ASC = "price_asc"
+    PRICE_DESC = "price_desc"
+    NEWEST = "newest"
+    RELEVANCE = "relevance"
+
 class ItemQueryParams(BaseModel):
     store_id: str | None = None
     min_price: int | None = None
     max_price: int | None = None
-    in_stock: bool = False
\ No newline at end of file
+    in_stock: bool = False
+    q: Annotated[str | None, AfterValidator(skip_none(validate_search_query))] = None
+    # 지정하지 않으면 검색어가 있을 때는 관련도순, 없을 때는 최신순입니다.
+    sort: ItemSort | None = None
+    limit: Annotated[int, AfterValidator(validate_limit)] = 20
+    cursor: str | None = None
+
+    @model_validator(mode="after")
+    def resolve_sort(self) -> "ItemQueryParams":
+        if self.sort is None:
+            self.sort = ItemSort.RELEVANCE if self.q else ItemSort.NEWEST
+        elif self.sort == ItemSort.RELEVANCE and not self.q:
+            raise InvalidFormatException()
+        return self
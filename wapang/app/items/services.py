@@ -1,14 +1,90 @@
-from typing import Annotated
+from datetime import datetime
+from typing import Annotated, Any, Sequence
 
 from fastapi import Depends
 from wapang.app.users.models import User
-from wapang.app.items.schemas import ItemCreateRequest, ItemQueryParams, ItemUpdateRequest
-from wapang.app.items.repositories import ItemRepository
-from wapang.app.stores.repositories import StoreRepository
+from wapang.app.items.schemas import ItemCreateRequest, ItemQueryParams, ItemSort, ItemUpdateRequest
+from wapang.app.items.repositories import ItemRepository, ReplicaItemRepository, AsyncItemRepository
+from wapang.app.stores.repositories import StoreRepository, ReplicaStoreRepository, AsyncStoreRepository
 from wapang.app.stores.exceptions import StoreNotFoundError, StoreNotOwnedError
 from wapang.app.items.exceptions import ItemNotFoundError, ItemNotOwnedError
 from wapang.app.items.models import Item
 from wapang.common.exceptions import InvalidFormatException
+from wapang.common.pagination import decode_cursor, encode_cursor
+from wapang.app.search.indexes import ITEM_NAME_INDEX, matches
+
+# 검색 결과는 관련도순으로 이 개수씩 DB 에서 불러와 나머지 필터를 적용합니다.
+_SEARCH_BATCH_SIZE = 100
+# 검색어와 함께 가격/최신순으로 정렬할 때는 관련도 상위 이 개수 안에서만 정렬합니다.
+# 한 글자 검색어처럼 거의 모든 상품이 걸려도 쿼리 수와 IN 목록, 캐시 키 크기가 이 값으로 묶입니다.
+_SEARCH_SORT_CANDIDATES = 1000
+
+# 정렬 옵션별 (정렬 속성, 내림차순 여부). 리포지토리의 정렬과 같은 순서입니다.
+_SORT_ATTRIBUTES = {
+    ItemSort.PRICE_ASC: ("price", False),
+    ItemSort.PRICE_DESC: ("price", True),
+    ItemSort.NEWEST: ("created_at", True),
+}
+
+
+def _cursor_after(query_params: ItemQueryParams) -> tuple[Any, str] | None:
+    if query_params.cursor is None:
+        return None
+    after = decode_cursor(query_params.cursor, query_params.sort.value)
+    try:
+        value, item_id = after
+        if query_params.sort == ItemSort.NEWEST:
+            value = datetime.fromisoformat(value)
+        elif query_params.sort == ItemSort.RELEVANCE:
+            value = float(value)
+        elif not isinstance(value, int):
+            raise ValueError()
+    except (ValueError, TypeError):
+        raise InvalidFormatException()
+    return value, item_id
+
+def _paginate(
+        items: Sequence[Item],
+        query_params: ItemQueryParams,
+        scores: dict[str, float] | None = None
+    ) -> tuple[list[Item], str | None]:
+    # limit + 1 개를 읽어서 다음 페이지가 있는지 확인하고, 있으면 마지막 행으로 커서를 만듭니다.
+    page = list(items[:query_params.limit])
+    if len(items) <= query_params.limit:
+        return page, None
+    last = page[-1]
+    if query_params.sort == ItemSort.NEWEST:
+        value = last.created_at.isoformat()
+    elif query_params.sort == ItemSort.RELEVANCE and scores is not None:
+        value = scores[last.id]
+    else:
+        value = last.price
+    return page, encode_cursor(query_params.sort.value, [value, last.id])
+
+def _ranked_search(query_params: ItemQueryParams, after: tuple[Any, str] | None) -> list[tuple[str, float]]:
+    ranked = ITEM_NAME_INDEX.search(query_params.q)
+    if after is not None:
+        after_key = (-after[0], after[1])
+        ranked = [(item_id, score) for item_id, score in ranked if (-score, item_id) > after_key]
+    return ranked
+
+def _search_candidate_batches(query_params: ItemQueryParams) -> list[list[str]]:
+    candidates = [item_id for item_id, _ in ITEM_NAME_INDEX.search(query_params.q)][:_SEARCH_SORT_CANDIDATES]
+    return [candidates[start:start + _SEARCH_BATCH_SIZE] for start in range(0, len(candidates), _SEARCH_BATCH_SIZE)]
+
+def _merge_sorted(batches: list[Sequence[Item]], query_params: ItemQueryParams) -> list[Item]:
+    # 묶음마다 정렬해서 limit + 1 개씩 읽었으므로, 합쳐서 다시 정렬한 앞부분이 전체의 앞부분입니다.
+    attribute, descending = _SORT_ATTRIBUTES[query_params.sort]
+    merged = sorted((item for batch in batches for item in batch),
+                    key=lambda item: (getattr(item, attribute), item.id), reverse=descending)
+    return merged[:query_params.limit + 1]
+
+def _search_filters(query_params: ItemQueryParams) -> dict[str, Any]:
+    return dict(store_id=query_params.store_id,
+                min_price=query_params.min_price,
+                max_price=query_params.max_price,
+                in_stock=query_params.in_stock)
+
 
 class ItemService:
     def __init__(self, 
@@ -25,6 +101,8 @@ class ItemService:
 
         item = Item(name=request.item_name, price=request.price, stock=request.stock, store_id=store.id)
         self.item_repository.create_item(item)
+        self.item_repository.invalidate_cached_items([item])
+        self.item_repository.reindex_item(item.id, item.name)
         return item
     
 
@@ -50,16 +128,48 @@ class ItemService:
                 setattr(item, key, value)
 
         self.item_repository.update_item(item)
+        self.item_repository.invalidate_cached_items([item])
+        if request.item_name is not None:
+            self.item_repository.reindex_item(item.id, item.name)
         return item
     
-    def get_items(self, query_params: ItemQueryParams) -> list[Item]:
+    def get_items(self, query_params: ItemQueryParams) -> tuple[list[Item], str | None]:
+        after = _cursor_after(query_params)
         if query_params.store_id and self.store_repository.get_store_by_id(query_params.store_id) is None:
             raise StoreNotFoundError()
+        if query_params.sort == ItemSort.RELEVANCE:
+            return self._search_items(query_params, after)
+        if query_params.q:
+            batches = [self.item_repository.get_items(**_search_filters(query_params), sort=query_params.sort,
+                                                      after=after, limit=query_params.limit + 1, item_ids=batch)
+                       for batch in _search_candidate_batches(query_params)]
+            return _paginate(_merge_sorted(batches, query_params), query_params)
         items = self.item_repository.get_items(store_id=query_params.store_id,
                                        min_price=query_params.min_price,
                                        max_price=query_params.max_price,
-                                       in_stock=query_params.in_stock)
-        return items
+                                       in_stock=query_params.in_stock,
+                                       sort=query_params.sort,
+                                       after=after,
+                                       limit=query_params.limit + 1)
+        return _paginate(items, query_params)
+
+    def _search_items(
+            self,
+            query_params: ItemQueryParams,
+            after: tuple[Any, str] | None
+        ) -> tuple[list[Item], str | None]:
+        ranked = _ranked_search(query_params, after)
+        page: list[Item] = []
+        for start in range(0, len(ranked), _SEARCH_BATCH_SIZE):
+            batch = [item_id for item_id, _ in ranked[start:start + _SEARCH_BATCH_SIZE]]
+            found = {item.id: item for item in
+                     self.item_repository.get_items(**_search_filters(query_params), item_ids=batch)}
+            # 다른 워커에서 이름이 바뀌었을 수 있으므로 DB 의 이름으로 다시 확인합니다.
+            page.extend(found[item_id] for item_id in batch
+                        if item_id in found and matches(found[item_id].name, query_params.q))
+            if len(page) > query_params.limit:
+                break
+        return _paginate(page, query_params, dict(ranked))
     
     def delete_item(self, user: User, item_id: str) -> None:
         store = self.store_repository.get_store_by_owner_id(user.id)
@@ -73,8 +183,69 @@ class ItemService:
             raise ItemNotOwnedError()
 
         self.item_repository.delete_item(item)
+        self.item_repository.invalidate_cached_items([item])
+        self.item_repository.reindex_item(item.id, None)
 
     def get_store_items(self, store_id: str) -> list[Item]:
         if self.store_repository.get_store_by_id(store_id) is None:
             raise StoreNotFoundError()
-        return self.item_repository.get_items(store_id=store_id)
\ No newline at end of file
+        return self.item_repository.get_items(store_id=store_id)
+
+
+
+class ReplicaItemService(ItemService):
+    def __init__(self,
+                 item_repository: Annotated[ReplicaItemRepository, Depends()],
+                 store_repository: Annotated[ReplicaStoreRepository, Depends()]
+                 ) -> None:
+        super().__init__(item_repository, store_repository)
+
+class AsyncItemService:
+    def __init__(self,
+                 item_repository: Annotated[AsyncItemRepository, Depends()],
+                 store_repository: Annotated[AsyncStoreRepository, Depends()]
+                 ) -> None:
+        self.item_repository = item_repository
+        self.store_repository = store_repository
+
+    async def get_items(self, query_params: ItemQueryParams) -> tuple[list[Item], str | None]:
+        after = _cursor_after(query_params)
+        if query_params.store_id and await self.store_repository.get_store_by_id(query_params.store_id) is None:
+            raise StoreNotFoundError()
+        if query_params.sort == ItemSort.RELEVANCE:
+            return await self._search_items(query_params, after)
+        if query_params.q:
+            batches = [await self.item_repository.get_items(**_search_filters(query_params), sort=query_params.sort,
+                                                            after=after, limit=query_params.limit + 1, item_ids=batch)
+                       for batch in _search_candidate_batches(query_params)]
+            return _paginate(_merge_sorted(batches, query_params), query_params)
+        items = await self.item_repository.get_items(store_id=query_params.store_id,
+                                                     min_price=query_params.min_price,
+                                                     max_price=query_params.max_price,
+                                                     in_stock=query_params.in_stock,
+                                                     sort=query_params.sort,
+                                                     after=after,
+                                                     limit=query_params.limit + 1)
+        return _paginate(items, query_params)
+
+    async def _search_items(
+            self,
+            query_params: ItemQueryParams,
+            after: tuple[Any, str] | None
+        ) -> tuple[list[Item], str | None]:
+        ranked = _ranked_search(query_params, after)
+        page: list[Item] = []
+        for start in range(0, len(ranked), _SEARCH_BATCH_SIZE):
+            batch = [item_id for item_id, _ in ranked[start:start + _SEARCH_BATCH_SIZE]]
+            found = {item.id: item for item in
+                     await self.item_repository.get_items(**_search_filters(query_params), item_ids=batch)}
+            page.extend(found[item_id] for item_id in batch
+                        if item_id in found and matches(found[item_id].name, query_params.q))
+            if len(page) > query_params.limit:
+                break
+        return _paginate(page, query_params, dict(ranked))
+
+    async def get_store_items(self, store_id: str) -> list[Item]:
+        if await self.store_repository.get_store_by_id(store_id) is None:
+            raise StoreNotFoundError()
+        return list(await self.item_repository.get_items(store_id=store_id))
\ No newline at end of file
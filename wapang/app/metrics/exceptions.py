@@ -0,0 +1,6 @@
+from wapang.common.exceptions import WapangException
+
+class MetricsNotFoundError(WapangException):
+    # 지표 엔드포인트가 있다는 것도 알리지 않도록 404 로 응답합니다.
+    def __init__(self):
+        super().__init__(status_code=404, error_code="ERR_027", error_msg="NOT FOUND")
@@ -0,0 +1,60 @@
+import hmac
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Header
+
+from wapang.app.auth.denylist import REFRESH_TOKEN_DENYLIST
+from wapang.app.auth.hashing import PASSWORD_HASHING
+from wapang.app.auth.utils import VERIFIED_TOKENS
+from wapang.app.metrics.exceptions import MetricsNotFoundError
+from wapang.app.metrics.settings import METRICS_SETTINGS
+from wapang.app.metrics.schemas import (
+    CacheBusStatsResponse,
+    CacheStatsResponse,
+    DatabasePoolStatsResponse,
+    PasswordHashingStatsResponse,
+    TokenDenylistStatsResponse,
+    VerifiedTokenCacheStatsResponse,
+)
+from wapang.app.search.schemas import SearchIndexStatsResponse
+from wapang.app.search.services import SearchService
+from wapang.cache.backends import CATALOG_CACHE
+from wapang.cache.bus import INVALIDATION_BUS
+from wapang.database.connection import get_db_manager
+
+def require_metrics_token(x_metrics_token: Annotated[str | None, Header()] = None) -> None:
+    token = METRICS_SETTINGS.token
+    if not token or x_metrics_token is None or not hmac.compare_digest(x_metrics_token.encode(), token.encode()):
+        raise MetricsNotFoundError()
+
+metrics_router = APIRouter(dependencies=[Depends(require_metrics_token)])
+
+@metrics_router.get("/db-pool", status_code=200)
+def get_db_pool_stats() -> DatabasePoolStatsResponse:
+    return DatabasePoolStatsResponse(**get_db_manager().pool_stats())
+
+@metrics_router.get("/cache", status_code=200)
+def get_cache_stats() -> CacheStatsResponse:
+    return CacheStatsResponse(**CATALOG_CACHE.stats())
+
+@metrics_router.get("/cache-bus", status_code=200)
+def get_cache_bus_stats() -> CacheBusStatsResponse:
+    return CacheBusStatsResponse(**INVALIDATION_BUS.stats())
+
+@metrics_router.get("/token-cache", status_code=200)
+def get_token_cache_stats() -> VerifiedTokenCacheStatsResponse:
+    return VerifiedTokenCacheStatsResponse(**VERIFIED_TOKENS.stats())
+
+@metrics_router.get("/password-hashing", status_code=200)
+def get_password_hashing_stats() -> PasswordHashingStatsResponse:
+    return PasswordHashingStatsResponse(**PASSWORD_HASHING.stats())
+
+@metrics_router.get("/token-denylist", status_code=200)
+def get_token_denylist_stats() -> TokenDenylistStatsResponse:
+    return TokenDenylistStatsResponse(**REFRESH_TOKEN_DENYLIST.stats())
+
+@metrics_router.get("/search-index", status_code=200)
+def get_search_index_stats(
+    search_service: Annotated[SearchService, Depends()],
+) -> SearchIndexStatsResponse:
+    return search_service.get_stats()
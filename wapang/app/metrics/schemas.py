@@ -0,0 +1,49 @@
+from pydantic import BaseModel
+
+class DatabasePoolStatsResponse(BaseModel):
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    checkouts: int = 0
+    timeouts: int = 0
+    total_wait_ms: float = 0
+    max_wait_ms: float = 0
+
+class CacheStatsResponse(BaseModel):
+    entries: int
+    max_entries: int
+    hits: int
+    misses: int
+    hit_ratio: float
+    evictions: int
+    invalidations: int
+
+class CacheBusStatsResponse(BaseModel):
+    transport: str
+    published: int
+    received: int
+    max_latency_ms: float
+
+class VerifiedTokenCacheStatsResponse(BaseModel):
+    size: int
+    max_entries: int
+    hits: int
+    misses: int
+    hit_ratio: float
+
+class PasswordHashingStatsResponse(BaseModel):
+    max_workers: int
+    queued: int
+    running: int
+    completed: int
+    max_queued: int
+
+class TokenDenylistStatsResponse(BaseModel):
+    loaded: bool
+    entries: int
+    bits: int
+    hashes: int
+    checks: int
+    skipped: int
+    purged: int
@@ -0,0 +1,18 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from wapang.settings import SETTINGS
+
+
+class MetricsSettings(BaseSettings):
+    # /api/metrics/* 는 풀 크기, 캐시 적중률, 차단 목록 크기처럼 내부 용량과 보안 상태를 보여 주므로
+    # X-Metrics-Token 헤더로 이 토큰을 보낸 요청에만 응답합니다. 비워 두면 모두 막습니다.
+    token: str | None = None
+
+    model_config = SettingsConfigDict(
+        case_sensitive=False,
+        env_prefix="METRICS_",
+        env_file=SETTINGS.env_file,
+        extra='ignore'
+    )
+
+
+METRICS_SETTINGS = MetricsSettings()
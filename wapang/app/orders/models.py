@@ -1,29 +1,36 @@
 from enum import Enum
 import uuid
-from sqlalchemy import Integer, String, ForeignKey
+from sqlalchemy import Index, Integer, String, ForeignKey, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from wapang.app.items.models import Item
-from wapang.database.common import Base
+from wapang.database.common import Base, LAZY_LOADING
 
 from wapang.app.users.models import User
 
 
 class StatusEnum(str, Enum):
+    # 대기열 모드에서 접수만 된 주문은 PENDING 이고, 처리되면 ORDERED 또는 재고 부족으로 REJECTED 가 됩니다.
+    PENDING = "PENDING"
     ORDERED = "ORDERED"
     COMPLETED = "COMPLETED"
     CANCELED = "CANCELED"
+    REJECTED = "REJECTED"
 
 class Order(Base):
     __tablename__ = "order"
+    # 내 주문 목록 조회에 사용합니다.
+    __table_args__ = (
+        Index("ix_order_user_id_id", "user_id", "id"),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
     status: Mapped[StatusEnum] = mapped_column(String(10), default=StatusEnum.ORDERED)
     total_price: Mapped[int] = mapped_column(Integer, default=0)
 
     user_id: Mapped[str] = mapped_column(ForeignKey("user.id"))
-    user: Mapped[User] = relationship("User", back_populates="orders")
+    user: Mapped[User] = relationship("User", back_populates="orders", lazy=LAZY_LOADING)
 
-    order_items: Mapped[list["OrderItem"]] = relationship("OrderItem", back_populates="order", cascade="all, delete-orphan")
+    order_items: Mapped[list["OrderItem"]] = relationship("OrderItem", back_populates="order", cascade="all, delete-orphan", lazy=LAZY_LOADING)
     
 
 
@@ -32,7 +39,29 @@ class OrderItem(Base):
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
     quantity: Mapped[int] = mapped_column(Integer)
-    order_id: Mapped[str] = mapped_column(ForeignKey("order.id"))
-    item_id: Mapped[str] = mapped_column(ForeignKey("item.id"))
-    order: Mapped[Order] = relationship(Order, back_populates="order_items")
-    item: Mapped[Item] = relationship(Item, back_populates="order_items")
\ No newline at end of file
+    order_id: Mapped[str] = mapped_column(ForeignKey("order.id"), index=True)
+    item_id: Mapped[str | None] = mapped_column(ForeignKey("item.id", ondelete="SET NULL", name="fk_order_item_item_id"))
+
+    # 주문 시점의 상품/상점 정보입니다. 주문 조회는 현재 카탈로그 대신 이 값으로 응답하므로
+    # 상품 가격이 바뀌거나 상품이 삭제되어도 주문 내역은 그대로 유지됩니다.
+    item_name: Mapped[str] = mapped_column(String(50))
+    unit_price: Mapped[int] = mapped_column(Integer)
+    store_id: Mapped[str] = mapped_column(String(36))
+    store_name: Mapped[str] = mapped_column(String(100))
+    delivery_fee: Mapped[int] = mapped_column(Integer)
+
+    order: Mapped[Order] = relationship(Order, back_populates="order_items", lazy=LAZY_LOADING)
+    item: Mapped[Item] = relationship(Item, back_populates="order_items", lazy=LAZY_LOADING)
+
+
+class QueuedOrder(Base):
+    # 대기열 모드에서 접수된 주문의 요청 내용입니다. 테이블이 곧 대기열이므로 서버가 재시작되어도 남은 주문이 처리됩니다.
+    __tablename__ = "order_queue"
+
+    # 접수 순서. 같은 초에 들어온 주문도 먼저 들어온 것부터 재고를 받습니다.
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    order_id: Mapped[str] = mapped_column(ForeignKey("order.id"), unique=True)
+    # [[item_id, quantity], ...] 형태의 JSON
+    lines: Mapped[str] = mapped_column(Text)
+
+    order: Mapped[Order] = relationship(Order, lazy=LAZY_LOADING)
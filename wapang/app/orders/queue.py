@@ -0,0 +1,58 @@
+import asyncio
+from typing import Callable, TypeVar
+
+from fastapi.concurrency import run_in_threadpool
+
+from wapang.app.carts.repositories import ReservationRepository
+from wapang.app.carts.reservations import ReservationService
+from wapang.app.items.repositories import ItemRepository
+from wapang.app.orders.repositories import OrderRepository
+from wapang.app.orders.services import OrderService
+from wapang.app.orders.settings import ORDER_SETTINGS
+from wapang.common.exceptions import logger
+from wapang.database.connection import get_db_manager
+
+T = TypeVar("T")
+
+
+def _run_in_transaction(work: Callable[[OrderService], T]) -> T:
+    with get_db_manager().session_factory() as session:
+        item_repository = ItemRepository(session)
+        order_service = OrderService(OrderRepository(session), item_repository,
+                                     ReservationService(ReservationRepository(session), item_repository))
+        result = work(order_service)
+        session.commit()
+    return result
+
+def drain_order_queue() -> int:
+    # 한 묶음을 하나의 트랜잭션으로 처리하고, 처리한 주문 수를 반환합니다.
+    batch_size = ORDER_SETTINGS.queue_batch_size
+    try:
+        return _run_in_transaction(lambda order_service: order_service.process_queued_orders(batch_size))
+    except Exception:
+        logger.exception("Failed to process queued orders, retrying the batch one order at a time")
+
+    # 처리할 수 없는 주문 하나가 묶음 전체를 계속 실패시키지 않도록, 같은 묶음을 한 건씩 처리하고 실패한 주문만 거절합니다.
+    queued_order_ids = _run_in_transaction(lambda order_service: order_service.get_queued_order_ids(batch_size))
+    processed = 0
+    for queued_order_id in queued_order_ids:
+        try:
+            processed += _run_in_transaction(
+                lambda order_service: order_service.process_queued_order(queued_order_id))
+        except Exception:
+            logger.exception(f"Rejecting queued order {queued_order_id} that failed to process")
+            processed += _run_in_transaction(
+                lambda order_service: order_service.reject_queued_order(queued_order_id))
+    return processed
+
+async def run_order_queue_worker() -> None:
+    # lifespan 에서 ORDER_SETTINGS.queue_workers 개를 띄웁니다. 대기열은 테이블이므로 재시작 전에 접수된 주문도 이어서 처리합니다.
+    while True:
+        try:
+            processed = await run_in_threadpool(drain_order_queue)
+        except Exception:
+            logger.exception("Failed to process queued orders")
+            processed = 0
+        # 묶음이 가득 찼다면 밀린 주문이 더 있으므로 쉬지 않고 이어서 처리합니다.
+        if processed < ORDER_SETTINGS.queue_batch_size:
+            await asyncio.sleep(ORDER_SETTINGS.queue_poll_interval_seconds)
@@ -1,13 +1,14 @@
 from typing import Annotated, Sequence
 
 from fastapi import Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, selectinload
 from sqlalchemy import select
-from wapang.app.orders.models import Order, OrderItem
-from wapang.database.connection import get_db_session
+from wapang.app.orders.models import Order, OrderItem, QueuedOrder
+from wapang.database.connection import get_db_session, get_async_db_session
 
 class OrderRepository:
-    def __init__(self, session: Annotated[Session, Depends(get_db_session)]) -> None:
+    def __init__(self, session: Annotated[Session, Depends(get_db_session, scope="function")]) -> None:
         self.session = session
 
     def create_order(self, order: Order) -> None:
@@ -21,6 +22,72 @@ class OrderRepository:
     def get_order_by_id(self, order_id: str) -> Order | None:
         return self.session.scalar(select(Order).where(Order.id == order_id))
 
+    def get_order_by_id_with_details(self, order_id: str) -> Order | None:
+        # 주문 상품에 주문 시점의 상품/상점 정보가 저장되어 있으므로 카탈로그 테이블은 읽지 않습니다.
+        return self.session.scalar(
+            select(Order)
+            .where(Order.id == order_id)
+            .options(selectinload(Order.order_items))
+        )
+
     def get_orders_by_user_id(self, user_id: str) -> Sequence[Order]:
         query = select(Order).where(Order.user_id == user_id)
-        return self.session.scalars(query).all()
\ No newline at end of file
+        return self.session.scalars(query).all()
+
+    def enqueue_order(self, order: Order, queued_order: QueuedOrder) -> None:
+        self.session.add(order)
+        self.session.flush()
+        queued_order.order_id = order.id
+        self.session.add(queued_order)
+        self.session.flush()
+
+    def claim_queued_orders(self, limit: int) -> Sequence[QueuedOrder]:
+        # 먼저 들어온 순서로 가져오고, 다른 워커가 잡고 있는 행은 건너뛰어 워커끼리 같은 주문을 처리하지 않습니다.
+        return self.session.scalars(
+            select(QueuedOrder)
+            .order_by(QueuedOrder.id)
+            .limit(limit)
+            .options(joinedload(QueuedOrder.order, innerjoin=True))
+            .with_for_update(skip_locked=True)
+        ).all()
+
+    def claim_queued_order(self, queued_order_id: int) -> QueuedOrder | None:
+        return self.session.scalar(
+            select(QueuedOrder)
+            .where(QueuedOrder.id == queued_order_id)
+            .options(joinedload(QueuedOrder.order, innerjoin=True))
+            .with_for_update(skip_locked=True)
+        )
+
+    def get_queued_order_ids(self, limit: int) -> Sequence[int]:
+        return self.session.scalars(select(QueuedOrder.id).order_by(QueuedOrder.id).limit(limit)).all()
+
+    def delete_queued_orders(self, queued_orders: Sequence[QueuedOrder]) -> None:
+        for queued_order in queued_orders:
+            self.session.delete(queued_order)
+        self.session.flush()
+
+
+class AsyncOrderRepository:
+    def __init__(self, session: Annotated[AsyncSession, Depends(get_async_db_session, scope="function")]) -> None:
+        self.session = session
+
+    async def create_order(self, order: Order) -> None:
+        self.session.add(order)
+        await self.session.flush()
+
+    async def create_order_items(self, order_items: list[OrderItem]) -> None:
+        self.session.add_all(order_items)
+        await self.session.flush()
+
+    async def get_order_by_id(self, order_id: str) -> Order | None:
+        # 비동기 세션에서는 지연 로딩을 쓸 수 없으므로 주문 응답에 필요한 관계를 함께 불러옵니다.
+        return await self.session.scalar(
+            select(Order)
+            .where(Order.id == order_id)
+            .options(selectinload(Order.order_items))
+        )
+
+    async def get_orders_by_user_id(self, user_id: str) -> Sequence[Order]:
+        query = select(Order).where(Order.user_id == user_id)
+        return (await self.session.scalars(query)).all()
\ No newline at end of file
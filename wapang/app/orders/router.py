@@ -1,10 +1,12 @@
 from typing import Annotated
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, Response, status
 
 from wapang.app.users.models import User
 from wapang.app.auth.utils import login_with_header
+from wapang.app.idempotency.services import IdempotencyService
 from wapang.app.orders.services import OrderService
 from wapang.app.orders.schemas import OrderCreateRequest, OrderStatusUpdateRequest, OrderResponse
+from wapang.app.orders.settings import ORDER_SETTINGS
 
 order_router = APIRouter()
 
@@ -12,9 +14,19 @@ order_router = APIRouter()
 def create_order(
     user: Annotated[User, Depends(login_with_header)],
     request: OrderCreateRequest,
-    order_service: Annotated[OrderService, Depends()]
+    order_service: Annotated[OrderService, Depends()],
+    idempotency_service: Annotated[IdempotencyService, Depends()],
+    response: Response,
+    idempotency_key: Annotated[str | None, Header(min_length=1, max_length=64)] = None,
 ) -> OrderResponse:
-    return order_service.create_order(user, request)
+    if ORDER_SETTINGS.queue_enabled:
+        # 접수만 하고 202 를 돌려줍니다. 결과는 GET /orders/{order_id} 로 확인합니다.
+        response.status_code = status.HTTP_202_ACCEPTED
+        place_order = order_service.enqueue_order
+    else:
+        place_order = order_service.create_order
+    return idempotency_service.run(user, idempotency_key, f"POST /orders {request.model_dump_json()}", OrderResponse,
+                                   lambda: place_order(user, request))
 
 @order_router.get("/{order_id}")
 def get_order(
@@ -13,7 +13,7 @@ class OrderCreateRequest(BaseModel):
     items: list[ItemRequest]
 
 class ItemResponse(BaseModel):
-    item_id: str
+    item_id: str | None
     item_name: str
     price: int
     quantity: int
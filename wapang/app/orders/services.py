@@ -1,12 +1,16 @@
-from typing import Annotated, Any
+from typing import Annotated, Sequence
+import json
 
 from fastapi import Depends
 from wapang.app.items.exceptions import ItemNotFoundError, ItemNotEnoughStockError
 from wapang.app.orders.exceptions import EmptyItemListError, OrderNotOwnedError, OrderNotFoundError, InvalidOrderStatusError
+from wapang.app.carts.models import StockReservation
+from wapang.app.carts.reservations import ReservationService
+from wapang.app.carts.settings import CART_SETTINGS
 from wapang.app.items.repositories import ItemRepository
 from wapang.app.items.models import Item
 from wapang.app.users.models import User
-from wapang.app.orders.models import Order, OrderItem
+from wapang.app.orders.models import Order, OrderItem, QueuedOrder, StatusEnum
 from wapang.app.orders.schemas import (
     OrderCreateRequest,
     OrderResponse,
@@ -19,53 +23,169 @@ from wapang.app.orders.repositories import OrderRepository
 class OrderService:
     def __init__(self, 
                  order_repository: Annotated[OrderRepository, Depends()],
-                 item_repository: Annotated[ItemRepository, Depends()]
+                 item_repository: Annotated[ItemRepository, Depends()],
+                 reservation_service: Annotated[ReservationService, Depends()],
                  ) -> None:
         self.order_repository = order_repository
         self.item_repository = item_repository
+        self.reservation_service = reservation_service
 
     def create_order(self, user: User, request: OrderCreateRequest) -> OrderResponse:
-        total_price = 0
-        items_by_id: dict[str, Item] = {}
-        seen_store_ids: set[str] = set()
         if request.items == []:
             raise EmptyItemListError()
+
+        quantities: dict[str, int] = {}
+        for req_item in request.items:
+            quantities[req_item.item_id] = quantities.get(req_item.item_id, 0) + req_item.quantity
+
+        # 장바구니에서 예약해 둔 수량은 이미 재고에서 빠져 있으므로 나머지만 차감합니다.
+        reserved: dict[str, int] = {}
+        if CART_SETTINGS.reservations_enabled:
+            reserved = self.reservation_service.consume(user.id, quantities)
+        needed = {item_id: quantity - reserved.get(item_id, 0) for item_id, quantity in quantities.items()
+                  if quantity > reserved.get(item_id, 0)}
+
+        # 모두 예약으로 채워지면 상품 행을 잠그지 않습니다.
+        if needed:
+            items = self.item_repository.get_items_by_ids_for_update(sorted(quantities))
+        else:
+            items = self.item_repository.get_items_by_ids(sorted(quantities))
+        items_by_id: dict[str, Item] = {item.id: item for item in items}
+
+        order_items: list[OrderItem] = []
         for req_item in request.items:
-            item = self.item_repository.get_item_by_id(req_item.item_id)
+            item = items_by_id.get(req_item.item_id)
             if item is None:
                 raise ItemNotFoundError()
-            if item.stock < req_item.quantity:
+            if item.stock < needed.get(req_item.item_id, 0):
                 raise ItemNotEnoughStockError()
-            items_by_id[req_item.item_id] = item
-            # add item subtotal
-            total_price += item.price * req_item.quantity
-            # add delivery fee once per store
-            store_id = item.store.id
-            if store_id not in seen_store_ids:
-                seen_store_ids.add(store_id)
-                total_price += item.store.delivery_fee
-            
-
-        order = Order(user_id=user.id, total_price=total_price)
+            order_items.append(self._snapshot_line(item, req_item.quantity))
+        _, total_price = self._compose_details_and_total(order_items)
+
+        # 위의 검사는 빠른 실패를 위한 것이고, 실제 차감은 재고 조건을 건 UPDATE 로 원자적으로 합니다.
+        if needed:
+            if not self.item_repository.decrement_stock(needed):
+                raise ItemNotEnoughStockError()
+            self.item_repository.invalidate_cached_items(item for item in items if item.id in needed)
+
+        # 주문과 주문 상품을 한 번의 flush 로 함께 insert 합니다.
+        order = Order(user_id=user.id, total_price=total_price, order_items=order_items)
         self.order_repository.create_order(order)
 
-        new_order_items: list[OrderItem] = []
+        return self._build_order_response(order)
+
+    def enqueue_order(self, user: User, request: OrderCreateRequest) -> OrderResponse:
+        # 대기열 모드의 주문 접수. 잠금 없이 요청만 검증하고 저장하며, 재고 확인과 차감은 process_queued_orders 에서 합니다.
+        if request.items == []:
+            raise EmptyItemListError()
+
+        quantities: dict[str, int] = {}
         for req_item in request.items:
-            item = items_by_id[req_item.item_id]
-            item.stock -= req_item.quantity
-            new_order_items.append(
-                OrderItem(
-                    order_id=order.id,
-                    item_id=req_item.item_id,
-                    quantity=req_item.quantity,
-                )
-            )
-        self.order_repository.create_order_items(new_order_items)
+            quantities[req_item.item_id] = quantities.get(req_item.item_id, 0) + req_item.quantity
+
+        items_by_id: dict[str, Item] = {
+            item.id: item for item in self.item_repository.get_items(item_ids=sorted(quantities))
+        }
+        reserved: dict[str, int] = {}
+        if CART_SETTINGS.reservations_enabled:
+            reserved = self.reservation_service.reserved_quantities(user.id, sorted(quantities))
+        for item_id, quantity in quantities.items():
+            item = items_by_id.get(item_id)
+            if item is None:
+                raise ItemNotFoundError()
+            # 지금 이미 부족한 주문은 대기열에 넣지 않고 바로 거절합니다. 예약해 둔 수량은 재고에서 빠져 있으므로 더해서 봅니다.
+            if item.stock + reserved.get(item_id, 0) < quantity:
+                raise ItemNotEnoughStockError()
+
+        order = Order(user_id=user.id, total_price=0, status=StatusEnum.PENDING)
+        lines = [[req_item.item_id, req_item.quantity] for req_item in request.items]
+        self.order_repository.enqueue_order(order, QueuedOrder(lines=json.dumps(lines)))
+        return OrderResponse(order_id=order.id, details=[], total_price=0, status=order.status)
+
+    def process_queued_orders(self, limit: int) -> int:
+        # 대기열에서 주문을 최대 limit 개 꺼내 한 트랜잭션으로 처리하고, 꺼낸 개수를 반환합니다.
+        # 묶음 전체에서 상품마다 행을 한 번만 잠그고 재고를 한 번만 차감하므로, 인기 상품에 주문이 몰려도 잠금 경합이 묶음 수만큼만 생깁니다.
+        return self._process_queued_orders(self.order_repository.claim_queued_orders(limit))
+
+    def process_queued_order(self, queued_order_id: int) -> int:
+        # 다른 워커가 잡고 있거나 이미 처리된 주문이면 0 을 반환합니다.
+        queued_order = self.order_repository.claim_queued_order(queued_order_id)
+        return self._process_queued_orders([queued_order] if queued_order is not None else [])
+
+    def reject_queued_order(self, queued_order_id: int) -> int:
+        # 처리할 수 없는 주문을 대기열에서 빼고 거절합니다. 예약은 다른 거절된 주문처럼 그대로 둡니다.
+        queued_order = self.order_repository.claim_queued_order(queued_order_id)
+        if queued_order is None:
+            return 0
+        if queued_order.order.status == StatusEnum.PENDING:
+            queued_order.order.status = StatusEnum.REJECTED
+        self.order_repository.delete_queued_orders([queued_order])
+        return 1
+
+    def get_queued_order_ids(self, limit: int) -> Sequence[int]:
+        return self.order_repository.get_queued_order_ids(limit)
+
+    def _process_queued_orders(self, queued_orders: Sequence[QueuedOrder]) -> int:
+        if not queued_orders:
+            return 0
+        requests = [(queued_order.order, json.loads(queued_order.lines)) for queued_order in queued_orders]
+
+        item_ids = sorted({item_id for _, lines in requests for item_id, _ in lines})
+        # create_order 와 같이 예약 행을 상품 행보다 먼저 잠급니다.
+        reservations: dict[tuple[str, str], StockReservation] = {}
+        if CART_SETTINGS.reservations_enabled:
+            reservations = self.reservation_service.lock_reservations(
+                sorted({order.user_id for order, _ in requests}), item_ids)
+        items = self.item_repository.get_items_by_ids_for_update(item_ids)
+        items_by_id: dict[str, Item] = {item.id: item for item in items}
+        remaining = {item.id: item.stock for item in items}
+        decrements: dict[str, int] = {}
+        new_order_items: list[OrderItem] = []
+
+        # 먼저 접수된 주문부터 남은 재고를 배정합니다.
+        for order, lines in requests:
+            # 처리되기 전에 취소된 주문
+            if order.status != StatusEnum.PENDING:
+                continue
+            quantities: dict[str, int] = {}
+            for item_id, quantity in lines:
+                quantities[item_id] = quantities.get(item_id, 0) + quantity
+            # 주문한 사용자가 예약해 둔 수량은 이미 재고에서 빠져 있으므로 나머지만 배정합니다.
+            reserved = {item_id: reservations[(order.user_id, item_id)].quantity for item_id in quantities
+                        if (order.user_id, item_id) in reservations}
+            needed = {item_id: quantity - min(quantity, reserved.get(item_id, 0))
+                      for item_id, quantity in quantities.items()}
+            if any(item_id not in remaining or remaining[item_id] < quantity
+                   for item_id, quantity in needed.items()):
+                order.status = StatusEnum.REJECTED
+                continue
+            self.reservation_service.cover(
+                (reservations[(order.user_id, item_id)] for item_id in reserved), quantities)
+            for item_id, quantity in needed.items():
+                if quantity:
+                    remaining[item_id] -= quantity
+                    decrements[item_id] = decrements.get(item_id, 0) + quantity
+            order_items = [self._snapshot_line(items_by_id[item_id], quantity) for item_id, quantity in lines]
+            for order_item in order_items:
+                order_item.order_id = order.id
+            new_order_items.extend(order_items)
+            _, order.total_price = self._compose_details_and_total(order_items)
+            order.status = StatusEnum.ORDERED
+
+        # 잠근 재고 안에서 배정했으므로 차감은 항상 성공합니다.
+        if decrements:
+            if not self.item_repository.decrement_stock(decrements):
+                raise ItemNotEnoughStockError()
+            self.item_repository.invalidate_cached_items(item for item in items if item.id in decrements)
+        # 묶음의 주문 상품을 한 번의 flush 로 insert 합니다. 모두 예약으로 채워진 묶음이면 차감할 재고가 없습니다.
+        if new_order_items:
+            self.order_repository.create_order_items(new_order_items)
+        self.reservation_service.delete_used_up(reservations.values())
+        self.order_repository.delete_queued_orders(queued_orders)
+        return len(queued_orders)
 
-        return self._build_order_response(order)
-    
     def get_order(self, user: User, order_id: str) -> OrderResponse:
-        order = self.order_repository.get_order_by_id(order_id)
+        order = self.order_repository.get_order_by_id_with_details(order_id)
         if order is None:
             raise OrderNotFoundError()
         if order.user_id != user.id:
@@ -81,6 +201,10 @@ class OrderService:
             raise OrderNotOwnedError()
         if order.status == request.status:
             raise InvalidOrderStatusError()
+        # PENDING 과 REJECTED 는 대기열 처리에서만 정해지고, 처리 전인 주문은 취소만 할 수 있습니다.
+        if request.status in (StatusEnum.PENDING, StatusEnum.REJECTED) or order.status == StatusEnum.REJECTED \
+                or (order.status == StatusEnum.PENDING and request.status != StatusEnum.CANCELED):
+            raise InvalidOrderStatusError()
         
         order.status = request.status
 
@@ -90,8 +214,7 @@ class OrderService:
         return self.order_repository.get_orders_by_user_id(user_id)
     
     def _build_order_response(self, order: Order) -> OrderResponse:
-        lines: list[tuple[Item, int]] = [(oi.item, oi.quantity) for oi in order.order_items]
-        details, total_price = self._compose_details_and_total(lines)
+        details, total_price = self._compose_details_and_total(order.order_items)
         return OrderResponse(
             order_id=order.id,
             details=details,
@@ -99,26 +222,37 @@ class OrderService:
             status=order.status,
         )
 
-    def _compose_details_and_total(self, lines: list[tuple[Item, int]]) -> tuple[list[OrderDetailResponse], int]:
+    def _snapshot_line(self, item: Item, quantity: int) -> OrderItem:
+        # 현재 상품/상점 정보를 주문 상품 형태로 복사합니다. 장바구니에서는 저장하지 않고 응답 계산에만 씁니다.
+        return OrderItem(
+            item_id=item.id,
+            quantity=quantity,
+            item_name=item.name,
+            unit_price=item.price,
+            store_id=item.store.id,
+            store_name=item.store.name,
+            delivery_fee=item.store.delivery_fee,
+        )
+
+    def _compose_details_and_total(self, lines: Sequence[OrderItem]) -> tuple[list[OrderDetailResponse], int]:
             store_groups: dict[str, dict] = {}
-            for item, qty in lines:
-                store = item.store
-                sid = store.id
+            for line in lines:
+                sid = line.store_id
                 if sid not in store_groups:
                     store_groups[sid] = {
                         "store_id": sid,
-                        "store_name": store.name,
-                        "delivery_fee": store.delivery_fee,
+                        "store_name": line.store_name,
+                        "delivery_fee": line.delivery_fee,
                         "items": [],
                         "items_subtotal": 0,
                     }
-                subtotal = item.price * qty
+                subtotal = line.unit_price * line.quantity
                 store_groups[sid]["items"].append(
                     ItemResponse(
-                        item_id=item.id,
-                        item_name=item.name,
-                        price=item.price,
-                        quantity=qty,
+                        item_id=line.item_id,
+                        item_name=line.item_name,
+                        price=line.unit_price,
+                        quantity=line.quantity,
                         subtotal=subtotal,
                     )
                 )
@@ -139,4 +273,5 @@ class OrderService:
                     )
                 )
 
-            return details, total_price
\ No newline at end of file
+            return details, total_price
+
@@ -0,0 +1,22 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from wapang.settings import SETTINGS
+
+
+class OrderSettings(BaseSettings):
+    # 켜면 POST /api/orders 는 요청을 검증해 대기열에 넣고 202 를 돌려주며, 백그라운드 워커가 묶음으로 처리합니다.
+    # 클라이언트는 GET /api/orders/{order_id} 로 PENDING 에서 ORDERED 또는 REJECTED 로 바뀌는 것을 확인합니다.
+    queue_enabled: bool = False
+    queue_workers: int = 1
+    queue_batch_size: int = 100
+    # 대기열이 비었을 때 다시 확인할 때까지 기다리는 시간
+    queue_poll_interval_seconds: float = 0.05
+
+    model_config = SettingsConfigDict(
+        case_sensitive=False,
+        env_prefix="ORDER_",
+        env_file=SETTINGS.env_file,
+        extra='ignore'
+    )
+
+
+ORDER_SETTINGS = OrderSettings()
@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import String, Integer, ForeignKey
+from sqlalchemy import Index, String, Integer, ForeignKey
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from wapang.database.common import Base
 
@@ -9,6 +9,11 @@ from wapang.app.items.models import Item
 
 class Review(Base):
     __tablename__ = "review"
+    # 상품별 리뷰 목록, 내 리뷰 목록과 (사용자, 상품) 중복 리뷰 확인에 사용합니다.
+    __table_args__ = (
+        Index("ix_review_item_id_id", "item_id", "id"),
+        Index("ix_review_user_id_item_id", "user_id", "item_id"),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     rating: Mapped[int] = mapped_column(Integer, nullable=False)
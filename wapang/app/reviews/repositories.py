@@ -2,13 +2,15 @@ from typing import Annotated
 import uuid
 
 from fastapi import Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, selectinload
 from sqlalchemy import select
 from wapang.app.reviews.models import Review
-from wapang.database.connection import get_db_session
+from wapang.cache.invalidation import invalidate, review_tags
+from wapang.database.connection import get_db_session, get_replica_db_session, get_async_db_session
 
 class ReviewRepository:
-    def __init__(self, session: Annotated[Session, Depends(get_db_session)]) -> None:
+    def __init__(self, session: Annotated[Session, Depends(get_db_session, scope="function")]) -> None:
         self.session = session
 
     def create_review(self, review: Review) -> None:
@@ -16,7 +18,9 @@ class ReviewRepository:
         self.session.flush()
 
     def get_review_by_id(self, review_id: str) -> Review | None:
-        return self.session.scalar(select(Review).where(Review.id == review_id))
+        return self.session.scalar(
+            select(Review).where(Review.id == review_id).options(joinedload(Review.user))
+        )
     
     def update_review(self, review: Review) -> None:
         self.session.merge(review)
@@ -26,10 +30,60 @@ class ReviewRepository:
         self.session.delete(review)
 
     def get_reviews_by_user_id(self, user_id: str) -> list[Review]:
-        return list(self.session.scalars(select(Review).where(Review.user_id == user_id)).all())
+        # 응답에 상품 이름이 필요하므로 상품을 함께 불러와 N+1 을 피합니다.
+        return list(self.session.scalars(
+            select(Review).where(Review.user_id == user_id).options(selectinload(Review.item))
+        ).all())
     
     def get_review_by_user_and_item(self, user_id: str, item_id: str) -> Review | None:
         return self.session.scalar(select(Review).where(Review.user_id == user_id, Review.item_id == item_id))
     
     def get_reviews_by_item_id(self, item_id: str) -> list[Review]:
-        return list(self.session.scalars(select(Review).where(Review.item_id == item_id)).all())
\ No newline at end of file
+        # 응답에 작성자 닉네임이 필요하므로 작성자를 함께 불러와 N+1 을 피합니다.
+        return list(self.session.scalars(
+            select(Review).where(Review.item_id == item_id).options(selectinload(Review.user))
+        ).all())
+
+    def invalidate_cached_review(self, review: Review) -> None:
+        invalidate(self.session, review_tags(review.id, review.item_id))
+
+
+
+class ReplicaReviewRepository(ReviewRepository):
+    # 읽기 전용 복제본에 연결된 세션을 사용합니다. 조회 라우트에서만 사용하세요.
+    def __init__(self, session: Annotated[Session, Depends(get_replica_db_session, scope="function")]) -> None:
+        super().__init__(session)
+
+class AsyncReviewRepository:
+    # 비동기 세션에서는 지연 로딩을 쓸 수 없으므로 응답에 필요한 관계를 함께 불러옵니다.
+    def __init__(self, session: Annotated[AsyncSession, Depends(get_async_db_session, scope="function")]) -> None:
+        self.session = session
+
+    async def create_review(self, review: Review) -> None:
+        self.session.add(review)
+        await self.session.flush()
+
+    async def get_review_by_id(self, review_id: str) -> Review | None:
+        return await self.session.scalar(
+            select(Review).where(Review.id == review_id).options(selectinload(Review.user))
+        )
+
+    async def update_review(self, review: Review) -> None:
+        await self.session.merge(review)
+        await self.session.flush()
+
+    async def delete_review(self, review: Review) -> None:
+        await self.session.delete(review)
+
+    async def get_reviews_by_user_id(self, user_id: str) -> list[Review]:
+        return list((await self.session.scalars(
+            select(Review).where(Review.user_id == user_id).options(selectinload(Review.item))
+        )).all())
+
+    async def get_review_by_user_and_item(self, user_id: str, item_id: str) -> Review | None:
+        return await self.session.scalar(select(Review).where(Review.user_id == user_id, Review.item_id == item_id))
+
+    async def get_reviews_by_item_id(self, item_id: str) -> list[Review]:
+        return list((await self.session.scalars(
+            select(Review).where(Review.item_id == item_id).options(selectinload(Review.user))
+        )).all())
\ No newline at end of file
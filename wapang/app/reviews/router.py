@@ -1,13 +1,15 @@
 from typing import Annotated
 from fastapi import APIRouter, Depends, Query
 
-from wapang.app.auth.utils import login_with_header, login_with_header_optional
+from wapang.app.auth.utils import login_with_header, login_with_header_optional, async_login_with_header_optional
 from wapang.app.reviews.schemas import ReviewUpdateRequest, ReviewResponse
-from wapang.app.reviews.services import ReviewService
+from wapang.app.reviews.services import ReviewService, ReplicaReviewService, AsyncReviewService
 from wapang.app.users.models import User
 
 
 review_router = APIRouter()
+# DB_ASYNC_ENABLED 일 때 동기 라우트보다 먼저 등록되는 비동기 라우트입니다.
+async_review_router = APIRouter()
 
 @review_router.get("/{review_id}", status_code=200, 
                      response_model=ReviewResponse,
@@ -15,7 +17,7 @@ review_router = APIRouter()
 def get_review(
     review_id: str,
     user: Annotated[User | None, Depends(login_with_header_optional)],
-    review_service: Annotated[ReviewService, Depends()],
+    review_service: Annotated[ReviewService, Depends(ReplicaReviewService)],
 ) -> ReviewResponse:
     review = review_service.get_review(review_id)
     return ReviewResponse(
@@ -51,3 +53,22 @@ def delete_review(
     review_service: Annotated[ReviewService, Depends()],
 ):
     review_service.delete_review(review_id, user)
+
+
+@async_review_router.get("/{review_id}", status_code=200,
+                         response_model=ReviewResponse,
+                         response_model_exclude_none=True)
+async def async_get_review(
+    review_id: str,
+    user: Annotated[User | None, Depends(async_login_with_header_optional)],
+    review_service: Annotated[AsyncReviewService, Depends()],
+) -> ReviewResponse:
+    review = await review_service.get_review(review_id)
+    return ReviewResponse(
+        review_id=review.id,
+        item_id=review.item_id,
+        writer_nickname=review.user.nickname or "",
+        is_writer=(review.user_id == user.id) if user is not None else None,
+        rating=review.rating,
+        comment=review.comment,
+    )
@@ -2,11 +2,11 @@ from typing import Annotated
 
 from fastapi import Depends
 from wapang.app.items.exceptions import ItemNotFoundError
-from wapang.app.items.repositories import ItemRepository
+from wapang.app.items.repositories import ItemRepository, ReplicaItemRepository, AsyncItemRepository
 from wapang.app.reviews.schemas import ReviewCreateRequest, ReviewUpdateRequest
 from wapang.app.users.models import User
 from wapang.app.reviews.models import Review
-from wapang.app.reviews.repositories import ReviewRepository
+from wapang.app.reviews.repositories import ReviewRepository, ReplicaReviewRepository, AsyncReviewRepository
 from wapang.app.reviews.exceptions import ReviewNotFoundError, ReviewNotOwnedError, ReviewAlreadyExistsError
 from wapang.app.users.exceptions import NicknameNotSetError
 from wapang.common.exceptions import InvalidFormatException
@@ -31,6 +31,7 @@ class ReviewService:
         
         review = Review(user_id=user.id, item_id=item_id, rating=request.rating, comment=request.comment)
         self.review_repository.create_review(review)
+        self.review_repository.invalidate_cached_review(review)
         return review
 
     def get_review(self, review_id: str) -> Review:
@@ -57,6 +58,7 @@ class ReviewService:
             setattr(review, key, value)
 
         self.review_repository.update_review(review)
+        self.review_repository.invalidate_cached_review(review)
         return review
     
     def delete_review(self, review_id: str, user: User) -> None:
@@ -69,6 +71,7 @@ class ReviewService:
             raise ReviewNotOwnedError()
 
         self.review_repository.delete_review(review)
+        self.review_repository.invalidate_cached_review(review)
 
     def get_reviews_by_user(self, user_id: str) -> list[Review]:
         return self.review_repository.get_reviews_by_user_id(user_id)
@@ -76,4 +79,34 @@ class ReviewService:
     def get_reviews_by_item(self, item_id: str) -> list[Review]:
         if self.item_repository.get_item_by_id(item_id) is None:
             raise ItemNotFoundError()
-        return self.review_repository.get_reviews_by_item_id(item_id)
\ No newline at end of file
+        return self.review_repository.get_reviews_by_item_id(item_id)
+
+
+
+class ReplicaReviewService(ReviewService):
+    def __init__(self,
+                 review_repository: Annotated[ReplicaReviewRepository, Depends()],
+                 item_repository: Annotated[ReplicaItemRepository, Depends()],
+                 ) -> None:
+        super().__init__(review_repository, item_repository)
+
+class AsyncReviewService:
+    def __init__(self,
+                 review_repository: Annotated[AsyncReviewRepository, Depends()],
+                 item_repository: Annotated[AsyncItemRepository, Depends()],
+                 ) -> None:
+        self.review_repository = review_repository
+        self.item_repository = item_repository
+
+    async def get_review(self, review_id: str) -> Review:
+        review = await self.review_repository.get_review_by_id(review_id)
+
+        if review is None:
+            raise ReviewNotFoundError()
+
+        return review
+
+    async def get_reviews_by_item(self, item_id: str) -> list[Review]:
+        if await self.item_repository.get_item_by_id(item_id) is None:
+            raise ItemNotFoundError()
+        return await self.review_repository.get_reviews_by_item_id(item_id)
\ No newline at end of file
@@ -0,0 +1,251 @@
+import bisect
+import re
+import sys
+import threading
+from typing import Iterable
+
+from sqlalchemy import select
+
+from wapang.app.items.models import Item
+from wapang.app.stores.models import Store
+from wapang.cache.bus import INVALIDATION_BUS
+from wapang.cache.invalidation import SEARCH_TAG_PREFIX
+from wapang.database.connection import get_db_manager
+
+# 밑줄도 단어 구분자로 봅니다 ("초콜릿_1" -> "초콜릿", "1").
+_WORD = re.compile(r"[^\W_]+")
+
+def _words(text: str) -> list[str]:
+    return _WORD.findall(text.lower())
+
+def _query_grams(word: str) -> set[str]:
+    # 한 글자 검색어는 글자 자체로, 나머지는 2-gram 으로 찾습니다.
+    if len(word) == 1:
+        return {word}
+    return {word[i:i + 2] for i in range(len(word) - 1)}
+
+def _document_grams(name: str) -> set[str]:
+    grams: set[str] = set()
+    for word in _words(name):
+        grams.update(word)
+        grams.update(_query_grams(word))
+    return grams
+
+
+class InvertedIndex:
+    # 상품 이름의 1/2-gram -> 상품 id 역색인입니다. 띄어쓰기가 없는 한글 이름도 부분 문자열로 찾을 수 있습니다.
+    # 워커 프로세스마다 하나씩 두고, lifespan 에서 만든 뒤 ItemService 의 쓰기에서 갱신합니다.
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._postings: dict[str, set[str]] = {}
+        self._names: dict[str, str] = {}
+        self._words: dict[str, tuple[str, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._postings.clear()
+            self._names.clear()
+            self._words.clear()
+
+    def build(self, rows: Iterable[tuple[str, str]]) -> None:
+        self.clear()
+        for item_id, name in rows:
+            self.add(item_id, name)
+
+    def add(self, item_id: str, name: str) -> None:
+        with self._lock:
+            self._remove(item_id)
+            self._names[item_id] = name.lower()
+            self._words[item_id] = tuple(_words(name))
+            for gram in _document_grams(name):
+                self._postings.setdefault(gram, set()).add(item_id)
+
+    def remove(self, item_id: str) -> None:
+        with self._lock:
+            self._remove(item_id)
+
+    def _remove(self, item_id: str) -> None:
+        name = self._names.pop(item_id, None)
+        if name is None:
+            return
+        del self._words[item_id]
+        for gram in _document_grams(name):
+            posting = self._postings.get(gram)
+            if posting is not None:
+                posting.discard(item_id)
+                if not posting:
+                    del self._postings[gram]
+
+    def search(self, query: str) -> list[tuple[str, float]]:
+        # (상품 id, 점수) 를 점수 내림차순, id 오름차순으로 반환합니다.
+        words = _words(query)
+        if not words:
+            return []
+        grams = set().union(*(_query_grams(word) for word in words))
+        with self._lock:
+            postings = sorted((self._postings.get(gram, set()) for gram in grams), key=len)
+            candidates = set(postings[0]).intersection(*postings[1:])
+            documents = [(item_id, self._names[item_id], self._words[item_id]) for item_id in candidates]
+
+        results: list[tuple[str, float]] = []
+        for item_id, name, name_words in documents:
+            # 2-gram 이 모두 있어도 이어져 있지 않을 수 있으므로 부분 문자열인지 다시 확인합니다.
+            if all(word in name for word in words):
+                results.append((item_id, score(name, name_words, words)))
+        results.sort(key=lambda result: (-result[1], result[0]))
+        return results
+
+
+def matches(name: str, query: str) -> bool:
+    name = name.lower()
+    return all(word in name for word in _words(query))
+
+def score(name: str, name_words: Iterable[str], words: list[str]) -> float:
+    # 단어 전체 일치 > 단어 앞부분 일치 > 부분 일치 순으로 점수를 주고,
+    # 같은 점수라면 검색어가 이름에서 차지하는 비율이 큰(더 짧은) 이름을 앞에 둡니다.
+    total = 0.0
+    for word in words:
+        if word in name_words:
+            total += 3
+        elif any(name_word.startswith(word) for name_word in name_words):
+            total += 2
+        else:
+            total += 1
+    coverage = sum(len(word) for word in words) / max(len(name), 1)
+    return round(total + min(coverage, 1.0), 6)
+
+
+def _prefix_keys(name: str, max_length: int) -> set[str]:
+    # 이름 전체와, 이름 안의 각 단어에서 시작하는 꼬리를 키로 씁니다 ("다크 초콜릿" -> "다크 초콜릿", "초콜릿").
+    name = name.lower()
+    return {name[match.start():match.start() + max_length] for match in _WORD.finditer(name)} \
+        | {name[:max_length]}
+
+
+class PrefixIndex:
+    # (키, 종류, id) 를 정렬된 배열로 두고 이분 탐색으로 접두어 자동완성을 합니다.
+    # 키는 max_key_length 글자까지만 저장하고, 키 개수가 max_entries 를 넘으면 더 색인하지 않아 메모리 사용량에 상한이 있습니다.
+    def __init__(self, max_key_length: int = 20, max_entries: int = 1_000_000) -> None:
+        self.max_key_length = max_key_length
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: list[tuple[str, str, str]] = []
+        self._names: dict[tuple[str, str], str] = {}
+        self._key_bytes = 0
+        self._dropped = 0
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._names.clear()
+            self._key_bytes = 0
+            self._dropped = 0
+
+    def build(self, rows: Iterable[tuple[str, str, str]]) -> None:
+        # 한 번에 정렬하므로 add 를 반복하는 것보다 빠릅니다.
+        entries: list[tuple[str, str, str]] = []
+        names: dict[tuple[str, str], str] = {}
+        dropped = 0
+        for kind, entity_id, name in rows:
+            keys = _prefix_keys(name, self.max_key_length)
+            if len(entries) + len(keys) > self.max_entries:
+                dropped += 1
+                continue
+            names[(kind, entity_id)] = name
+            entries.extend((key, kind, entity_id) for key in keys)
+        entries.sort()
+        with self._lock:
+            self._entries = entries
+            self._names = names
+            self._key_bytes = sum(sys.getsizeof(key) for key, _, _ in entries)
+            self._dropped = dropped
+
+    def add(self, kind: str, entity_id: str, name: str) -> None:
+        keys = _prefix_keys(name, self.max_key_length)
+        with self._lock:
+            self._remove(kind, entity_id)
+            if len(self._entries) + len(keys) > self.max_entries:
+                self._dropped += 1
+                return
+            self._names[(kind, entity_id)] = name
+            for key in keys:
+                bisect.insort(self._entries, (key, kind, entity_id))
+                self._key_bytes += sys.getsizeof(key)
+
+    def remove(self, kind: str, entity_id: str) -> None:
+        with self._lock:
+            self._remove(kind, entity_id)
+
+    def _remove(self, kind: str, entity_id: str) -> None:
+        name = self._names.pop((kind, entity_id), None)
+        if name is None:
+            return
+        for key in _prefix_keys(name, self.max_key_length):
+            entry = (key, kind, entity_id)
+            position = bisect.bisect_left(self._entries, entry)
+            if position < len(self._entries) and self._entries[position] == entry:
+                del self._entries[position]
+                self._key_bytes -= sys.getsizeof(key)
+
+    def suggest(self, prefix: str, limit: int) -> list[tuple[str, str, str]]:
+        # (종류, id, 이름) 을 키 사전순으로 최대 limit 개 반환합니다. 한 이름이 여러 키로 걸려도 한 번만 나옵니다.
+        prefix = prefix.lower()[:self.max_key_length]
+        results: list[tuple[str, str, str]] = []
+        seen: set[tuple[str, str]] = set()
+        with self._lock:
+            position = bisect.bisect_left(self._entries, (prefix,))
+            while position < len(self._entries) and len(results) < limit:
+                key, kind, entity_id = self._entries[position]
+                if not key.startswith(prefix):
+                    break
+                if (kind, entity_id) not in seen:
+                    seen.add((kind, entity_id))
+                    results.append((kind, entity_id, self._names[(kind, entity_id)]))
+                position += 1
+        return results
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            entries = len(self._entries)
+            # 정렬 배열, (키, 종류, id) 튜플, 키 문자열의 크기입니다. 종류와 id 문자열은 모델 객체와 공유하므로 세지 않습니다.
+            approx_bytes = sys.getsizeof(self._entries) + entries * sys.getsizeof(("", "", "")) + self._key_bytes \
+                + sys.getsizeof(self._names)
+            return dict(names=len(self._names), entries=entries, max_entries=self.max_entries,
+                        dropped=self._dropped, approx_bytes=approx_bytes)
+
+
+ITEM_NAME_INDEX = InvertedIndex()
+SUGGESTION_INDEX = PrefixIndex()
+
+def _on_invalidation(tags: list[str]) -> None:
+    # 이 워커와 다른 워커에서 커밋된 상품/상점 이름 변경이 무효화 버스로 들어옵니다.
+    for tag in tags:
+        if not tag.startswith(SEARCH_TAG_PREFIX):
+            continue
+        kind, entity_id, *name = tag[len(SEARCH_TAG_PREFIX):].split(":", 2)
+        if kind == "item":
+            if name:
+                ITEM_NAME_INDEX.add(entity_id, name[0])
+            else:
+                ITEM_NAME_INDEX.remove(entity_id)
+        if name:
+            SUGGESTION_INDEX.add(kind, entity_id, name[0])
+        else:
+            SUGGESTION_INDEX.remove(kind, entity_id)
+
+INVALIDATION_BUS.subscribe(_on_invalidation)
+
+def build_search_indexes() -> None:
+    # lifespan 에서 한 번 호출합니다. 이름과 id 만 읽으므로 큰 카탈로그에서도 가볍게 만들 수 있습니다.
+    with get_db_manager().replica_session_factory() as session:
+        items = session.execute(select(Item.id, Item.name)).tuples().all()
+        stores = session.execute(select(Store.id, Store.name)).tuples().all()
+    ITEM_NAME_INDEX.build(items)
+    SUGGESTION_INDEX.build([("item", item_id, name) for item_id, name in items]
+                           + [("store", store_id, name) for store_id, name in stores])
@@ -0,0 +1,14 @@
+from typing import Annotated
+from fastapi import APIRouter, Depends, Query
+
+from wapang.app.search.schemas import SuggestionQueryParams, SuggestionResponse
+from wapang.app.search.services import SearchService
+
+search_router = APIRouter()
+
+@search_router.get("/suggest", status_code=200)
+async def suggest(
+    query_params: Annotated[SuggestionQueryParams, Query()],
+    search_service: Annotated[SearchService, Depends()],
+) -> list[SuggestionResponse]:
+    return search_service.suggest(query_params)
@@ -0,0 +1,36 @@
+from typing import Annotated, Literal
+from pydantic import BaseModel
+from pydantic.functional_validators import AfterValidator
+
+from wapang.common.exceptions import InvalidFormatException
+
+def validate_prefix(v: str) -> str:
+    v = v.strip()
+    if not v or len(v) > 20:
+        raise InvalidFormatException()
+    return v
+
+def validate_suggestion_limit(v: int) -> int:
+    if v < 1 or v > 20:
+        raise InvalidFormatException()
+    return v
+
+class SuggestionQueryParams(BaseModel):
+    prefix: Annotated[str, AfterValidator(validate_prefix)]
+    limit: Annotated[int, AfterValidator(validate_suggestion_limit)] = 10
+
+class SuggestionResponse(BaseModel):
+    type: Literal["item", "store"]
+    id: str
+    name: str
+
+class PrefixIndexStatsResponse(BaseModel):
+    names: int
+    entries: int
+    max_entries: int
+    dropped: int
+    approx_bytes: int
+
+class SearchIndexStatsResponse(BaseModel):
+    item_names: int
+    suggestions: PrefixIndexStatsResponse
@@ -0,0 +1,20 @@
+from wapang.app.search.indexes import ITEM_NAME_INDEX, SUGGESTION_INDEX
+from wapang.app.search.schemas import (
+    PrefixIndexStatsResponse,
+    SearchIndexStatsResponse,
+    SuggestionQueryParams,
+    SuggestionResponse,
+)
+
+class SearchService:
+    # 워커 메모리의 색인만 읽으므로 DB 세션이 필요 없습니다. 색인은 커밋된 이름만 담지만,
+    # 다른 워커의 변경은 무효화 버스로 들어오므로 그 사이에는 바로 전 이름이 나올 수 있습니다.
+    def suggest(self, query_params: SuggestionQueryParams) -> list[SuggestionResponse]:
+        return [SuggestionResponse(type=kind, id=entity_id, name=name)
+                for kind, entity_id, name in SUGGESTION_INDEX.suggest(query_params.prefix, query_params.limit)]
+
+    def get_stats(self) -> SearchIndexStatsResponse:
+        return SearchIndexStatsResponse(
+            item_names=len(ITEM_NAME_INDEX),
+            suggestions=PrefixIndexStatsResponse(**SUGGESTION_INDEX.stats())
+        )
@@ -1,7 +1,7 @@
 import uuid
 from sqlalchemy import Integer, String, ForeignKey
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from wapang.database.common import Base
+from wapang.database.common import Base, LAZY_LOADING
 
 from wapang.app.users.models import User
 
@@ -13,10 +13,10 @@ class Store(Base):
     name: Mapped[str] = mapped_column(String(100), unique=True)
     address: Mapped[str] = mapped_column(String(100))
     email: Mapped[str] = mapped_column(String(100), unique=True)
-    phone_number: Mapped[str] = mapped_column(String(20))
+    phone_number: Mapped[str] = mapped_column(String(20), index=True)
     delivery_fee: Mapped[int] = mapped_column(Integer)
 
-    owner_id: Mapped[str] = mapped_column(ForeignKey("user.id"))
-    owner: Mapped[User] = relationship("User", back_populates="stores")
+    owner_id: Mapped[str] = mapped_column(ForeignKey("user.id"), index=True)
+    owner: Mapped[User] = relationship("User", back_populates="stores", lazy=LAZY_LOADING)
     
-    items = relationship("Item", back_populates="store", cascade="all, delete-orphan")
\ No newline at end of file
+    items = relationship("Item", back_populates="store", cascade="all, delete-orphan", lazy=LAZY_LOADING)
\ No newline at end of file
@@ -2,13 +2,18 @@ from typing import Annotated
 import uuid
 
 from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy import select
 from wapang.app.stores.models import Store
-from wapang.database.connection import get_db_session
+from wapang.cache.backends import CATALOG_CACHE
+from wapang.cache.catalog import caches_replica_reads, store_key
+from wapang.cache.snapshots import restore, snapshot
+from wapang.cache.invalidation import invalidate, reindex_after_commit, store_tags
+from wapang.database.connection import get_db_session, get_replica_db_session, get_async_db_session
 
 class StoreRepository:
-    def __init__(self, session: Annotated[Session, Depends(get_db_session)]) -> None:
+    def __init__(self, session: Annotated[Session, Depends(get_db_session, scope="function")]) -> None:
         self.session = session
 
     def create_store(self, store: Store) -> None:
@@ -35,4 +40,68 @@ class StoreRepository:
         return self.session.scalar(select(Store).where(Store.phone_number == phone_number))
     
     def get_store_by_user_id(self, user_id: str) -> Store | None:
-        return self.session.scalar(select(Store).where(Store.owner_id == user_id))
\ No newline at end of file
+        return self.session.scalar(select(Store).where(Store.owner_id == user_id))
+
+    def invalidate_cached_store(self, store_id: str) -> None:
+        invalidate(self.session, store_tags(store_id))
+
+    def reindex_store(self, store_id: str, name: str) -> None:
+        reindex_after_commit(self.session, "store", store_id, name)
+
+
+
+class ReplicaStoreRepository(StoreRepository):
+    # 읽기 전용 복제본에 연결된 세션을 사용합니다. 조회 라우트에서만 사용하세요.
+    # id 로 조회한 상점은 캐시를 거쳐 읽으므로 캐시에서 나온 상점은 세션에 속하지 않습니다 (caches_replica_reads 참고).
+    def __init__(self, session: Annotated[Session, Depends(get_replica_db_session, scope="function")]) -> None:
+        super().__init__(session)
+
+    def get_store_by_id(self, store_id: str) -> Store | None:
+        if not caches_replica_reads():
+            return super().get_store_by_id(store_id)
+        cached = CATALOG_CACHE.get(store_key(store_id))
+        if cached is not None:
+            return restore(Store, cached)
+        generation = CATALOG_CACHE.generation()
+        store = super().get_store_by_id(store_id)
+        # 없는 상점은 캐시하지 않습니다. 곧 만들어질 수 있기 때문입니다.
+        if store is not None:
+            CATALOG_CACHE.set(store_key(store_id), snapshot(store), store_tags(store_id), generation)
+        return store
+
+class AsyncStoreRepository:
+    def __init__(self, session: Annotated[AsyncSession, Depends(get_async_db_session, scope="function")]) -> None:
+        self.session = session
+
+    async def create_store(self, store: Store) -> None:
+        self.session.add(store)
+        await self.session.flush()
+
+    async def update_store(self, store: Store) -> None:
+        await self.session.merge(store)
+        await self.session.flush()
+
+    async def get_store_by_id(self, store_id: str) -> Store | None:
+        cached = CATALOG_CACHE.get(store_key(store_id))
+        if cached is not None:
+            return restore(Store, cached)
+        generation = CATALOG_CACHE.generation()
+        store = await self.session.scalar(select(Store).where(Store.id == store_id))
+        if store is not None:
+            CATALOG_CACHE.set(store_key(store_id), snapshot(store), store_tags(store_id), generation)
+        return store
+
+    async def get_store_by_owner_id(self, owner_id: str) -> Store | None:
+        return await self.session.scalar(select(Store).where(Store.owner_id == owner_id))
+
+    async def get_store_by_store_name(self, store_name: str) -> Store | None:
+        return await self.session.scalar(select(Store).where(Store.name == store_name))
+
+    async def get_store_by_email(self, email: str) -> Store | None:
+        return await self.session.scalar(select(Store).where(Store.email == email))
+
+    async def get_store_by_phone_number(self, phone_number: str) -> Store | None:
+        return await self.session.scalar(select(Store).where(Store.phone_number == phone_number))
+
+    async def get_store_by_user_id(self, user_id: str) -> Store | None:
+        return await self.session.scalar(select(Store).where(Store.owner_id == user_id))
\ No newline at end of file
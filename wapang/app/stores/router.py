@@ -1,15 +1,17 @@
 from typing import Annotated
 from fastapi import APIRouter, Depends
 
-from wapang.app.items.services import ItemService
+from wapang.app.items.services import ItemService, ReplicaItemService, AsyncItemService
 from wapang.app.stores.models import Store
 from wapang.app.users.models import User
-from wapang.app.stores.services import StoreService
+from wapang.app.stores.services import StoreService, ReplicaStoreService, AsyncStoreService
 from wapang.app.stores.schemas import StoreCreateRequest, StoreUpdateRequest, StoreResponse
 from wapang.app.items.schemas import ItemResponse
 from wapang.app.auth.utils import login_with_header
 
 store_router = APIRouter()
+# DB_ASYNC_ENABLED 일 때 동기 라우트보다 먼저 등록되는 비동기 라우트입니다.
+async_store_router = APIRouter()
 
 @store_router.post("/", status_code=201)
 def create_store(
@@ -48,7 +50,7 @@ def update_store(
 @store_router.get("/{store_id}", status_code=200)
 def get_store(
     store_id: str,
-    store_service: Annotated[StoreService, Depends()]
+    store_service: Annotated[StoreService, Depends(ReplicaStoreService)]
 ) -> StoreResponse:
     store = store_service.get_store_by_id(store_id=store_id)
     return StoreResponse(
@@ -63,7 +65,7 @@ def get_store(
 @store_router.get("/{store_id}/items", status_code=200)
 def get_store_items(
     store_id: str,
-    item_service: Annotated[ItemService, Depends()]
+    item_service: Annotated[ItemService, Depends(ReplicaItemService)]
 ) -> list[ItemResponse]:
     items = item_service.get_store_items(store_id=store_id)
     return [ItemResponse(
@@ -71,4 +73,33 @@ def get_store_items(
         item_name=item.name,
         price=item.price,
         stock=item.stock
-    ) for item in items]
\ No newline at end of file
+    ) for item in items]
+
+
+@async_store_router.get("/{store_id}", status_code=200)
+async def async_get_store(
+    store_id: str,
+    store_service: Annotated[AsyncStoreService, Depends()]
+) -> StoreResponse:
+    store = await store_service.get_store_by_id(store_id=store_id)
+    return StoreResponse(
+        id=store.id,
+        store_name=store.name,
+        address=store.address,
+        email=store.email,
+        phone_number=store.phone_number,
+        delivery_fee=store.delivery_fee,
+    )
+
+@async_store_router.get("/{store_id}/items", status_code=200)
+async def async_get_store_items(
+    store_id: str,
+    item_service: Annotated[AsyncItemService, Depends()]
+) -> list[ItemResponse]:
+    items = await item_service.get_store_items(store_id=store_id)
+    return [ItemResponse(
+        id=item.id,
+        item_name=item.name,
+        price=item.price,
+        stock=item.stock
+    ) for item in items]
@@ -6,7 +6,7 @@ from wapang.app.stores.exceptions import StoreNotFoundError, StoreNotOwnedError,
 from wapang.app.stores.schemas import StoreCreateRequest, StoreUpdateRequest
 from wapang.app.users.models import User
 from wapang.app.stores.models import Store
-from wapang.app.stores.repositories import StoreRepository
+from wapang.app.stores.repositories import StoreRepository, ReplicaStoreRepository, AsyncStoreRepository
 from wapang.app.stores.exceptions import StoreAlreadyExistsError, StoreInfoConflictError
 
 class StoreService:
@@ -32,6 +32,7 @@ class StoreService:
         )
 
         self.store_repository.create_store(store)
+        self.store_repository.reindex_store(store.id, store.name)
         return store
 
     def update_store(self, user: User, store_id: str, request: StoreUpdateRequest) -> Store:
@@ -63,10 +64,29 @@ class StoreService:
         for key, value in data.items():
             setattr(store, key, value)
         self.store_repository.update_store(store)
+        self.store_repository.invalidate_cached_store(store.id)
+        if request.store_name is not None:
+            self.store_repository.reindex_store(store.id, store.name)
         return store
     
     def get_store_by_id(self, store_id: str) -> Store:
         store = self.store_repository.get_store_by_id(store_id)
+        if not store:
+            raise StoreNotFoundError()
+        return store
+
+
+
+class ReplicaStoreService(StoreService):
+    def __init__(self, store_repository: Annotated[ReplicaStoreRepository, Depends()]) -> None:
+        super().__init__(store_repository)
+
+class AsyncStoreService:
+    def __init__(self, store_repository: Annotated[AsyncStoreRepository, Depends()]) -> None:
+        self.store_repository = store_repository
+
+    async def get_store_by_id(self, store_id: str) -> Store:
+        store = await self.store_repository.get_store_by_id(store_id)
         if not store:
             raise StoreNotFoundError()
         return store
\ No newline at end of file
@@ -10,7 +10,7 @@ class User(Base):
     id: Mapped[str] = mapped_column(String(36), primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
     email: Mapped[str] = mapped_column(String(100), unique=True, index=True)
     hashed_password: Mapped[str] = mapped_column(String(100))
-    nickname: Mapped[str | None] = mapped_column(String(30))
+    nickname: Mapped[str | None] = mapped_column(String(30), index=True)
     address: Mapped[str | None] = mapped_column(String(150))
     phone_number: Mapped[str | None] = mapped_column(String(20))
 
@@ -2,13 +2,20 @@ from typing import Annotated
 import uuid
 
 from fastapi import Depends
-from sqlalchemy import select
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from wapang.app.users.models import User
-from wapang.database.connection import get_db_session
+from wapang.cache.backends import USER_CACHE
+from wapang.cache.invalidation import invalidate, user_tags
+from wapang.cache.snapshots import restore, snapshot
+from wapang.database.connection import get_db_session, get_async_db_session
+
+# 인증된 사용자 캐시에는 비밀번호 해시를 두지 않습니다. 로그인은 항상 DB 에서 읽습니다.
+_UNCACHED_USER_COLUMNS = {"hashed_password"}
 
 class UserRepository:
-    def __init__(self, session: Annotated[Session, Depends(get_db_session)]) -> None:
+    def __init__(self, session: Annotated[Session, Depends(get_db_session, scope="function")]) -> None:
         self.session = session
 
     def create_user(self, email: str, hashed_password: str) -> User:
@@ -30,5 +37,67 @@ class UserRepository:
     def get_user_by_email(self, email: str) -> User | None:
         return self.session.scalar(select(User).where(User.email == email))
 
+    def get_credentials_by_email(self, email: str) -> tuple[str, str] | None:
+        row = self.session.execute(select(User.id, User.hashed_password).where(User.email == email)).one_or_none()
+        return None if row is None else (row.id, row.hashed_password)
+
+    def update_password(self, user_id: str, hashed_password: str) -> None:
+        self.session.execute(update(User).where(User.id == user_id).values(hashed_password=hashed_password))
+
+    def end_read(self) -> None:
+        # 읽기만 한 트랜잭션을 끝내 커넥션을 풀에 돌려줍니다. 세션의 객체는 만료되므로 필요한 값은 먼저 꺼내 두세요.
+        self.session.rollback()
+
     def get_user_by_nickname(self, nickname: str) -> User | None:
-        return self.session.scalar(select(User).where(User.nickname == nickname))
\ No newline at end of file
+        return self.session.scalar(select(User).where(User.nickname == nickname))
+
+    def get_cached_user_by_id(self, user_id: str) -> User | None:
+        # 캐시에서 나온 사용자는 세션에 속하지 않습니다. 컬럼만 읽고, 수정은 update_user(merge) 로 반영하세요.
+        cached = USER_CACHE.get(f"user:{user_id}")
+        if cached is not None:
+            return restore(User, cached)
+        generation = USER_CACHE.generation()
+        user = self.get_user_by_id(user_id)
+        if user is not None:
+            USER_CACHE.set(f"user:{user_id}", snapshot(user, exclude=_UNCACHED_USER_COLUMNS), user_tags(user_id),
+                           generation)
+        return user
+
+    def invalidate_cached_user(self, user_id: str) -> None:
+        invalidate(self.session, user_tags(user_id))
+
+
+class AsyncUserRepository:
+    def __init__(self, session: Annotated[AsyncSession, Depends(get_async_db_session, scope="function")]) -> None:
+        self.session = session
+
+    async def create_user(self, email: str, hashed_password: str) -> User:
+        user = User(email=email, hashed_password=hashed_password)
+        self.session.add(user)
+        await self.session.flush()
+        return user
+
+    async def update_user(self, user: User) -> User:
+        await self.session.merge(user)
+        await self.session.flush()
+        return user
+
+    async def get_user_by_id(self, user_id: str) -> User | None:
+        return await self.session.scalar(select(User).where(User.id == user_id))
+
+    async def get_cached_user_by_id(self, user_id: str) -> User | None:
+        cached = USER_CACHE.get(f"user:{user_id}")
+        if cached is not None:
+            return restore(User, cached)
+        generation = USER_CACHE.generation()
+        user = await self.get_user_by_id(user_id)
+        if user is not None:
+            USER_CACHE.set(f"user:{user_id}", snapshot(user, exclude=_UNCACHED_USER_COLUMNS), user_tags(user_id),
+                           generation)
+        return user
+
+    async def get_user_by_email(self, email: str) -> User | None:
+        return await self.session.scalar(select(User).where(User.email == email))
+
+    async def get_user_by_nickname(self, nickname: str) -> User | None:
+        return await self.session.scalar(select(User).where(User.nickname == nickname))
\ No newline at end of file
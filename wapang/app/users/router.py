@@ -1,7 +1,7 @@
 from typing import Annotated
 from fastapi import APIRouter, Depends
 
-from wapang.app.auth.utils import login_with_header
+from wapang.app.auth.utils import login_with_header, async_login_with_header
 from wapang.app.users.models import User
 from wapang.app.users.schemas import UserSignupRequest, UserUpdateRequest, UserResponse
 from wapang.app.users.services import UserService
@@ -11,13 +11,15 @@ from wapang.app.reviews.services import ReviewService
 from wapang.app.reviews.schemas import ReviewUserResponse
 
 user_router = APIRouter()
+# DB_ASYNC_ENABLED 일 때 동기 라우트보다 먼저 등록되는 비동기 라우트입니다.
+async_user_router = APIRouter()
 
 
 @user_router.post("/", status_code=201)
-def signup(
+async def signup(
     signup_request: UserSignupRequest, user_service: Annotated[UserService, Depends()]
 ) -> UserResponse:
-    user = user_service.create_user(
+    user = await user_service.create_user(
         signup_request.email, signup_request.password,
     )
     return UserResponse(
@@ -66,4 +68,11 @@ def get_my_reviews(
         item_name=review.item.name,
         rating=review.rating,
         comment=review.comment,
-    ) for review in reviews]
\ No newline at end of file
+    ) for review in reviews]
+
+
+@async_user_router.get("/me", status_code=200)
+async def async_get_me(
+    user: Annotated[User, Depends(async_login_with_header)],
+) -> UserResponse:
+    return UserResponse.model_validate(user)
@@ -1,9 +1,10 @@
 from typing import Annotated
-from argon2 import PasswordHasher
 
 from fastapi import Depends
+from fastapi.concurrency import run_in_threadpool
+from wapang.app.auth.hashing import hash_password
 from wapang.app.users.models import User
-from wapang.app.users.repositories import UserRepository
+from wapang.app.users.repositories import UserRepository, AsyncUserRepository
 from wapang.app.users.exceptions import EmailAlreadyExistsException
 from wapang.app.users.schemas import UserUpdateRequest
 from wapang.common.exceptions import InvalidFormatException
@@ -12,13 +13,20 @@ class UserService:
     def __init__(self, user_repository: Annotated[UserRepository, Depends()]) -> None:
         self.user_repository = user_repository
 
-    def create_user(self, email: str, password: str) -> User:        
-        if self.user_repository.get_user_by_email(email):
+    def _email_exists(self, email: str) -> bool:
+        exists = self.user_repository.get_credentials_by_email(email) is not None
+        self.user_repository.end_read()
+        return exists
+
+    async def create_user(self, email: str, password: str) -> User:
+        # DB 작업은 anyio 스레드 풀에서, 비밀번호 해시는 전용 스레드 풀에서 실행합니다.
+        # 해시 큐에서 기다리는 동안 커넥션을 잡고 있지 않도록 중복 확인 트랜잭션은 해시 전에 끝냅니다.
+        if await run_in_threadpool(self._email_exists, email):
             raise EmailAlreadyExistsException()
 
-        hashed_password = PasswordHasher().hash(password)
+        hashed_password = await hash_password(password)
 
-        return self.user_repository.create_user(email, hashed_password)
+        return await run_in_threadpool(self.user_repository.create_user, email, hashed_password)
 
     def update_user(self, request: UserUpdateRequest, user: User) -> User:
         if not any([request.nickname, request.address, request.phone_number]):
@@ -26,7 +34,22 @@ class UserService:
         for key, value in request.model_dump(exclude_none=True).items():
             setattr(user, key, value)
         self.user_repository.update_user(user)
+        self.user_repository.invalidate_cached_user(user.id)
         return user
 
     def get_user_by_id(self, user_id: str) -> User | None:
-        return self.user_repository.get_user_by_id(user_id)
\ No newline at end of file
+        return self.user_repository.get_user_by_id(user_id)
+
+    def get_authenticated_user(self, user_id: str) -> User | None:
+        return self.user_repository.get_cached_user_by_id(user_id)
+
+
+class AsyncUserService:
+    def __init__(self, user_repository: Annotated[AsyncUserRepository, Depends()]) -> None:
+        self.user_repository = user_repository
+
+    async def get_user_by_id(self, user_id: str) -> User | None:
+        return await self.user_repository.get_user_by_id(user_id)
+
+    async def get_authenticated_user(self, user_id: str) -> User | None:
+        return await self.user_repository.get_cached_user_by_id(user_id)
\ No newline at end of file
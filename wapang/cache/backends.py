@@ -0,0 +1,157 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+import threading
+import time
+from typing import Any, Iterable
+
+from wapang.cache.settings import CACHE_SETTINGS
+
+
+class CacheBackend(ABC):
+    # 키와 태그는 문자열, 값은 직렬화할 수 있는 값(dict, list, 문자열, 숫자, datetime)만 다룹니다.
+    # 그래서 프로세스 밖의 공유 저장소도 같은 인터페이스로 구현할 수 있습니다.
+
+    @abstractmethod
+    def get(self, key: str) -> Any | None:
+        # 없거나 만료되었으면 None 을 반환합니다.
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: Any, tags: Iterable[str], generation: int) -> None:
+        # generation 은 DB 를 읽기 전에 받아 둔 generation() 값입니다.
+        # 그 사이에 무효화가 있었다면 읽은 값이 이미 낡았을 수 있으므로 저장하지 않습니다.
+        ...
+
+    @abstractmethod
+    def generation(self) -> int:
+        ...
+
+    @abstractmethod
+    def invalidate(self, tags: Iterable[str]) -> None:
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+
+    @abstractmethod
+    def stats(self) -> dict[str, int | float]:
+        ...
+
+
+class MemoryCache(CacheBackend):
+    # TTL 이 지난 항목은 읽을 때 버리고, 개수가 max_entries 를 넘으면 가장 오래 쓰지 않은 항목부터 버립니다.
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, Any, tuple[str, ...]]] = OrderedDict()
+        self._tags: dict[str, set[str]] = {}
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value, _ = entry
+            if expires_at <= time.monotonic():
+                self._discard(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any, tags: Iterable[str], generation: int) -> None:
+        tags = tuple(tags)
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._discard(key)
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._discard(next(iter(self._entries)))
+                self.evictions += 1
+
+    def generation(self) -> int:
+        with self._lock:
+            return self._generation
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        with self._lock:
+            self._generation += 1
+            for tag in tags:
+                for key in list(self._tags.get(tag, ())):
+                    self._discard(key)
+                    self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._tags.clear()
+
+    def _discard(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def stats(self) -> dict[str, int | float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return dict(
+                entries=len(self._entries),
+                max_entries=self.max_entries,
+                hits=self.hits,
+                misses=self.misses,
+                hit_ratio=self.hits / lookups if lookups else 0.0,
+                evictions=self.evictions,
+                invalidations=self.invalidations,
+            )
+
+
+class NullCache(CacheBackend):
+    # CACHE_ENABLED=false 일 때 사용합니다. 아무것도 저장하지 않습니다.
+    def get(self, key: str) -> Any | None:
+        return None
+
+    def set(self, key: str, value: Any, tags: Iterable[str], generation: int) -> None:
+        pass
+
+    def generation(self) -> int:
+        return 0
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+    def stats(self) -> dict[str, int | float]:
+        return dict(entries=0, max_entries=0, hits=0, misses=0, hit_ratio=0.0, evictions=0, invalidations=0)
+
+
+def create_cache_backend(max_entries: int, ttl_seconds: float) -> CacheBackend:
+    if not CACHE_SETTINGS.enabled:
+        return NullCache()
+    if CACHE_SETTINGS.backend == "memory":
+        return MemoryCache(max_entries, ttl_seconds)
+    raise ValueError(f"Unknown cache backend: {CACHE_SETTINGS.backend}")
+
+
+CATALOG_CACHE = create_cache_backend(CACHE_SETTINGS.max_entries, CACHE_SETTINGS.ttl_seconds)
+USER_CACHE = create_cache_backend(CACHE_SETTINGS.user_max_entries, CACHE_SETTINGS.user_ttl_seconds)
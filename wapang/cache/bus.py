@@ -0,0 +1,232 @@
+from abc import ABC, abstractmethod
+import glob
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from typing import Callable, Iterable, Iterator
+import uuid
+
+from wapang.cache.settings import CACHE_SETTINGS
+
+logger = logging.getLogger('uvicorn.error')
+
+# 메시지 하나의 최대 크기입니다. 받는 쪽은 이만큼만 읽으므로 태그가 많으면 나눠 보냅니다.
+MAX_MESSAGE_BYTES = 65536
+
+
+class BusTransport(ABC):
+    # 워커끼리 바이트 메시지를 주고받는 방법입니다. 자기 자신이 보낸 메시지를 다시 받아도 됩니다.
+
+    @abstractmethod
+    def start(self, receive: Callable[[bytes], None]) -> None:
+        ...
+
+    @abstractmethod
+    def publish(self, message: bytes) -> None:
+        ...
+
+    @abstractmethod
+    def close(self) -> None:
+        ...
+
+
+class NullTransport(BusTransport):
+    # 워커가 하나뿐일 때 사용합니다.
+    def start(self, receive: Callable[[bytes], None]) -> None:
+        pass
+
+    def publish(self, message: bytes) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class UnixSocketTransport(BusTransport):
+    # 같은 호스트의 워커들이 한 디렉터리에 각자 Unix 데이터그램 소켓을 만들고,
+    # 보낼 때는 디렉터리의 다른 소켓 모두에 보냅니다. 브로커 없이 동작하므로 테스트와 단일 서버 배포에 씁니다.
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self.path: str | None = None
+        self._socket: socket.socket | None = None
+        self._sender: socket.socket | None = None
+        self._thread: threading.Thread | None = None
+        self._closed = False
+
+    def start(self, receive: Callable[[bytes], None]) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        self.path = os.path.join(self.directory, f"{os.getpid()}-{uuid.uuid4().hex[:8]}.sock")
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._socket.bind(self.path)
+        # 받는 쪽 버퍼가 가득 차도 요청 처리가 멈추지 않도록 보내기는 블로킹하지 않습니다.
+        self._sender = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._sender.setblocking(False)
+        self._thread = threading.Thread(target=self._listen, args=(receive,), daemon=True)
+        self._thread.start()
+
+    def _listen(self, receive: Callable[[bytes], None]) -> None:
+        while True:
+            try:
+                message = self._socket.recv(MAX_MESSAGE_BYTES)
+            except OSError:
+                return
+            if self._closed:
+                return
+            try:
+                receive(message)
+            except Exception:
+                logger.exception("Failed to handle cache invalidation message")
+
+    def publish(self, message: bytes) -> None:
+        for path in glob.glob(os.path.join(self.directory, "*.sock")):
+            if path == self.path:
+                continue
+            try:
+                self._sender.sendto(message, path)
+            except (ConnectionRefusedError, FileNotFoundError):
+                # 비정상 종료한 워커가 남긴 소켓 파일입니다.
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+            except OSError as e:
+                # 받는 쪽 버퍼가 가득 찼거나(EAGAIN) 보낼 수 없는 워커가 있어도 나머지 워커에는 계속 보냅니다.
+                logger.warning(f"Cache invalidation to {path} dropped: {e}")
+
+    def close(self) -> None:
+        if self._socket is None:
+            return
+        self._closed = True
+        # recv 에서 기다리는 스레드를 깨웁니다.
+        try:
+            self._sender.sendto(b"", self.path)
+        except OSError:
+            pass
+        self._thread.join(timeout=1)
+        self._socket.close()
+        self._sender.close()
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+        self._socket = None
+
+
+class RedisTransport(BusTransport):
+    # 여러 호스트에 워커가 있을 때 Redis pub/sub 채널로 주고받습니다. redis 패키지가 필요합니다.
+    def __init__(self, url: str, channel: str) -> None:
+        self.url = url
+        self.channel = channel
+        self._client = None
+        self._pubsub = None
+        self._thread = None
+
+    def start(self, receive: Callable[[bytes], None]) -> None:
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("CACHE_BUS=redis requires the 'redis' package") from e
+        self._client = redis.Redis.from_url(self.url)
+        self._pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        self._pubsub.subscribe(**{self.channel: lambda message: receive(message["data"])})
+        self._thread = self._pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+
+    def publish(self, message: bytes) -> None:
+        self._client.publish(self.channel, message)
+
+    def close(self) -> None:
+        if self._client is None:
+            return
+        self._thread.stop()
+        self._pubsub.close()
+        self._client.close()
+        self._client = None
+
+
+class InvalidationBus:
+    # 서비스 계층의 쓰기가 커밋되면 바뀐 엔티티의 태그를 모든 워커에 알립니다.
+    # 각 워커의 캐시는 subscribe 로 등록해 두고, 자기 워커의 쓰기와 다른 워커의 쓰기 모두에서 무효화됩니다.
+    def __init__(self, transport: BusTransport) -> None:
+        self.transport = transport
+        self.origin = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._subscribers: list[Callable[[list[str]], None]] = []
+        self._started = False
+        self.published = 0
+        self.received = 0
+        self.max_latency_ms = 0.0
+
+    def subscribe(self, callback: Callable[[list[str]], None]) -> None:
+        self._subscribers.append(callback)
+
+    def start(self) -> None:
+        if not self._started:
+            self.transport.start(self._receive)
+            self._started = True
+
+    def close(self) -> None:
+        if self._started:
+            self.transport.close()
+            self._started = False
+
+    def invalidate_local(self, tags: Iterable[str]) -> None:
+        tags = list(tags)
+        for callback in self._subscribers:
+            callback(tags)
+
+    def _encode(self, sent_at: float, tags: list[str]) -> bytes:
+        return json.dumps({"origin": self.origin, "sent_at": sent_at, "tags": tags}).encode()
+
+    def _messages(self, tags: list[str]) -> Iterator[bytes]:
+        # 주문 큐 배치처럼 태그가 많으면 MAX_MESSAGE_BYTES 를 넘지 않도록 여러 메시지로 나눕니다.
+        sent_at = time.time()
+        empty_size = len(self._encode(sent_at, []))
+        chunk: list[str] = []
+        size = empty_size
+        for tag in tags:
+            tag_size = len(json.dumps(tag).encode()) + 2
+            if chunk and size + tag_size > MAX_MESSAGE_BYTES:
+                yield self._encode(sent_at, chunk)
+                chunk, size = [], empty_size
+            chunk.append(tag)
+            size += tag_size
+        if chunk:
+            yield self._encode(sent_at, chunk)
+
+    def publish(self, tags: Iterable[str]) -> None:
+        if not self._started:
+            return
+        for message in self._messages(sorted(tags)):
+            try:
+                self.transport.publish(message)
+                self.published += 1
+            except Exception:
+                # 전파에 실패해도 요청은 성공시키고, 다른 워커는 TTL 로 회복합니다.
+                logger.exception("Failed to publish cache invalidation")
+
+    def _receive(self, data: bytes) -> None:
+        message = json.loads(data)
+        if message["origin"] == self.origin:
+            return
+        self.invalidate_local(message["tags"])
+        self.received += 1
+        self.max_latency_ms = max(self.max_latency_ms, (time.time() - message["sent_at"]) * 1000)
+
+    def stats(self) -> dict[str, int | float | str]:
+        return dict(transport=type(self.transport).__name__, published=self.published, received=self.received,
+                    max_latency_ms=self.max_latency_ms)
+
+
+def create_bus_transport() -> BusTransport:
+    if CACHE_SETTINGS.bus == "none":
+        return NullTransport()
+    if CACHE_SETTINGS.bus == "unix":
+        return UnixSocketTransport(CACHE_SETTINGS.bus_path)
+    if CACHE_SETTINGS.bus == "redis":
+        return RedisTransport(CACHE_SETTINGS.bus_redis_url, CACHE_SETTINGS.bus_channel)
+    raise ValueError(f"Unknown cache bus: {CACHE_SETTINGS.bus}")
+
+
+INVALIDATION_BUS = InvalidationBus(create_bus_transport())
@@ -0,0 +1,24 @@
+import json
+from typing import Any
+
+from wapang.database.settings import DB_SETTINGS
+
+# 상품 목록과 상점 조회의 캐시 키입니다. 어떤 태그에 의존하는지는 wapang.cache.invalidation 을 보세요.
+
+def item_list_key(filters: dict[str, Any]) -> str:
+    return "items:" + json.dumps(filters, sort_keys=True, default=str)
+
+def item_list_tags(store_id: str | None, item_ids: list[str] | None) -> list[str]:
+    if item_ids is not None:
+        return [f"item:{item_id}" for item_id in item_ids]
+    if store_id:
+        return [f"items:store:{store_id}"]
+    return ["items:all"]
+
+def store_key(store_id: str) -> str:
+    return f"store:{store_id}"
+
+def caches_replica_reads() -> bool:
+    # 복제본이 따로 있으면, 커밋 뒤 무효화가 끝난 다음에도 복제 지연 동안 예전 행을 읽어 캐시에 다시 넣을 수 있고
+    # 그 값은 TTL 동안 남습니다. 그래서 복제본에서 읽은 값은 캐시하지 않고, 복제본이 primary 일 때만 캐시합니다.
+    return DB_SETTINGS.replica_url is None
@@ -0,0 +1,75 @@
+import hashlib
+from typing import Iterable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from wapang.cache.backends import CATALOG_CACHE, USER_CACHE
+from wapang.cache.bus import INVALIDATION_BUS
+
+INVALIDATION_BUS.subscribe(CATALOG_CACHE.invalidate)
+INVALIDATION_BUS.subscribe(USER_CACHE.invalidate)
+
+# 엔티티가 바뀌었다는 것을 태그로 나타냅니다. 캐시 항목은 자기가 의존하는 태그를 달고 저장됩니다.
+#   item:{id}         상품
+#   items:store:{id}  해당 상점의 상품 목록
+#   items:all         상점으로 거르지 않은 상품 목록
+#   store:{id}        상점
+#   user:{id}         사용자
+#   review:{id}       리뷰
+#   reviews:item:{id} 해당 상품의 리뷰 목록
+#   blocked-token:{d} 차단된 리프레시 토큰 (d 는 토큰의 SHA-256 다이제스트). 캐시가 아니라 차단 목록의 Bloom 필터가 받습니다.
+#   search:{kind}:{id}[:{name}]
+#                     검색 색인에 넣을 상품/상점 이름 (이름이 없으면 색인에서 뺍니다). 캐시가 아니라 검색 색인이 받습니다.
+
+BLOCKED_TOKEN_TAG_PREFIX = "blocked-token:"
+SEARCH_TAG_PREFIX = "search:"
+
+def item_tags(item_id: str, store_id: str) -> list[str]:
+    # 상품 하나가 바뀌면 그 상품이 들어 있거나 새로 들어갈 수 있는 목록이 모두 낡습니다.
+    return [f"item:{item_id}", f"items:store:{store_id}", "items:all"]
+
+def store_tags(store_id: str) -> list[str]:
+    return [f"store:{store_id}"]
+
+def user_tags(user_id: str) -> list[str]:
+    return [f"user:{user_id}"]
+
+def review_tags(review_id: str, item_id: str) -> list[str]:
+    return [f"review:{review_id}", f"reviews:item:{item_id}"]
+
+def token_digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+def blocked_token_tags(token: str) -> list[str]:
+    return [BLOCKED_TOKEN_TAG_PREFIX + token_digest(token).hex()]
+
+
+def search_tag(kind: str, entity_id: str, name: str | None) -> str:
+    tag = f"{SEARCH_TAG_PREFIX}{kind}:{entity_id}"
+    return tag if name is None else f"{tag}:{name}"
+
+
+def invalidate(session: Session, tags: Iterable[str]) -> None:
+    # 이 워커의 캐시는 바로 무효화하고, 커밋 뒤에 한 번 더 무효화하면서 다른 워커에도 알립니다.
+    # 커밋 전에 다른 요청이 예전 값을 읽어 다시 캐시에 넣었더라도 커밋과 함께 지워집니다.
+    tags = list(tags)
+    INVALIDATION_BUS.invalidate_local(tags)
+    session.info.setdefault("cache_tags", set()).update(tags)
+
+def reindex_after_commit(session: Session, kind: str, entity_id: str, name: str | None) -> None:
+    # 검색 색인은 커밋된 이름만 담도록 이 워커에서도 커밋 뒤에 바꿉니다. 한 트랜잭션에서 여러 번 바뀌면 마지막 이름만 씁니다.
+    session.info.setdefault("search_tags", {})[(kind, entity_id)] = search_tag(kind, entity_id, name)
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    tags = session.info.pop("cache_tags", set()) | set(session.info.pop("search_tags", {}).values())
+    if tags:
+        INVALIDATION_BUS.invalidate_local(tags)
+        INVALIDATION_BUS.publish(tags)
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_after_rollback(session: Session, previous_transaction) -> None:
+    # 롤백된 쓰기는 DB 를 바꾸지 않았으므로 다시 무효화하거나 알릴 필요가 없습니다.
+    session.info.pop("cache_tags", None)
+    session.info.pop("search_tags", None)
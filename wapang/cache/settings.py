@@ -0,0 +1,31 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from wapang.settings import SETTINGS
+
+
+class CacheSettings(BaseSettings):
+    # 조회 캐시 (워커 프로세스 단위). 끄면 모든 조회가 DB 로 갑니다.
+    enabled: bool = True
+    backend: str = "memory"
+    ttl_seconds: float = 30
+    max_entries: int = 10_000
+
+    # 인증된 사용자 캐시. 요청마다 토큰의 사용자를 다시 조회하지 않도록 짧게 보관합니다.
+    user_ttl_seconds: float = 60
+    user_max_entries: int = 10_000
+
+    # 워커 간 무효화 전파. 워커가 여러 개라면 "unix"(같은 호스트) 또는 "redis" 를 설정하세요.
+    # 전파를 켜면 다른 워커의 쓰기도 바로 반영되므로 TTL 을 길게 잡아도 됩니다.
+    bus: str = "none"
+    bus_path: str = "/tmp/wapang-cache-bus"
+    bus_redis_url: str = "redis://localhost:6379/0"
+    bus_channel: str = "wapang:cache-invalidation"
+
+    model_config = SettingsConfigDict(
+        case_sensitive=False,
+        env_prefix="CACHE_",
+        env_file=SETTINGS.env_file,
+        extra='ignore'
+    )
+
+
+CACHE_SETTINGS = CacheSettings()
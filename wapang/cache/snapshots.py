@@ -0,0 +1,20 @@
+from typing import Any, Collection, TypeVar
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+from wapang.database.common import Base
+
+ModelT = TypeVar("ModelT", bound=Base)
+
+
+def snapshot(instance: Base, exclude: Collection[str] = ()) -> dict[str, Any]:
+    return {attr.key: getattr(instance, attr.key)
+            for attr in inspect(instance).mapper.column_attrs if attr.key not in exclude}
+
+def restore(model: type[ModelT], values: dict[str, Any]) -> ModelT:
+    # 세션에 속하지 않은(detached) 객체로 만듭니다. 스냅숏에 있는 컬럼만 읽을 수 있고 관계는 불러오지 않습니다.
+    # 세션의 merge 로 넘기면 스냅숏에 있는 컬럼만 덮어씁니다.
+    instance = model(**values)
+    make_transient_to_detached(instance)
+    return instance
@@ -0,0 +1,22 @@
+import base64
+import json
+from typing import Any
+
+from wapang.common.exceptions import InvalidFormatException
+
+
+# 커서는 마지막으로 내려준 행의 정렬 키를 담은 불투명한 문자열입니다.
+# 클라이언트는 내용을 해석하지 않고 다음 요청의 cursor 로 그대로 돌려보내면 됩니다.
+def encode_cursor(sort: str, values: list[Any]) -> str:
+    payload = json.dumps({"sort": sort, "after": values}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, sort: str) -> list[Any]:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError:
+        raise InvalidFormatException()
+    # 다른 정렬 옵션으로 만든 커서는 이어서 쓸 수 없습니다.
+    if not isinstance(payload, dict) or payload.get("sort") != sort or not isinstance(payload.get("after"), list):
+        raise InvalidFormatException()
+    return payload["after"]
@@ -14,6 +14,7 @@ import wapang.app.items.models
 import wapang.app.orders.models
 import wapang.app.reviews.models
 import wapang.app.carts.models
+import wapang.app.idempotency.models
 
 
 from wapang.database.settings import DB_SETTINGS
@@ -0,0 +1,37 @@
+"""item created_at and sort indexes
+
+Revision ID: 14c3cbf07b3b
+Revises: a776103faa4f
+Create Date: 2026-10-18 14:03:27.551902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '14c3cbf07b3b'
+down_revision: Union[str, Sequence[str], None] = 'a776103faa4f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 기존 상품은 마이그레이션 시점으로 채워집니다.
+    op.add_column('item', sa.Column('created_at', sa.DateTime(), server_default=sa.func.now(), nullable=False))
+    op.create_index('ix_item_price_id', 'item', ['price', 'id'], unique=False)
+    op.create_index('ix_item_created_at_id', 'item', ['created_at', 'id'], unique=False)
+    op.create_index('ix_item_store_id_price_id', 'item', ['store_id', 'price', 'id'], unique=False)
+    op.create_index('ix_item_store_id_created_at_id', 'item', ['store_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_item_store_id_created_at_id', table_name='item')
+    op.drop_index('ix_item_store_id_price_id', table_name='item')
+    op.drop_index('ix_item_created_at_id', table_name='item')
+    op.drop_index('ix_item_price_id', table_name='item')
+    op.drop_column('item', 'created_at')
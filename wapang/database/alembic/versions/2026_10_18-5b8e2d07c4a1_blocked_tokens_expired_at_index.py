@@ -0,0 +1,27 @@
+"""blocked tokens expired_at index
+
+Revision ID: 5b8e2d07c4a1
+Revises: f10c6b44ad23
+Create Date: 2026-10-18 19:12:44.208315
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b8e2d07c4a1'
+down_revision: Union[str, Sequence[str], None] = 'f10c6b44ad23'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_blocked_tokens_expired_at'), 'blocked_tokens', ['expired_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_blocked_tokens_expired_at'), table_name='blocked_tokens')
@@ -0,0 +1,38 @@
+"""stock reservation
+
+Revision ID: 6d1f3a9b27e5
+Revises: b2f60d8e4c17
+Create Date: 2026-10-18 23:12:37.845120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6d1f3a9b27e5'
+down_revision: Union[str, Sequence[str], None] = 'b2f60d8e4c17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('stock_reservation',
+    sa.Column('user_id', sa.String(length=36), nullable=False),
+    sa.Column('item_id', sa.String(length=36), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['item_id'], ['item.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'item_id')
+    )
+    op.create_index(op.f('ix_stock_reservation_expires_at'), 'stock_reservation', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_stock_reservation_expires_at'), table_name='stock_reservation')
+    op.drop_table('stock_reservation')
@@ -0,0 +1,36 @@
+"""blocked token digests
+
+Revision ID: 9c41d7e2a6b8
+Revises: 5b8e2d07c4a1
+Create Date: 2026-10-18 20:31:05.617420
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c41d7e2a6b8'
+down_revision: Union[str, Sequence[str], None] = '5b8e2d07c4a1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 새 버전은 이 테이블에만 쓰고, 예전 blocked_tokens 는 행이 모두 만료될 때까지 읽기만 합니다.
+    # 그래서 배포 중 예전 버전이 blocked_tokens 에 넣는 행도 새 버전에서 차단됩니다.
+    op.create_table('blocked_token_digests',
+    sa.Column('token_digest', sa.BINARY(length=32), nullable=False),
+    sa.Column('expired_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('token_digest')
+    )
+    op.create_index(op.f('ix_blocked_token_digests_expired_at'), 'blocked_token_digests', ['expired_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_blocked_token_digests_expired_at'), table_name='blocked_token_digests')
+    op.drop_table('blocked_token_digests')
@@ -0,0 +1,102 @@
+"""order item snapshot
+
+Revision ID: a776103faa4f
+Revises: 0fe71f48c572
+Create Date: 2026-10-18 10:12:41.208331
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a776103faa4f'
+down_revision: Union[str, Sequence[str], None] = '0fe71f48c572'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+order_item = sa.table(
+    'order_item',
+    sa.column('item_id', sa.String),
+    sa.column('item_name', sa.String),
+    sa.column('unit_price', sa.Integer),
+    sa.column('store_id', sa.String),
+    sa.column('store_name', sa.String),
+    sa.column('delivery_fee', sa.Integer),
+)
+item = sa.table(
+    'item',
+    sa.column('id', sa.String),
+    sa.column('name', sa.String),
+    sa.column('price', sa.Integer),
+    sa.column('store_id', sa.String),
+)
+store = sa.table(
+    'store',
+    sa.column('id', sa.String),
+    sa.column('name', sa.String),
+    sa.column('delivery_fee', sa.Integer),
+)
+
+SNAPSHOT_COLUMNS = [
+    ('item_name', sa.String(length=50)),
+    ('unit_price', sa.Integer()),
+    ('store_id', sa.String(length=36)),
+    ('store_name', sa.String(length=100)),
+    ('delivery_fee', sa.Integer()),
+]
+
+
+def _item_id_foreign_key_name() -> str | None:
+    # 초기 마이그레이션에서 이름 없이 만든 외래 키라 DB 가 붙인 이름을 조회합니다.
+    for fk in sa.inspect(op.get_bind()).get_foreign_keys('order_item'):
+        if fk['constrained_columns'] == ['item_id']:
+            return fk['name']
+    return None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 백필 전에는 값이 없으므로 nullable 로 추가한 뒤, 채운 다음 NOT NULL 로 바꿉니다.
+    for name, type_ in SNAPSHOT_COLUMNS:
+        op.add_column('order_item', sa.Column(name, type_, nullable=True))
+
+    # 기존 주문은 주문 시점의 값을 알 수 없으므로 현재 카탈로그 값으로 채웁니다.
+    item_row = item.c.id == order_item.c.item_id
+    store_row = sa.and_(item_row, store.c.id == item.c.store_id)
+    op.execute(
+        order_item.update().values(
+            item_name=sa.select(item.c.name).where(item_row).scalar_subquery(),
+            unit_price=sa.select(item.c.price).where(item_row).scalar_subquery(),
+            store_id=sa.select(item.c.store_id).where(item_row).scalar_subquery(),
+            store_name=sa.select(store.c.name).where(store_row).scalar_subquery(),
+            delivery_fee=sa.select(store.c.delivery_fee).where(store_row).scalar_subquery(),
+        )
+    )
+
+    for name, type_ in SNAPSHOT_COLUMNS:
+        op.alter_column('order_item', name, existing_type=type_, nullable=False)
+
+    # 상품이 삭제되어도 주문 상품은 스냅샷으로 남도록 item_id 를 nullable + ON DELETE SET NULL 로 바꿉니다.
+    fk_name = _item_id_foreign_key_name()
+    if fk_name is not None:
+        op.drop_constraint(fk_name, 'order_item', type_='foreignkey')
+    op.alter_column('order_item', 'item_id', existing_type=sa.String(length=36), nullable=True)
+    op.create_foreign_key(
+        'fk_order_item_item_id', 'order_item', 'item', ['item_id'], ['id'], ondelete='SET NULL'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('fk_order_item_item_id', 'order_item', type_='foreignkey')
+    # 상품이 삭제된 주문 상품은 이전 스키마(item_id NOT NULL)로 표현할 수 없어 지웁니다.
+    op.execute(order_item.delete().where(order_item.c.item_id.is_(None)))
+    op.alter_column('order_item', 'item_id', existing_type=sa.String(length=36), nullable=False)
+    op.create_foreign_key(None, 'order_item', 'item', ['item_id'], ['id'])
+
+    for name, _ in reversed(SNAPSHOT_COLUMNS):
+        op.drop_column('order_item', name)
@@ -0,0 +1,36 @@
+"""order queue
+
+Revision ID: b2f60d8e4c17
+Revises: 3e7a95c1f0d2
+Create Date: 2026-10-18 23:05:52.104937
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2f60d8e4c17'
+down_revision: Union[str, Sequence[str], None] = '3e7a95c1f0d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # order.status 는 String(10) 이므로 PENDING/REJECTED 상태는 스키마 변경 없이 저장됩니다.
+    op.create_table('order_queue',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('order_id', sa.String(length=36), nullable=False),
+    sa.Column('lines', sa.Text(), nullable=False),
+    sa.ForeignKeyConstraint(['order_id'], ['order.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('order_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('order_queue')
@@ -0,0 +1,39 @@
+"""access path indexes
+
+Revision ID: f10c6b44ad23
+Revises: 14c3cbf07b3b
+Create Date: 2026-10-18 16:40:09.731265
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f10c6b44ad23'
+down_revision: Union[str, Sequence[str], None] = '14c3cbf07b3b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_order_user_id_id', 'order', ['user_id', 'id'], unique=False)
+    op.create_index(op.f('ix_order_item_order_id'), 'order_item', ['order_id'], unique=False)
+    op.create_index('ix_review_item_id_id', 'review', ['item_id', 'id'], unique=False)
+    op.create_index('ix_review_user_id_item_id', 'review', ['user_id', 'item_id'], unique=False)
+    op.create_index(op.f('ix_store_owner_id'), 'store', ['owner_id'], unique=False)
+    op.create_index(op.f('ix_store_phone_number'), 'store', ['phone_number'], unique=False)
+    op.create_index(op.f('ix_user_nickname'), 'user', ['nickname'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_user_nickname'), table_name='user')
+    op.drop_index(op.f('ix_store_phone_number'), table_name='store')
+    op.drop_index(op.f('ix_store_owner_id'), table_name='store')
+    op.drop_index('ix_review_user_id_item_id', table_name='review')
+    op.drop_index('ix_review_item_id_id', table_name='review')
+    op.drop_index(op.f('ix_order_item_order_id'), table_name='order_item')
+    op.drop_index('ix_order_user_id_id', table_name='order')
@@ -1,5 +1,12 @@
 from sqlalchemy.orm import DeclarativeBase
 
+from wapang.database.settings import DB_SETTINGS
+
 
 class Base(DeclarativeBase):
-    pass
\ No newline at end of file
+    pass
+
+
+# 관계의 기본 로딩 전략입니다. 응답에 필요한 관계는 리포지토리에서 selectinload/joinedload 로
+# 명시적으로 불러오고, strict_loading 일 때는 숨은 지연 로딩이 SQL 을 실행하는 순간 실패시킵니다.
+LAZY_LOADING = "raise_on_sql" if DB_SETTINGS.strict_loading else "select"
@@ -1,28 +1,182 @@
-from typing import Generator, Any
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session, sessionmaker
+import time
+from typing import AsyncGenerator, Generator, Any
+from sqlalchemy import Engine, create_engine, event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import ORMExecuteState, Session, UOWTransaction, sessionmaker
+from sqlalchemy.pool import QueuePool
 
 from wapang.database.settings import DB_SETTINGS
 
 
+class InstrumentedQueuePool(QueuePool):
+    # QueuePool 에는 커넥션을 기다리기 시작하는 시점의 이벤트가 없으므로
+    # _do_get 을 감싸서 체크아웃 대기 시간과 타임아웃 횟수를 기록합니다.
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.checkout_count = 0
+        self.timeout_count = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.timeout_count += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            self.checkout_count += 1
+            self.total_wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+
+def _create_engine(url: str) -> Engine:
+    return create_engine(
+        url,
+        poolclass=InstrumentedQueuePool,
+        pool_size=DB_SETTINGS.pool_size,
+        max_overflow=DB_SETTINGS.max_overflow,
+        pool_timeout=DB_SETTINGS.pool_timeout,
+        pool_recycle=DB_SETTINGS.pool_recycle,
+        pool_pre_ping=True,
+        echo=False
+    )
+
+
 class DatabaseManager:
     def __init__(self):
-        self.engine = create_engine(
-            DB_SETTINGS.url,
-            pool_recycle=28000,
-            pool_size=10,
+        self.engine = _create_engine(DB_SETTINGS.url)
+        self.session_factory = sessionmaker(bind=self.engine, expire_on_commit=False)
+
+        # 복제본이 없으면 primary 엔진을 그대로 읽기용으로 사용합니다.
+        replica_url = DB_SETTINGS.replica_url
+        self.replica_engine = _create_engine(replica_url) if replica_url else self.engine
+        self.replica_session_factory = sessionmaker(bind=self.replica_engine, expire_on_commit=False)
+
+    def pool_stats(self) -> dict[str, int | float]:
+        pool = self.engine.pool
+        stats: dict[str, int | float] = {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+        }
+        if isinstance(pool, InstrumentedQueuePool):
+            stats.update(
+                checkouts=pool.checkout_count,
+                timeouts=pool.timeout_count,
+                total_wait_ms=pool.total_wait_seconds * 1000,
+                max_wait_ms=pool.max_wait_seconds * 1000,
+            )
+        return stats
+
+    def dispose(self) -> None:
+        self.engine.dispose()
+        if self.replica_engine is not self.engine:
+            self.replica_engine.dispose()
+
+
+class AsyncDatabaseManager:
+    def __init__(self):
+        self.engine = create_async_engine(
+            DB_SETTINGS.async_url,
+            pool_size=DB_SETTINGS.pool_size,
+            max_overflow=DB_SETTINGS.max_overflow,
+            pool_timeout=DB_SETTINGS.pool_timeout,
+            pool_recycle=DB_SETTINGS.pool_recycle,
             pool_pre_ping=True,
             echo=False
         )
-        self.session_factory = sessionmaker(bind=self.engine, expire_on_commit=False)
+        self.session_factory = async_sessionmaker(bind=self.engine, expire_on_commit=False)
+
+    async def dispose(self) -> None:
+        await self.engine.dispose()
+
+
+# 워커 프로세스마다 하나의 엔진(커넥션 풀)만 사용합니다.
+# lifespan 에서 init_db / close_db 로 생성과 정리를 담당합니다.
+_db_manager: DatabaseManager | None = None
+
+def init_db() -> DatabaseManager:
+    global _db_manager
+    if _db_manager is None:
+        _db_manager = DatabaseManager()
+    return _db_manager
+
+def close_db() -> None:
+    global _db_manager
+    if _db_manager is not None:
+        _db_manager.dispose()
+        _db_manager = None
+
+def get_db_manager() -> DatabaseManager:
+    # lifespan 을 거치지 않는 실행 경로(스크립트 등)에서도 동작하도록 지연 생성합니다.
+    return init_db()
 
+# 세션이 실제로 쓰기를 했는지 기록해 두고, 읽기만 한 요청은 커밋을 생략합니다.
+@event.listens_for(Session, "after_flush")
+def _mark_flushed(session: Session, flush_context: UOWTransaction) -> None:
+    session.info["has_writes"] = True
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_dml_executed(orm_execute_state: ORMExecuteState) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["has_writes"] = True
+
+def has_pending_writes(session: Session) -> bool:
+    return session.info.get("has_writes", False) \
+        or bool(session.new or session.dirty or session.deleted)
+
+# Session 은 첫 쿼리가 실행될 때 커넥션을 체크아웃하므로, DB 를 쓰기 전에 실패한 요청은
+# 커넥션을 잡지 않습니다. 라우트에서 Depends(get_db_session, scope="function") 으로 사용하면
+# 응답 직렬화를 기다리지 않고 라우트 함수가 끝나는 즉시 커넥션을 반납합니다.
 def get_db_session() -> Generator[Session, Any, None]:
-    session = DatabaseManager().session_factory()
+    session = get_db_manager().session_factory()
     try:
         yield session
-        session.commit()
+        if has_pending_writes(session):
+            session.commit()
     except Exception as e:
         session.rollback()
         raise e
     finally:
-        session.close()
\ No newline at end of file
+        session.close()
+
+
+def get_replica_db_session() -> Generator[Session, Any, None]:
+    # 읽기 전용 라우트에서 사용합니다. 쓰기가 없으므로 커밋하지 않습니다.
+    session = get_db_manager().replica_session_factory()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+_async_db_manager: AsyncDatabaseManager | None = None
+
+def init_async_db() -> AsyncDatabaseManager:
+    global _async_db_manager
+    if _async_db_manager is None:
+        _async_db_manager = AsyncDatabaseManager()
+    return _async_db_manager
+
+async def close_async_db() -> None:
+    global _async_db_manager
+    if _async_db_manager is not None:
+        await _async_db_manager.dispose()
+        _async_db_manager = None
+
+async def get_async_db_session() -> AsyncGenerator[AsyncSession, None]:
+    session = init_async_db().session_factory()
+    try:
+        yield session
+        if has_pending_writes(session.sync_session):
+            await session.commit()
+    except Exception as e:
+        await session.rollback()
+        raise e
+    finally:
+        await session.close()
\ No newline at end of file
@@ -0,0 +1,62 @@
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator
+
+from sqlalchemy import Engine, event
+
+
+class QueryCollector:
+    # 한 요청(또는 with 블록) 동안 실행된 SQL 문을 모읍니다.
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_seconds = 0.0
+        self.fingerprints: Counter[str] = Counter()
+        self.statements: list[tuple[str, Any]] = []
+
+    def record(self, statement: str, parameters: Any, seconds: float) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        self.fingerprints[fingerprint(statement)] += 1
+        self.statements.append((statement, parameters))
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        return [(fp, n) for fp, n in self.fingerprints.most_common() if n > threshold]
+
+    @property
+    def total_ms(self) -> float:
+        return self.total_seconds * 1000
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.total_ms:.2f};desc="{self.count} queries"'
+
+
+_current_collectors: ContextVar[tuple[QueryCollector, ...]] = ContextVar("query_collectors", default=())
+
+_WHITESPACE = re.compile(r"\s+")
+
+def fingerprint(statement: str) -> str:
+    # SQLAlchemy 가 만든 문장은 이미 파라미터화되어 있으므로 공백만 정규화합니다.
+    return _WHITESPACE.sub(" ", statement).strip()
+
+@contextmanager
+def collect_queries() -> Iterator[QueryCollector]:
+    collector = QueryCollector()
+    token = _current_collectors.set(_current_collectors.get() + (collector,))
+    try:
+        yield collector
+    finally:
+        _current_collectors.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+    for collector in _current_collectors.get():
+        collector.record(statement, parameters, elapsed)
@@ -0,0 +1,28 @@
+import asyncio
+from typing import Callable
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from wapang.common.exceptions import logger
+
+
+def delete_in_batches(session: Session, delete_batch: Callable[[int], int], batch_size: int) -> int:
+    # delete_batch(limit) 가 지운 행 수를 돌려줍니다. 한 번에 batch_size 행씩 지우고 커밋해서
+    # 긴 트랜잭션이나 큰 잠금 없이 테이블을 줄입니다.
+    deleted = 0
+    while True:
+        batch = delete_batch(batch_size)
+        session.commit()
+        deleted += batch
+        if batch < batch_size:
+            return deleted
+
+async def run_periodically(interval_seconds: float, job: Callable[[], None], description: str) -> None:
+    # lifespan 에서 백그라운드 태스크로 실행합니다. 실패해도 다음 주기에 다시 시도합니다.
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await run_in_threadpool(job)
+        except Exception:
+            logger.exception(f"Failed to {description}")
@@ -11,10 +11,41 @@ class DatabaseSettings(BaseSettings):
     password: str
     database: str
 
+    # 커넥션 풀 설정 (워커 프로세스 단위)
+    pool_size: int = 10
+    max_overflow: int = 10
+    pool_timeout: float = 30
+    pool_recycle: int = 28000
+
+    # 읽기 전용 복제본. 설정하지 않으면 읽기도 primary 로 보냅니다.
+    replica_host: str | None = None
+    replica_port: int | None = None
+
+    # 한 요청에서 같은 SQL 문이 이 횟수를 넘게 실행되면 N+1 경고를 남깁니다.
+    query_repeat_warning_threshold: int = 10
+
+    # 켜면 쿼리에서 미리 불러오지 않은 관계를 지연 로딩하려 할 때 예외를 던집니다 (테스트용).
+    strict_loading: bool = False
+
+    # 비동기 DB 경로 (opt-in)
+    async_enabled: bool = False
+    async_driver: str = "aiomysql"
+
     @property
     def url(self) -> str:
         return f"{self.dialect}+{self.driver}://{self.user}:{self.password}@{self.host}:{self.port}/{self.database}"
 
+    @property
+    def replica_url(self) -> str | None:
+        if self.replica_host is None:
+            return None
+        port = self.replica_port or self.port
+        return f"{self.dialect}+{self.driver}://{self.user}:{self.password}@{self.replica_host}:{port}/{self.database}"
+
+    @property
+    def async_url(self) -> str:
+        return f"{self.dialect}+{self.async_driver}://{self.user}:{self.password}@{self.host}:{self.port}/{self.database}"
+
     model_config = SettingsConfigDict(
         case_sensitive=False,
         env_prefix="DB_",
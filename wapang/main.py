@@ -1,18 +1,77 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 from fastapi.exception_handlers import request_validation_exception_handler
 from fastapi.exceptions import RequestValidationError
 
 from wapang.api import api_router
+from wapang.app.auth.denylist import load_refresh_token_denylist, purge_and_reload_denylist
+from wapang.app.auth.settings import AUTH_SETTINGS
+from wapang.app.auth.hashing import PASSWORD_HASHING
+from wapang.app.carts.reservations import sweep_expired_reservations
+from wapang.app.carts.settings import CART_SETTINGS
+from wapang.app.idempotency.services import purge_idempotency_keys
+from wapang.app.idempotency.settings import IDEMPOTENCY_SETTINGS
+from wapang.app.orders.queue import run_order_queue_worker
+from wapang.app.orders.settings import ORDER_SETTINGS
+from wapang.app.search.indexes import build_search_indexes
+from wapang.cache.bus import INVALIDATION_BUS
 from wapang.common.exceptions import (
     WapangException,
-    MissingRequiredFieldException
+    MissingRequiredFieldException,
+    logger
 )
+from wapang.database.connection import init_db, close_db, init_async_db, close_async_db
+from wapang.database.instrumentation import collect_queries
+from wapang.database.maintenance import run_periodically
+from wapang.database.settings import DB_SETTINGS
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    init_db()
+    if DB_SETTINGS.async_enabled:
+        init_async_db()
+    build_search_indexes()
+    INVALIDATION_BUS.start()
+    load_refresh_token_denylist()
+    maintenance = [
+        asyncio.create_task(run_periodically(AUTH_SETTINGS.DENYLIST_PURGE_INTERVAL_SECONDS, purge_and_reload_denylist,
+                                             "purge expired blocked tokens")),
+        asyncio.create_task(run_periodically(IDEMPOTENCY_SETTINGS.purge_interval_seconds, purge_idempotency_keys,
+                                             "purge expired idempotency keys")),
+    ]
+    if CART_SETTINGS.reservations_enabled:
+        maintenance.append(asyncio.create_task(run_periodically(
+            CART_SETTINGS.reservation_sweep_interval_seconds, sweep_expired_reservations,
+            "release expired stock reservations")))
+    if ORDER_SETTINGS.queue_enabled:
+        maintenance += [asyncio.create_task(run_order_queue_worker()) for _ in range(ORDER_SETTINGS.queue_workers)]
+    yield
+    for task in maintenance:
+        task.cancel()
+    INVALIDATION_BUS.close()
+    PASSWORD_HASHING.shutdown()
+    if DB_SETTINGS.async_enabled:
+        await close_async_db()
+    close_db()
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 app.include_router(api_router, prefix="/api")
 
+@app.middleware("http")
+async def db_query_metrics_middleware(request: Request, call_next):
+    with collect_queries() as collector:
+        response = await call_next(request)
+    response.headers["X-DB-Queries"] = str(collector.count)
+    response.headers["Server-Timing"] = collector.server_timing()
+    for statement, count in collector.repeated(DB_SETTINGS.query_repeat_warning_threshold):
+        logger.warning(f"Possible N+1 query on {request.method} {request.url.path}: "
+                       f"same statement ran {count} times: {statement[:200]}")
+    return response
+
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     for error in exc.errors():